@@ -0,0 +1,37 @@
+"""add room and group composite indexes
+
+Revision ID: a6c2e8f4b1d9
+Revises: e4b9c1d7a3f5
+Create Date: 2026-10-18 14:37:44.902617
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6c2e8f4b1d9'
+down_revision = 'e4b9c1d7a3f5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Одностолбцовые индексы по room_id и name заменяются составными, в которых они идут первыми
+    op.create_index(
+        'ix_schedule_lesson_room_weekday_call',
+        'schedule_lesson',
+        ['room_id', 'weekday', 'call_id'],
+        unique=False,
+        postgresql_include=['weeks'],
+    )
+    op.drop_index('ix_schedule_lesson_room_id', table_name='schedule_lesson')
+    op.create_index('ix_schedule_group_name_period_id', 'schedule_group', ['name', 'period_id'], unique=False)
+    op.drop_index('ix_schedule_group_name', table_name='schedule_group')
+
+
+def downgrade() -> None:
+    op.create_index('ix_schedule_group_name', 'schedule_group', ['name'], unique=False)
+    op.drop_index('ix_schedule_group_name_period_id', table_name='schedule_group')
+    op.create_index('ix_schedule_lesson_room_id', 'schedule_lesson', ['room_id'], unique=False)
+    op.drop_index('ix_schedule_lesson_room_weekday_call', table_name='schedule_lesson')
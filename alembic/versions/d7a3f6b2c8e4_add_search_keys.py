@@ -0,0 +1,43 @@
+"""add search keys with trigram indexes
+
+Revision ID: d7a3f6b2c8e4
+Revises: b5e2a8d4c6f1
+Create Date: 2026-10-18 12:41:27.318206
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7a3f6b2c8e4'
+down_revision = 'b5e2a8d4c6f1'
+branch_labels = None
+depends_on = None
+
+# app.utils.search.search_key_sql("name") на момент миграции
+SEARCH_KEY_SQL = (
+    "regexp_replace(translate(name, "
+    "'ABCDEFGHIJKLMNOPQRSTUVWXYZАБВГДЕЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯЁёabcehkmoptxy', "
+    "'авсdеfgнijкlмnорqrsтuvwхуzабвгдежзийклмнопрстуфхцчшщъыьэюяееавсенкмортху'), "
+    "'[^0-9a-zа-я]', '', 'g')"
+)
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for table in ('schedule_room', 'schedule_teacher'):
+        op.add_column(table, sa.Column('search_key', sa.String(length=256), sa.Computed(SEARCH_KEY_SQL, persisted=True)))
+        op.create_index(
+            f'ix_{table}_search_key_trgm',
+            table,
+            ['search_key'],
+            postgresql_using='gin',
+            postgresql_ops={'search_key': 'gin_trgm_ops'},
+        )
+
+
+def downgrade() -> None:
+    for table in ('schedule_teacher', 'schedule_room'):
+        op.drop_index(f'ix_{table}_search_key_trgm', table_name=table)
+        op.drop_column(table, 'search_key')
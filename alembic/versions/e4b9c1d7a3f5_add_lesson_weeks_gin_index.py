@@ -0,0 +1,24 @@
+"""add gin index on lesson weeks
+
+Revision ID: e4b9c1d7a3f5
+Revises: d7a3f6b2c8e4
+Create Date: 2026-10-18 13:52:10.481530
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b9c1d7a3f5'
+down_revision = 'd7a3f6b2c8e4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_schedule_lesson_weeks_gin', 'schedule_lesson', ['weeks'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_schedule_lesson_weeks_gin', table_name='schedule_lesson')
@@ -1,12 +1,17 @@
 from app.database.tables.campus import ScheduleCampus
+from app.database.tables.change import ScheduleChange
 from app.database.tables.degree import ScheduleDegree
 from app.database.tables.discipline import ScheduleDiscipline
+from app.database.tables.document import ScheduleDocument
 from app.database.tables.group import Group
+from app.database.tables.group_snapshot import GroupSnapshot
 from app.database.tables.institute import Institute
 from app.database.tables.lesson import Lesson, lessons_to_teachers
 from app.database.tables.lesson_call import LessonCall
 from app.database.tables.lesson_type import LessonType
 from app.database.tables.period import SchedulePeriod
+from app.database.tables.push_notification import PushNotification
 from app.database.tables.room import Room
 from app.database.tables.settings import Settings
 from app.database.tables.teacher import Teacher
+from app.database.tables.version import ScheduleVersion
@@ -0,0 +1,20 @@
+import sqlalchemy as db
+
+from app.database.connection import Base
+
+
+class ScheduleChange(Base):
+    """Событие журнала изменений расписания группы, аудитории или преподавателя.
+
+    id - курсор синхронизации: события добавляются парсером под блокировкой, поэтому id растут в порядке commit.
+    """
+
+    __tablename__ = "schedule_change"
+    __table_args__ = (db.Index("ix_schedule_change_entity", "entity", "entity_id", "id"),)
+
+    id = db.Column(db.BigInteger, primary_key=True)
+    entity = db.Column(db.String(16), nullable=False)  # group, room, teacher
+    entity_id = db.Column(db.BigInteger, nullable=False)
+    lesson_id = db.Column(db.BigInteger, nullable=False)  # занятие может быть уже удалено, поэтому без внешнего ключа
+    action = db.Column(db.String(16), nullable=False)  # added, removed, updated
+    created_at = db.Column(db.DateTime, nullable=False, server_default=db.func.now())
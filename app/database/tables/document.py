@@ -0,0 +1,14 @@
+import sqlalchemy as db
+
+from app.database.connection import Base
+
+
+class ScheduleDocument(Base):
+    __tablename__ = "schedule_document"
+
+    id = db.Column(db.BigInteger, primary_key=True)
+    source = db.Column(db.String(1024), nullable=False, unique=True, index=True)  # ссылка или путь к файлу
+    sha256 = db.Column(db.String(64), nullable=False)
+    mtime = db.Column(db.Float, nullable=False)
+    size = db.Column(db.BigInteger, nullable=False)
+    parsed_at = db.Column(db.DateTime, nullable=False, server_default=db.func.now(), onupdate=db.func.now())
@@ -6,9 +6,11 @@ from app.database.connection import Base
 
 class Group(Base):
     __tablename__ = "schedule_group"
+    # Группы ищутся по имени в периоде
+    __table_args__ = (db.Index("ix_schedule_group_name_period_id", "name", "period_id"),)
 
     id = db.Column(db.BigInteger, primary_key=True)
-    name = db.Column(db.String(256), nullable=False, index=True, unique=False)
+    name = db.Column(db.String(256), nullable=False)
     period_id = db.Column(db.BigInteger, db.ForeignKey("schedule_period.id"), nullable=False, index=True)
     period = relationship(
         "SchedulePeriod",
@@ -0,0 +1,16 @@
+import sqlalchemy as db
+
+from app.database.connection import Base
+
+
+class GroupSnapshot(Base):
+    """Готовый JSON ответа с расписанием группы, который формируется парсером после сохранения группы"""
+
+    __tablename__ = "schedule_group_snapshot"
+
+    id = db.Column(db.BigInteger, primary_key=True)
+    group_id = db.Column(db.BigInteger, db.ForeignKey("schedule_group.id"), nullable=False, unique=True, index=True)
+    data = db.Column(db.LargeBinary, nullable=False)
+    etag = db.Column(db.String(64), nullable=False)  # sha256 от data
+    version = db.Column(db.Integer, nullable=False, server_default="1")
+    updated_at = db.Column(db.DateTime, nullable=False, server_default=db.func.now())
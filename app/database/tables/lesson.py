@@ -15,13 +15,21 @@ lessons_to_teachers = db.Table(
 
 class Lesson(Base):
     __tablename__ = "schedule_lesson"
+    # btree индекс по weeks обслуживает только сравнение массивов целиком, поиск занятий недели
+    # (weeks.contains([week]), оператор @>) использует GIN индекс
+    __table_args__ = (
+        db.Index("ix_schedule_lesson_weeks_gin", "weeks", postgresql_using="gin"),
+        # Занятия аудитории по дням и парам. weeks в индексе, чтобы загруженность аудиторий считалась
+        # по индексу без чтения таблицы
+        db.Index("ix_schedule_lesson_room_weekday_call", "room_id", "weekday", "call_id", postgresql_include=["weeks"]),
+    )
 
     id = db.Column(db.BigInteger, primary_key=True)
     group_id = db.Column(db.BigInteger, db.ForeignKey("schedule_group.id"), nullable=False, index=True)
     call_id = db.Column(db.BigInteger, db.ForeignKey("schedule_lesson_call.id"), nullable=False, index=True)
     discipline_id = db.Column(db.BigInteger, db.ForeignKey("schedule_discipline.id"), nullable=False, index=True)
     weekday = db.Column(db.Integer, nullable=False, index=True)
-    room_id = db.Column(db.BigInteger, db.ForeignKey("schedule_room.id"), nullable=True, index=True)
+    room_id = db.Column(db.BigInteger, db.ForeignKey("schedule_room.id"), nullable=True)
     lesson_type_id = db.Column(db.BigInteger, db.ForeignKey("schedule_lesson_type.id"), nullable=True, index=True)
     teachers = relationship(
         "Teacher",
@@ -0,0 +1,23 @@
+import sqlalchemy as db
+
+from app.database.connection import Base
+
+
+class PushNotification(Base):
+    """Push-уведомление в очереди на отправку. Добавляется парсером в одной транзакции с расписанием"""
+
+    __tablename__ = "schedule_push_notification"
+
+    id = db.Column(db.BigInteger, primary_key=True)
+    topic = db.Column(db.String(256), nullable=False)
+    title = db.Column(db.String(256), nullable=False)
+    body = db.Column(db.Text, nullable=False)
+    attempts = db.Column(db.Integer, nullable=False, server_default="0")
+    next_attempt_at = db.Column(db.DateTime, nullable=False, server_default=db.func.now())
+    sent_at = db.Column(db.DateTime, nullable=True)
+    error = db.Column(db.Text, nullable=True)  # ошибка последней попытки
+
+    __table_args__ = (
+        # Неотправленные уведомления выбираются по времени следующей попытки
+        db.Index("ix_schedule_push_notification_pending", "next_attempt_at", postgresql_where=sent_at.is_(None)),
+    )
@@ -2,6 +2,7 @@ import sqlalchemy as db
 from sqlalchemy.orm import relationship
 
 from app.database.connection import Base
+from app.utils.search import search_key_sql
 
 
 class Room(Base):
@@ -10,11 +11,15 @@ class Room(Base):
     id = db.Column(db.BigInteger, primary_key=True)
     name = db.Column(db.String(256), nullable=False, index=True)
     campus_id = db.Column(db.BigInteger, db.ForeignKey("schedule_campus.id"), nullable=True)
+    # Нормализованное имя для поиска. GIN (pg_trgm) индекс создаётся миграцией
+    search_key = db.Column(db.String(256), db.Computed(search_key_sql("name"), persisted=True))
     lessons = relationship(
         "Lesson",
         cascade="delete",
         back_populates="room",
-        lazy="subquery",
+        # Занятия загружаются только явно (selectinload), иначе загрузка одного занятия
+        # тянет за собой все занятия аудитории/преподавателя
+        lazy="raise",
     )
     campus = relationship(
         "ScheduleCampus",
@@ -2,6 +2,7 @@ import sqlalchemy as db
 from sqlalchemy.orm import relationship
 
 from app.database.connection import Base
+from app.utils.search import search_key_sql
 
 
 class Teacher(Base):
@@ -9,10 +10,14 @@ class Teacher(Base):
 
     id = db.Column(db.BigInteger, primary_key=True)
     name = db.Column(db.String(256), nullable=False, unique=True, index=True)  # TODO: name must be not unique
+    # Нормализованное имя для поиска. GIN (pg_trgm) индекс создаётся миграцией
+    search_key = db.Column(db.String(256), db.Computed(search_key_sql("name"), persisted=True))
     lessons = relationship(
         "Lesson",
         cascade="delete",
         back_populates="teachers",
         secondary="schedule_lessons_to_teachers",
-        lazy="subquery",
+        # Занятия загружаются только явно (selectinload), иначе загрузка одного занятия
+        # тянет за собой все занятия аудитории/преподавателя
+        lazy="raise",
     )
@@ -0,0 +1,16 @@
+import sqlalchemy as db
+
+from app.database.connection import Base
+
+
+class ScheduleVersion(Base):
+    """Версия расписания аудитории или преподавателя. Увеличивается парсером при изменении занятий"""
+
+    __tablename__ = "schedule_version"
+    __table_args__ = (db.UniqueConstraint("entity", "entity_id"),)
+
+    id = db.Column(db.BigInteger, primary_key=True)
+    entity = db.Column(db.String(16), nullable=False)  # room, teacher
+    entity_id = db.Column(db.BigInteger, nullable=False)
+    version = db.Column(db.Integer, nullable=False, server_default="1")
+    updated_at = db.Column(db.DateTime, nullable=False, server_default=db.func.now())
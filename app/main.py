@@ -1,7 +1,9 @@
+import asyncio
+import contextlib
+
 import sentry_sdk
 from fastapi import FastAPI
 from fastapi_cache import FastAPICache
-from fastapi_cache.backends.inmemory import InMemoryBackend
 from opentelemetry import trace
 from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
 from opentelemetry.instrumentation.aiohttp_client import AioHttpClientInstrumentor
@@ -18,6 +20,7 @@ from app.config import config
 from app.database.connection import engine
 from app.exceptions import add_exception_handlers, catch_unhandled_exceptions
 from app.routers.campuses import router as campuses_router
+from app.routers.changes import router as changes_router
 from app.routers.degrees import router as degrees_router
 from app.routers.disciplines import router as disciplines_router
 from app.routers.groups import router as groups_router
@@ -26,8 +29,12 @@ from app.routers.lessons import router as lessons_router
 from app.routers.lks import router as lks_router
 from app.routers.periods import router as periods_router
 from app.routers.rooms import router as rooms_router
+from app.routers.search import router as search_router
 from app.routers.teachers import router as teachers_router
 from app.routers.utils import router as utils_router
+from app.services.cache_invalidation import listen_invalidation
+from app.services.group_directory import group_directory
+from app.utils.cache import CACHE_PREFIX, create_cache_backend
 
 
 def setup_profiler(app: FastAPI) -> None:
@@ -79,7 +86,21 @@ app.middleware("http")(catch_unhandled_exceptions)
 
 @app.on_event("startup")
 async def startup():
-    FastAPICache.init(InMemoryBackend(), prefix="fastapi-cache")
+    backend = create_cache_backend()
+    FastAPICache.init(backend, prefix=CACHE_PREFIX)
+    # Справочник групп строится сразу, чтобы первые запросы расписания по названию группы не ждали загрузки
+    await group_directory.warm_up()
+    if config.CACHE_BACKEND == "redis":
+        # Парсер и другие процессы API сообщают о сбросе кэшей в памяти процесса через канал Redis
+        app.state.invalidation_listener = asyncio.create_task(listen_invalidation(backend.redis))
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    if listener := getattr(app.state, "invalidation_listener", None):
+        listener.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await listener
 
 
 if not config.SENTRY_DISABLE_LOGGING:
@@ -107,6 +128,8 @@ app.include_router(periods_router, tags=["periods"])
 app.include_router(degrees_router, tags=["degrees"])
 app.include_router(utils_router, tags=["utils"])
 app.include_router(lks_router, tags=["lks"])
+app.include_router(search_router, tags=["search"])
+app.include_router(changes_router, tags=["changes"])
 
 
 if config.PROFILER_ENABLE:
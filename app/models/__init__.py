@@ -1,4 +1,5 @@
 from app.models.campus import *
+from app.models.change import *
 from app.models.degree import *
 from app.models.discipline import *
 from app.models.group import *
@@ -9,7 +10,9 @@ from app.models.lesson_type import *
 from app.models.lks_schedule import *
 from app.models.msg import *
 from app.models.period import *
+from app.models.push_notification import *
 from app.models.room import *
+from app.models.search import *
 from app.models.settings import *
 from app.models.teacher import *
 from app.models.utils import *
@@ -0,0 +1,26 @@
+import datetime
+from typing import Literal, Optional
+
+from pydantic import BaseModel, NonNegativeInt, PositiveInt
+
+from .lesson import Lesson
+
+
+class ScheduleChange(BaseModel):
+    id: PositiveInt
+    entity: Literal["group", "room", "teacher"]
+    entity_id: PositiveInt
+    lesson_id: PositiveInt
+    action: Literal["added", "removed", "updated"]
+    created_at: datetime.datetime
+    # Текущее состояние занятия для added и updated, если занятие ещё не удалено
+    lesson: Optional[Lesson] = None
+
+    class Config:
+        orm_mode = True
+
+
+class ScheduleChanges(BaseModel):
+    cursor: NonNegativeInt  # значение since для следующего запроса
+    has_more: bool
+    changes: list[ScheduleChange]
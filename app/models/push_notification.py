@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+
+class PushNotificationCreate(BaseModel):
+    topic: str
+    title: str
+    body: str
@@ -0,0 +1,9 @@
+from typing import Literal
+
+from pydantic import BaseModel, PositiveInt
+
+
+class SearchResult(BaseModel):
+    type: Literal["group", "teacher", "room", "discipline"]
+    id: PositiveInt
+    name: str
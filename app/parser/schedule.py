@@ -1,264 +1,375 @@
+import asyncio
 import datetime
+import hashlib
+import itertools
 import json
+import multiprocessing
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Generator, List, Union
+from typing import AsyncGenerator, List, NamedTuple, Optional, Tuple
 
 from loguru import logger
-from rtu_schedule_parser import ExamsSchedule, ExcelScheduleParser, LessonEmpty, LessonsSchedule
+from rtu_schedule_parser import ExcelScheduleParser
 from rtu_schedule_parser.constants import Degree, Institute, ScheduleType
 from rtu_schedule_parser.downloader import ScheduleDownloader
-from rtu_schedule_parser.schedule import Lesson as ParserLesson
 from rtu_schedule_parser.utils import academic_calendar
 from sqlalchemy.ext.asyncio import AsyncSession
 from transliterate import translit
 
-import app.services.crud_schedule as schedule_crud
+import app.services.bulk_schedule as bulk_schedule
 from app import config, models
 from app.database.connection import async_session
+from app.parser.structures import ParsedSchedule, compact_schedules
 from app.services.api.group import GroupService
-from app.services.db import DegreeDBService, GroupDBService, InstituteDBService, LessonCallDBService, PeriodDBService
+from app.services.db import (
+    DegreeDBService,
+    DocumentDBService,
+    GroupDBService,
+    InstituteDBService,
+    PushNotificationDBService,
+    ScheduleChangeDBService,
+    ScheduleVersionDBService,
+)
+from app.services.dimension_cache import DimensionCache
+from app.services.push_notifications import FirebaseMessagingClient, PushNotificationDispatcher
 from app.utils.cache import send_clear_cache_request
 
 
-def _is_db_lesson_in_parsed_lessons(lessons: List[ParserLesson], lesson: models.Lesson) -> models.Lesson:
-    get_room = lambda lesson: lesson.room.name if lesson.room else None
-    return any(
-        lesson.calls.num == lesson_.num
-        and lesson.weekday == lesson_.weekday.value[0]
-        and set([teacher.name for teacher in lesson.teachers]) == set(lesson_.teachers)
-        and set(lesson.weeks) == set(lesson_.weeks)
-        and lesson.discipline.name == lesson_.name
-        and get_room(lesson) == get_room(lesson_)
-        for lesson_ in lessons
+def _get_schedule_push_notification(
+    group: str, diff: bulk_schedule.GroupScheduleDiff
+) -> Optional[models.PushNotificationCreate]:
+    """Уведомление об изменении занятий группы, расписание которой уже было сохранено"""
+
+    if not diff.lessons_changed or not (diff.kept or diff.removed or diff.moved):
+        return None
+
+    changes = {"новых занятий": diff.added, "отменённых занятий": diff.removed, "перенесённых занятий": diff.moved}
+    summary = ", ".join(f"{name}: {len(lessons)}" for name, lessons in changes.items() if lessons)
+    topic = f"ScheduleUpdates__{translit(group, 'ru', reversed=True)}"
+    logger.info(f"Push-уведомление о изменении расписания группы {group} добавлено в очередь [{topic}]: {diff}")
+    return models.PushNotificationCreate(
+        topic=topic,
+        title=f"Обновилось расписание {group}",
+        body=f"В расписании вашей группы произошли изменения ({summary}). Проверьте расписание в приложении.",
     )
 
 
-async def _compare_schedule_and_send_push(group: str, schedule: LessonsSchedule, lessons_in_db: List[models.Lesson]):
-    try:
-        from app.services.push_notifications import send_push_notification
-
-        lessons = [lesson for lesson in schedule.lessons if type(lesson) is not LessonEmpty]
-        for lesson_in_db in lessons_in_db:
-            if not _is_db_lesson_in_parsed_lessons(lessons, lesson_in_db):
-                logger.info(
-                    f"Отправка push-уведомления о изменении расписания группы {group} [ScheduleUpdates__{translit(group, 'ru', reversed=True)}]"
-                )
-                await send_push_notification(
-                    f"ScheduleUpdates__{translit(group, 'ru', reversed=True)}",
-                    f"Обновилось расписание {group}",
-                    f"В расписании вашей группы произошли изменения. Проверьте расписание в приложении.",
-                )
-                return
+class GroupScheduleTask(NamedTuple):
+    """Расписание группы в очереди на сохранение в БД"""
+
+    source: str
+    schedule: ParsedSchedule
+    group_id: int
+    dimensions: bulk_schedule.Dimensions
+
+
+@dataclass
+class DocumentProgress:
+    """Сколько групп документа ещё не сохранено и были ли ошибки"""
+
+    remaining: int
+    failed: bool = False
+
+
+@dataclass
+class ScheduleChanges:
+    """Группы, аудитории и преподаватели, расписание которых изменилось за время парсинга"""
+
+    groups: set[str] = field(default_factory=set)
+    rooms_id: set[int] = field(default_factory=set)
+    teachers_id: set[int] = field(default_factory=set)
+
+    def add(self, group: str, diff: bulk_schedule.GroupScheduleDiff) -> None:
+        self.groups.add(group)
+        self.rooms_id.update(diff.rooms_id)
+        self.teachers_id.update(diff.teachers_id)
+
+
+class DocumentFingerprint(NamedTuple):
+    source: str
+    sha256: str
+    mtime: float
+    size: int
 
+
+def _get_file_hash(path: str) -> str:
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def _parse_document(doc) -> Optional[List[ParsedSchedule]]:
+    """Парсинг документа. Выполняется в отдельном потоке или процессе, поэтому объявлен на уровне модуля"""
+
+    logger.info(f"Обработка документа: {doc}")
+    try:
+        parser = ExcelScheduleParser(doc[0], doc[1], doc[2], doc[3])
+        return compact_schedules(parser.parse(force=True).get_schedule())
     except Exception as e:
-        logger.warning(f"Не удалось отправить push-уведомление. Ошибка: {str(e)}")
-        return
+        logger.error(f"Парсинг документа {doc} завершился с ошибкой. Ошибка: {str(e)}")
 
 
 class ScheduleParsingService:
     @classmethod
     async def parse_schedule(
-        cls, from_file: bool = False, file_path: str = None, institute: str = None, degree: int = None
+        cls,
+        from_file: bool = False,
+        file_path: str = None,
+        institute: str = None,
+        degree: int = None,
+        force: bool = False,
     ) -> None:
         """Парсинг расписания используя пакет rtu_schedule_parser"""
 
-        for schedules in (
-            cls._parse()
+        documents = (
+            cls._get_documents()
             if not from_file
-            else cls._parse_from_file(file_path=file_path, institute=institute, degree=degree)
-        ):
-            for schedule in schedules:
-                async with async_session() as db:
-                    try:
-                        try:
-                            group_schedule_in_db = await GroupService.get_group_by_name(db=db, name=schedule.group)
-
-                            if group_schedule_in_db:
-                                await _compare_schedule_and_send_push(
-                                    schedule.group, schedule, group_schedule_in_db.lessons
-                                )
-                        except Exception as e:
-                            logger.warning(
-                                f"Не удалось получить расписание группы {schedule.group} для отправки пуш уведомления. "
-                                f"Возможно, такой группы ещё не было Ошибка: {str(e)}"
-                            )
-                            pass
-
-                        logger.info(f"Сохраняем расписание группы {schedule.group} в БД")
-                        period = await PeriodDBService.get_period_by_params(
-                            db,
-                            year_start=schedule.period.year_start,
-                            year_end=schedule.period.year_end,
-                            semester=schedule.period.semester,
-                        )
-                        if not period:
-                            period = await PeriodDBService.create(
-                                db,
-                                models.PeriodCreate(
-                                    year_start=schedule.period.year_start,
-                                    year_end=schedule.period.year_end,
-                                    semester=schedule.period.semester,
-                                ),
-                            )
-                        await schedule_crud.clear_group_schedule(db, schedule.group, period.id)
-                        degree = await DegreeDBService.get_degree_by_name(db, schedule.degree.name)
-                        if not degree:
-                            degree = await DegreeDBService.create(db, models.DegreeCreate(name=schedule.degree.name))
-                        institute = await InstituteDBService.get_institute_by_name(db, schedule.institute.name)
-                        if not institute:
-                            institute = await InstituteDBService.create(
-                                db,
-                                models.InstituteCreate(
-                                    name=schedule.institute.name,
-                                    short_name=schedule.institute.short_name,
-                                ),
-                            )
-                        group = await GroupDBService.get_group_by_name(db, schedule.group, period.id)
-                        if not group:
-                            group = await GroupDBService.create(
-                                db,
-                                models.GroupCreate(
-                                    name=schedule.group,
-                                    period_id=period.id,
-                                    degree_id=degree.id,
-                                    institute_id=institute.id,
-                                ),
-                            )
-
-                        for lesson in schedule.lessons:
-                            if type(lesson) is not LessonEmpty:
-                                if not lesson.weeks:
-                                    continue
-
-                                if not all(isinstance(week, int) for week in lesson.weeks):
-                                    continue
-
-                            lesson_call = await LessonCallDBService.get_call_by_params(
-                                db, lesson.num, lesson.time_start, lesson.time_end
-                            )
-                            if not lesson_call:
-                                lesson_call = await LessonCallDBService.create(
-                                    db,
-                                    models.LessonCallCreate(
-                                        num=lesson.num,
-                                        time_start=lesson.time_start,
-                                        time_end=lesson.time_end,
-                                    ),
-                                )
-
-                            if type(lesson) is LessonEmpty:
-                                continue
-
-                            lesson_type = None
-                            room = None
-                            discipline = await schedule_crud.get_or_create_discipline(
-                                db,
-                                models.DisciplineCreate(
-                                    name=lesson.name,
-                                ),
-                            )
-                            if lesson.room is not None:
-                                campus_id = None
-                                if lesson.room.campus:
-                                    campus = await schedule_crud.get_or_create_campus(
-                                        db,
-                                        models.CampusCreate(
-                                            name=lesson.room.campus.name,
-                                            short_name=lesson.room.campus.short_name,
-                                        ),
-                                    )
-                                    campus_id = campus.id
-
-                                room = await schedule_crud.get_or_create_room(
-                                    db,
-                                    models.RoomCreate(
-                                        name=lesson.room.name,
-                                        campus_id=campus_id,
-                                    ),
-                                )
-                            if lesson.type:
-                                lesson_type = await schedule_crud.get_or_create_lesson_type(
-                                    db,
-                                    models.LessonTypeCreate(
-                                        name=lesson.type.value,
-                                    ),
-                                )
-
-                            teachers_id = [
-                                (
-                                    await schedule_crud.get_or_create_teacher(
-                                        db,
-                                        models.TeacherCreate(
-                                            name=teacher,
-                                        ),
-                                    )
-                                ).id
-                                for teacher in lesson.teachers
-                            ]
-                            await schedule_crud.get_or_create_lesson(
-                                db,
-                                models.LessonCreate(
-                                    lesson_type_id=lesson_type.id if lesson.type else None,
-                                    discipline_id=discipline.id,
-                                    teachers_id=teachers_id,
-                                    room_id=room.id if lesson.room else None,
-                                    group_id=group.id,
-                                    call_id=lesson_call.id,
-                                    weekday=lesson.weekday.value[0],
-                                    subgroup=lesson.subgroup,
-                                    weeks=lesson.weeks,
-                                ),
-                            )
-                        logger.info(f"Сохранение группы {schedule.group} в БД завершено")
-                    except Exception as e:
-                        logger.error(
-                            f"Неожиданная ошибка при сохранении группы {schedule.group} в БД.\n\n"
-                            f"Параметры расписания:\n"
-                            f"Группа: {schedule.group}\n"
-                            f"Период: {schedule.period}\n"
-                            f"Институт: {schedule.institute}\n"
-                            f"Степень обучения: {schedule.degree}\n"
-                            f"Ссылка на файл: {schedule.document_url}\n\n\n"
-                            f"Расписание: {schedule.lessons}\n\n\n"
-                            f"Ошибка {str(e)}\n\n"
-                        )
-                        await db.rollback()
-                    else:
+            else cls._get_document_from_file(file_path=file_path, institute=institute, degree=degree)
+        )
+        fingerprints = await cls._get_changed_documents(documents, force=force)
+        documents = [doc for doc in documents if str(doc[0]) in fingerprints]
+
+        dimension_cache = DimensionCache(max_size=config.PARSER_DIMENSION_CACHE_SIZE)
+        async with async_session() as db:
+            await dimension_cache.warm(db)
+
+        # Парсинг и запись в БД идут одновременно: документы парсятся в пуле, а расписания групп
+        # сохраняют несколько писателей. Очередь ограничена, поэтому при отставании писателей
+        # парсинг приостанавливается и расписания не накапливаются в памяти
+        queue = asyncio.Queue(maxsize=config.PARSER_QUEUE_SIZE)
+        progress: dict[str, DocumentProgress] = {}
+        group_locks = defaultdict(asyncio.Lock)
+        changes = ScheduleChanges()
+        writers = [
+            asyncio.create_task(cls._run_writer(queue, progress, fingerprints, group_locks, changes))
+            for _ in range(config.PARSER_DB_WRITERS)
+        ]
+        # Push-уведомления отправляются из очереди в БД параллельно с сохранением расписания
+        stop_notifications = asyncio.Event()
+        notifications = asyncio.create_task(
+            PushNotificationDispatcher(FirebaseMessagingClient()).run(stop_notifications)
+        )
+
+        try:
+            async for doc, schedules in cls._parse(documents):
+                tasks = await cls._prepare_document(doc, schedules, dimension_cache)
+                if not tasks:
+                    continue
+
+                progress[str(doc[0])] = DocumentProgress(remaining=len(tasks))
+                for task in tasks:
+                    await queue.put(task)
+        finally:
+            for _ in writers:
+                await queue.put(None)
+            await asyncio.gather(*writers)
+            stop_notifications.set()
+            await notifications
+
+        dimension_cache.log_stats()
+        if changes.groups:
+            await send_clear_cache_request(groups=changes.groups, rooms=changes.rooms_id, teachers=changes.teachers_id)
+        else:
+            logger.info("Расписание не изменилось, кэш не сбрасывается")
+
+    @classmethod
+    async def _prepare_document(
+        cls, doc: tuple, schedules: List[ParsedSchedule], dimension_cache: DimensionCache
+    ) -> List[GroupScheduleTask]:
+        """Сохранение справочников и групп документа перед передачей расписаний писателям.
+
+        Выполняется последовательно, чтобы писатели не создавали одни и те же записи одновременно.
+        """
+
+        async with async_session() as db:
+            try:
+                dimensions = await bulk_schedule.upsert_dimensions(db, schedules, dimension_cache)
+                groups_id = [await cls._get_or_create_group(db, schedule, dimensions) for schedule in schedules]
+            except Exception as e:
+                logger.error(f"Не удалось сохранить справочники документа {doc[0]} в БД. Ошибка: {str(e)}")
+                # Id из отменённой транзакции не попали ни в кэш справочников (он пополняется после commit),
+                # ни в кэш периодов процесса (периоды парсер ищет без него)
+                await db.rollback()
+                return []
+            else:
+                await db.commit()
+                dimension_cache.update(dimensions)
+
+        return [
+            GroupScheduleTask(str(doc[0]), schedule, group_id, dimensions)
+            for schedule, group_id in zip(schedules, groups_id)
+        ]
+
+    @classmethod
+    async def _run_writer(
+        cls,
+        queue: asyncio.Queue,
+        progress: dict[str, DocumentProgress],
+        fingerprints: dict[str, DocumentFingerprint],
+        group_locks: dict[int, asyncio.Lock],
+        changes: ScheduleChanges,
+    ) -> None:
+        """Писатель: сохраняет расписания групп из очереди в своей сессии БД"""
+
+        async with async_session() as db:
+            while (task := await queue.get()) is not None:
+                try:
+                    async with group_locks[task.group_id]:
+                        diff = await cls._save_group_schedule(db, task.schedule, task.group_id, task.dimensions)
+                    if diff and diff.changed:
+                        changes.add(task.schedule.group, diff)
+
+                    document = progress[task.source]
+                    document.remaining -= 1
+                    document.failed |= diff is None
+                    if not document.remaining and not document.failed:
+                        await DocumentDBService.save(db, *fingerprints[task.source])
                         await db.commit()
+                except Exception as e:
+                    logger.error(f"Ошибка при сохранении расписания группы {task.schedule.group}. Ошибка: {str(e)}")
+                    await db.rollback()
+
+    @classmethod
+    async def _get_changed_documents(cls, documents: list, force: bool) -> dict[str, DocumentFingerprint]:
+        """Отпечатки документов, которые изменились с прошлого успешного парсинга"""
+
+        fingerprints = {}
+        async with async_session() as db:
+            for doc in documents:
+                path = str(doc[0])
+                stat = os.stat(path)
+                stored = await DocumentDBService.get_document_by_source(db, path)
 
-        await send_clear_cache_request()
+                if stored and stored.mtime == stat.st_mtime and stored.size == stat.st_size:
+                    sha256 = stored.sha256
+                else:
+                    sha256 = _get_file_hash(path)
+
+                if not force and stored and stored.sha256 == sha256:
+                    logger.info(f"Документ {path} не изменился с прошлого парсинга. Пропускаем...")
+                    if stored.mtime != stat.st_mtime or stored.size != stat.st_size:
+                        await DocumentDBService.save(db, path, sha256, stat.st_mtime, stat.st_size)
+                    continue
+
+                fingerprints[path] = DocumentFingerprint(path, sha256, stat.st_mtime, stat.st_size)
+            await db.commit()
+
+        logger.info(f"Документов для парсинга: {len(fingerprints)} из {len(documents)}")
+        return fingerprints
 
     @classmethod
-    def _parse(cls) -> Generator[List[Union[LessonsSchedule, ExamsSchedule]], None, None]:
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            tasks = []
-            for doc in cls._get_documents():
-                task = executor.submit(cls._parse_document, doc)
-                tasks.append(task)
-
-            for future in as_completed(tasks):
-                if schedules := future.result():  # type: list[LessonsSchedule | ExamsSchedule]
-                    groups = {schedule.group for schedule in schedules}
-                    logger.info(f"Получено расписание документа. Группы: {groups}")
-                    yield schedules
+    async def _get_or_create_group(
+        cls, db: AsyncSession, schedule: ParsedSchedule, dimensions: bulk_schedule.Dimensions
+    ) -> int:
+        period_id = dimensions.periods[schedule.period.year_start, schedule.period.year_end, schedule.period.semester]
+        degree = await DegreeDBService.get_degree_by_name(db, schedule.degree)
+        if not degree:
+            degree = await DegreeDBService.create(db, models.DegreeCreate(name=schedule.degree))
+        institute = await InstituteDBService.get_institute_by_name(db, schedule.institute.name)
+        if not institute:
+            institute = await InstituteDBService.create(
+                db,
+                models.InstituteCreate(
+                    name=schedule.institute.name,
+                    short_name=schedule.institute.short_name,
+                ),
+            )
+        group = await GroupDBService.get_group_by_name(db, schedule.group, period_id)
+        if not group:
+            group = await GroupDBService.create(
+                db,
+                models.GroupCreate(
+                    name=schedule.group,
+                    period_id=period_id,
+                    degree_id=degree.id,
+                    institute_id=institute.id,
+                ),
+            )
+        return group.id
 
     @classmethod
-    def _parse_from_file(
-        cls, file_path: str, institute: str, degree: int
-    ) -> Generator[List[Union[LessonsSchedule, ExamsSchedule]], None, None]:
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            tasks = []
-            for doc in cls._get_document_from_file(file_path=file_path, institute=institute, degree=degree):
-                task = executor.submit(cls._parse_document, doc)
-                tasks.append(task)
-
-            for future in as_completed(tasks):
-                if schedules := future.result():  # type: list[LessonsSchedule | ExamsSchedule]
-                    groups = {schedule.group for schedule in schedules}
-                    logger.info(f"Получено расписание документа. Группы: {groups}")
-                    yield schedules
+    async def _save_group_schedule(
+        cls, db: AsyncSession, schedule: ParsedSchedule, group_id: int, dimensions: bulk_schedule.Dimensions
+    ) -> Optional[bulk_schedule.GroupScheduleDiff]:
+        """Сохранение расписания группы в БД. Возвращает изменения или None, если сохранить не удалось"""
+
+        try:
+            logger.info(f"Сохраняем расписание группы {schedule.group} в БД")
+            diff = await bulk_schedule.sync_group_lessons(db, group_id, schedule.lessons, dimensions)
+            await GroupService.update_group_snapshot(db, group_id)
+            if diff.changed:
+                await ScheduleVersionDBService.bump(db, "room", diff.rooms_id)
+                await ScheduleVersionDBService.bump(db, "teacher", diff.teachers_id)
+            if notification := _get_schedule_push_notification(schedule.group, diff):
+                # Уведомление сохраняется в одной транзакции с расписанием и отправляется после commit
+                await PushNotificationDBService.enqueue(db, [notification])
+            # Последним шагом: блокировка журнала изменений держится до commit
+            await ScheduleChangeDBService.append(db, diff.get_change_events())
+            logger.info(f"Сохранение группы {schedule.group} в БД завершено: {diff}")
+        except Exception as e:
+            logger.error(
+                f"Неожиданная ошибка при сохранении группы {schedule.group} в БД.\n\n"
+                f"Параметры расписания:\n"
+                f"Группа: {schedule.group}\n"
+                f"Период: {schedule.period}\n"
+                f"Институт: {schedule.institute}\n"
+                f"Степень обучения: {schedule.degree}\n"
+                f"Ссылка на файл: {schedule.document_url}\n\n\n"
+                f"Расписание: {schedule.lessons}\n\n\n"
+                f"Ошибка {str(e)}\n\n"
+            )
+            await db.rollback()
+            return None
+        else:
+            await db.commit()
+            return diff
+
+    @classmethod
+    async def _parse(
+        cls, documents: list, executor: Optional[str] = None, workers: Optional[int] = None
+    ) -> AsyncGenerator[Tuple[tuple, List[ParsedSchedule]], None]:
+        """Параллельный парсинг документов в потоках или процессах (PARSER_EXECUTOR).
+
+        Одновременно в пуле находится не больше `workers` документов: следующие документы
+        отправляются на парсинг только после того, как потребитель забрал готовые результаты.
+        """
+
+        workers = workers or config.PARSER_WORKERS
+        loop = asyncio.get_running_loop()
+        documents = iter(documents)
+
+        with cls._get_executor(executor or config.PARSER_EXECUTOR, workers) as pool:
+            tasks = {}
+
+            def submit():
+                for doc in itertools.islice(documents, workers - len(tasks)):
+                    tasks[loop.run_in_executor(pool, _parse_document, doc)] = doc
+
+            submit()
+            while tasks:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                results = [(tasks.pop(future), future.result()) for future in done]
+                submit()
+
+                for doc, schedules in results:
+                    if schedules:
+                        groups = {schedule.group for schedule in schedules}
+                        logger.info(f"Получено расписание документа. Группы: {groups}")
+                        yield doc, schedules
+
+    @classmethod
+    def _get_executor(cls, executor: str, workers: int) -> Executor:
+        if executor == "process":
+            # Дочерние процессы Celery (prefork) являются демонами и не могут создавать свои процессы
+            if not multiprocessing.current_process().daemon:
+                return ProcessPoolExecutor(max_workers=workers)
+            logger.warning("Парсинг в процессах недоступен в процессе-демоне, используются потоки")
+        return ThreadPoolExecutor(max_workers=workers)
 
     @classmethod
     def _get_documents(cls) -> list:
@@ -316,15 +427,6 @@ class ScheduleParsingService:
         ]
         return documents
 
-    @classmethod
-    def _parse_document(cls, doc) -> List[Union[LessonsSchedule, ExamsSchedule]]:
-        logger.info(f"Обработка документа: {doc}")
-        try:
-            parser = ExcelScheduleParser(doc[0], doc[1], doc[2], doc[3])
-            return parser.parse(force=True).get_schedule()
-        except Exception as e:
-            logger.error(f"Парсинг документа {doc} завершился с ошибкой. Ошибка: {str(e)}")
-
     @classmethod
     def _get_documents_by_json(cls, docs_dir: str) -> list:
         # Формат json:
@@ -0,0 +1,110 @@
+"""Компактное представление расписания, которое передаётся из процессов парсинга.
+
+Объекты rtu_schedule_parser содержат enum'ы и пустые пары, которые не нужны при сохранении в БД,
+поэтому результат парсинга документа сразу переводится в кортежи примитивных значений.
+"""
+import datetime
+from typing import List, NamedTuple, Optional, Tuple
+
+from rtu_schedule_parser import LessonEmpty, LessonsSchedule
+from rtu_schedule_parser.schedule import Lesson as ParserLesson
+
+Call = Tuple[int, datetime.time, datetime.time]  # (номер пары, начало, конец)
+
+
+class ParsedCampus(NamedTuple):
+    name: str
+    short_name: str
+
+
+class ParsedRoom(NamedTuple):
+    name: str
+    campus: Optional[ParsedCampus]
+
+
+class ParsedLesson(NamedTuple):
+    num: int
+    time_start: datetime.time
+    time_end: datetime.time
+    weekday: int  # 1 - понедельник
+    name: str
+    weeks: Tuple[int, ...]
+    teachers: Tuple[str, ...]
+    type: Optional[str]  # лек, пр, лаб
+    subgroup: Optional[int]
+    room: Optional[ParsedRoom]
+
+    @property
+    def call(self) -> Call:
+        return self.num, self.time_start, self.time_end
+
+
+class ParsedPeriod(NamedTuple):
+    year_start: int
+    year_end: int
+    semester: int
+
+
+class ParsedInstitute(NamedTuple):
+    name: str
+    short_name: str
+
+
+class ParsedSchedule(NamedTuple):
+    group: str
+    period: ParsedPeriod
+    institute: ParsedInstitute
+    degree: str
+    document_url: str
+    calls: Tuple[Call, ...]  # все звонки документа, включая пустые пары
+    lessons: Tuple[ParsedLesson, ...]
+
+
+def _is_lesson_valid(lesson: ParserLesson) -> bool:
+    """Занятие с корректным списком недель, которое можно сохранить в БД"""
+
+    return bool(lesson.weeks) and all(isinstance(week, int) for week in lesson.weeks)
+
+
+def _compact_lesson(lesson: ParserLesson) -> ParsedLesson:
+    room = None
+    if lesson.room is not None:
+        campus = lesson.room.campus
+        room = ParsedRoom(lesson.room.name, ParsedCampus(campus.name, campus.short_name) if campus else None)
+
+    return ParsedLesson(
+        num=lesson.num,
+        time_start=lesson.time_start,
+        time_end=lesson.time_end,
+        weekday=lesson.weekday.value[0],
+        name=lesson.name,
+        weeks=tuple(lesson.weeks),
+        teachers=tuple(lesson.teachers),
+        type=lesson.type.value if lesson.type else None,
+        subgroup=lesson.subgroup,
+        room=room,
+    )
+
+
+def compact_schedule(schedule: LessonsSchedule) -> ParsedSchedule:
+    calls, lessons = {}, []
+    for lesson in schedule.lessons:
+        if type(lesson) is LessonEmpty:
+            calls[(lesson.num, lesson.time_start, lesson.time_end)] = None
+        elif _is_lesson_valid(lesson):
+            calls[(lesson.num, lesson.time_start, lesson.time_end)] = None
+            lessons.append(_compact_lesson(lesson))
+
+    return ParsedSchedule(
+        group=schedule.group,
+        period=ParsedPeriod(schedule.period.year_start, schedule.period.year_end, schedule.period.semester),
+        institute=ParsedInstitute(schedule.institute.name, schedule.institute.short_name),
+        degree=schedule.degree.name,
+        document_url=str(schedule.document_url),
+        calls=tuple(calls),
+        lessons=tuple(lessons),
+    )
+
+
+def compact_schedules(schedules: list) -> List[ParsedSchedule]:
+    return [compact_schedule(schedule) for schedule in schedules if type(schedule) is LessonsSchedule]
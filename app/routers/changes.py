@@ -0,0 +1,32 @@
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from app import models
+from app.config import config
+from app.database.connection import get_session
+from app.services.api import ChangeService
+
+router = APIRouter(prefix=config.PREFIX)
+
+
+@router.get(
+    "/changes",
+    response_model=models.ScheduleChanges,
+    response_description="Изменения расписания успешно получены и возвращены в ответе",
+    status_code=status.HTTP_200_OK,
+    description="Получить изменения расписания (добавленные, удалённые и изменённые занятия) после курсора since. "
+    "Для следующего запроса передайте в since значение cursor из ответа. Если has_more, изменения получены "
+    "не все и запрос нужно повторить сразу",
+    summary="Получение изменений расписания",
+)
+async def get_changes(
+    db: AsyncSession = Depends(get_session),
+    since: int = Query(0, description="Курсор: id последнего полученного изменения", ge=0),
+    entity: Optional[Literal["group", "room", "teacher"]] = Query(None, description="Тип сущности"),
+    id_: Optional[int] = Query(None, description="Id группы, аудитории или преподавателя", alias="id", ge=1),
+    limit: int = Query(500, description="Максимальное количество изменений", ge=1, le=5000),
+) -> models.ScheduleChanges:
+    return await ChangeService.get_changes(db=db, since=since, limit=limit, entity=entity, entity_id=id_)
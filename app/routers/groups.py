@@ -1,14 +1,17 @@
-from typing import List, Optional
+from typing import List, Optional, Union
 
 from fastapi import APIRouter, Depends, Path, Query
 from fastapi_cache.decorator import cache
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
+from starlette.requests import Request
+from starlette.responses import Response
 
 from app import models
 from app.config import config
 from app.database.connection import get_session
 from app.services.api import GroupService
+from app.services.schedule_versions import Version, schedule_versions
 from app.utils.cache import key_builder_exclude_db
 
 router = APIRouter(prefix=config.PREFIX)
@@ -55,9 +58,22 @@ async def get_group(
     description="Получить группу и её расписание по названию",
     summary="Получение группы и её расписания по названию",
 )
-@cache(namespace="group", expire=60 * 60, key_builder=key_builder_exclude_db)
 async def get_group_schedule(
+    request: Request,
     db: AsyncSession = Depends(get_session),
     name: str = Path(..., description="Имя группы"),
-) -> models.Group:
-    return await GroupService.get_group_by_name(db=db, name=name)
+) -> Union[models.Group, Response]:
+    group = await GroupService.get_current_group(name=name)
+    version = await schedule_versions.get("group", group.name)
+    if version and version.is_not_modified(request):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=version.headers)
+
+    # Готовый JSON формирует парсер после сохранения группы, поэтому отдаём его без ORM и pydantic
+    snapshot = await GroupService.get_group_snapshot(db=db, group_id=group.id)
+    if not snapshot:
+        return await GroupService.get_group(db=db, id_=group.id)
+
+    version = Version(snapshot.etag, snapshot.updated_at)
+    if version.is_not_modified(request):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=version.headers)
+    return Response(content=snapshot.data, media_type="application/json", headers=version.headers)
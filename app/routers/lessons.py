@@ -1,13 +1,16 @@
-from typing import List, Optional
+from typing import List, Optional, Union
 
 from fastapi import APIRouter, Depends, Path, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
+from starlette.requests import Request
+from starlette.responses import Response
 
 from app import models
 from app.config import config
 from app.database.connection import get_session
 from app.services.api import LessonCallService, LessonService, LessonTypeService
+from app.services.schedule_versions import get_not_modified_response
 
 router = APIRouter(prefix=config.PREFIX)
 
@@ -53,11 +56,16 @@ async def get_lesson(
     summary="Получение всех занятий аудитории по id",
 )
 async def get_lessons_by_room(
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_session),
     id_: int = Path(..., description="Id аудитории", alias="id"),
     week: int = Query(None, description="Номер недели"),
     date: str = Query(None, description="Дата в формате: YYYY-MM-DD"),
-) -> list[models.Lesson]:
+) -> Union[list[models.Lesson], Response]:
+    if not_modified := await get_not_modified_response(request, response, "room", id_):
+        return not_modified
+
     return await LessonService.get_lessons_by_room_id(db=db, room_id=id_, week=week, date=date)
 
 
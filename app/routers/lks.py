@@ -1,11 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, Path
+from typing import Union
+
+from fastapi import APIRouter, Depends, Path
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
+from starlette.requests import Request
+from starlette.responses import Response
 
 from app import models
 from app.config import config
 from app.database.connection import get_session
 from app.services.api import GroupService
+from app.services.schedule_versions import get_not_modified_response
+from app.services.semester_grid import semester_grid
 
 router = APIRouter(prefix=config.PREFIX)
 
@@ -51,119 +57,19 @@ router = APIRouter(prefix=config.PREFIX)
     description="Получить расписание в формате ЛКс",
 )
 async def get_lks_schedule(
+    request: Request,
+    response: Response,
     group_name: str = Path(..., min_length=1),
     db: AsyncSession = Depends(get_session),
-):
+) -> Union[models.LksSchedule, Response]:
     # ivbo-01-21 -> ИВБО-01-21
-    group_name = lat_to_cyr(group_name)
-
-    group = await GroupService.get_group_by_name(db=db, name=group_name)
-
-    if not group:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Группа `{group_name}` не найдена",
-        )
-
-    lessons = group.lessons  # type: list[models.Lesson]
-
-    def get_subgroup_substr(les: models.Lesson):
-        """Returns subgroup substring for lesson"""
-        return f" ({les.subgroup} подгруппа)" if les.subgroup else ""
-
-    # week = models.LksWeeks(
-    #     WEEKS={
-    #         week: models.LksDay(
-    #             DAYS={
-    #                 day: models.LksLessons(
-    #                     LESSONS={
-    #                         str(lesson.calls.num): [
-    #                             models.LksLesson(
-    #                                 PROPERTY_DISCIPLINE_NAME=lesson.discipline.name + get_subgroup_substr(lesson),
-    #                                 PROPERTY_LESSON_TYPE=get_lesson_type(
-    #                                     lesson.lesson_type.name if lesson.lesson_type else ""),
-    #                                 PROPERTY_NUMBER=str(lesson.calls.num),
-    #                                 PROPERTY_LECTOR=", ".join([teacher.name for teacher in lesson.teachers or []]),
-    #                                 PROPERTY_PLACE=lesson.room.name if lesson.room else "",
-    #                             )
-    #                             for tmp in lessons if tmp.calls.num == lesson.calls.num
-    #                         ]
-    #                         for lesson in lessons if lesson.weekday == day and week in lesson.weeks
-    #                     }
-    #                 )
-    #                 for day in range(1, 8)
-    #             }
-    #         )
-    #         for week in range(1, 18)
-    #     }
-    # )
-
-    lks_week_weeks = {}
-    for week in range(1, 18):  # 17 - максимальное количество недель в семестре. TODO: загружать из настроек
-        lks_week_days = {}
-        for day in range(1, 7):  # 1-6 - пн-сб
-            lks_week_lessons = {}
-            for lesson in lessons:
-                # Если это предмет "Военная подготовка", то он должен проходить на всех неделях
-                if lesson.discipline.name == "Военная подготовка" and week in lesson.weeks and lesson.weekday == day:
-                    lks_week_lessons[str(lesson.calls.num)] = [
-                        models.LksLesson(
-                            PROPERTY_DISCIPLINE_NAME=lesson.discipline.name + get_subgroup_substr(lesson),
-                            PROPERTY_LESSON_TYPE=get_lesson_type(lesson.lesson_type.name if lesson.lesson_type else ""),
-                            PROPERTY_NUMBER=str(lesson.calls.num),
-                            PROPERTY_LECTOR=", ".join([teacher.name for teacher in lesson.teachers or []]),
-                            PROPERTY_PLACE=lesson.room.name if lesson.room else "",
-                        )
-                    ]
-                    continue
-
-                # Получаем все lessons с таким же calls.num (номером пары) для текущей недели и дня
-                tmp_lessons = [
-                    tmp
-                    for tmp in lessons
-                    if tmp.calls.num == lesson.calls.num and week in tmp.weeks and tmp.weekday == day
-                ]
-
-                if not tmp_lessons:
-                    continue
-
-                # Добавляем в lks_week_lessons пару с номером calls.num если её ещё нет
-                if str(lesson.calls.num) not in lks_week_lessons:
-                    lks_week_lessons[str(lesson.calls.num)] = [
-                        models.LksLesson(
-                            PROPERTY_DISCIPLINE_NAME=tmp.discipline.name + get_subgroup_substr(tmp),
-                            PROPERTY_LESSON_TYPE=get_lesson_type(tmp.lesson_type.name if tmp.lesson_type else ""),
-                            PROPERTY_NUMBER=str(tmp.calls.num),
-                            PROPERTY_LECTOR=", ".join([teacher.name for teacher in tmp.teachers or []]),
-                            PROPERTY_PLACE=tmp.room.name if tmp.room else "",
-                        )
-                        for tmp in tmp_lessons
-                    ]
-
-            lks_week_days[str(day)] = models.LksLessons(LESSONS=lks_week_lessons)
-        lks_week_weeks[str(week)] = models.LksDay(DAYS=lks_week_days)
-
-    return models.LksSchedule(result=models.LksWeeks(WEEKS=lks_week_weeks))
-
-
-def lat_to_cyr(string: str) -> str:
-    """Converts latin letters to cyrillic"""
-    symbols = (
-        "abvgdeejzijklmnoprstufhzcss_y_euABVGDEEJZIJKLMNOPRSTUFHZCSS_Y_EU",
-        "абвгдеёжзийклмнопрстуфхцчшщъыьэюАБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮ",
-    )
-
-    tr = {ord(a): ord(b) for a, b in zip(*symbols)}
-    return string.translate(tr).upper()
+    group = await GroupService.get_current_group(name=group_name)
 
+    # Количество недель в ответе зависит от сетки семестра
+    grid = await semester_grid.get()
+    if not_modified := await get_not_modified_response(request, response, "group", group.name, grid.max_week):
+        return not_modified
 
-def get_lesson_type(lesson_type_name: str) -> str:
-    """Converts lesson type name to short form"""
-    if lesson_type_name == "пр":
-        return "П"
-    elif lesson_type_name == "лек":
-        return "Л"
-    elif lesson_type_name == "лаб":
-        return "ЛБ"
-    else:
-        return ""
+    # Готовый JSON кэшируется по имени группы и сбрасывается вместе с кэшем расписания группы
+    content = await GroupService.get_lks_schedule(db=db, name=group.name, grid=grid)
+    return Response(content=content, media_type="application/json", headers=response.headers)
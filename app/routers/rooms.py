@@ -1,19 +1,22 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Union
 
-from fastapi import APIRouter, Depends, Path, Query
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
 from fastapi_cache.decorator import cache
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
+from starlette.requests import Request
+from starlette.responses import Response
 
 import app.services.crud_schedule as schedule_crud
 from app import models
 from app.config import config
-from app.database import tables
 from app.database.connection import get_session
 from app.models import RoomStatusGet, WorkloadGet
 from app.services.api import RoomService
+from app.services.room_occupancy import room_occupancy
+from app.services.schedule_versions import get_not_modified_response
+from app.services.semester_grid import semester_grid
 from app.utils.cache import key_builder_exclude_db
 
 router = APIRouter(prefix=config.PREFIX)
@@ -28,7 +31,6 @@ router = APIRouter(prefix=config.PREFIX)
     summary="Получение статусов аудиторий",
 )
 async def get_statuses(
-    db: AsyncSession = Depends(get_session),
     date_time: datetime = Query(
         datetime.now(),
         description="Дата и время в ISO формате. Пример: 2021-09-01T00:00:00+03:00",
@@ -36,7 +38,7 @@ async def get_statuses(
     campus_id: int = Query(..., description="Id кампуса"),
 ) -> List[RoomStatusGet]:
     date_time = date_time.replace(tzinfo=None)
-    return await schedule_crud.get_rooms_statuses(db=db, time=date_time, campus_id=campus_id)
+    return await room_occupancy.get_statuses(date_time, campus_id)
 
 
 @router.get(
@@ -48,7 +50,6 @@ async def get_statuses(
     summary="Получение статусов аудиторий",
 )
 async def get_status_by_id(
-    db: AsyncSession = Depends(get_session),
     date_time: datetime = Query(
         datetime.now(),
         description="Дата и время в ISO формате. Пример: 2021-09-01T00:00:00+03:00",
@@ -56,7 +57,7 @@ async def get_status_by_id(
     id: int = Path(..., description="Id аудитории"),
 ) -> RoomStatusGet:
     date_time = date_time.replace(tzinfo=None)
-    return await schedule_crud.get_rooms_status(db=db, time=date_time, room_id=id)
+    return await room_occupancy.get_status(date_time, id)
 
 
 @router.get(
@@ -66,21 +67,10 @@ async def get_status_by_id(
     description="Получить загруженность аудиторий",
     summary="Получение загруженности аудиторий",
 )
-@cache(namespace="rooms", expire=60 * 60 * 24, key_builder=key_builder_exclude_db)
 async def get_rooms_workload(
-    db: AsyncSession = Depends(get_session),
     campus_id: int = Query(..., description="Id кампуса"),
 ) -> List[WorkloadGet]:
-    sttm = select(tables.Room).where(tables.Room.campus_id == campus_id)
-
-    rows = await db.stream(sttm)
-
-    workload = []
-    async for row in rows:
-        for room in row:
-            workload.append(WorkloadGet(id=room.id, workload=await schedule_crud.get_room_workload(db, room.id)))
-
-    return workload
+    return await room_occupancy.get_workloads(campus_id)
 
 
 @router.get(
@@ -91,11 +81,19 @@ async def get_rooms_workload(
     summary="Получение загруженности аудиторий",
 )
 async def get_room_workload(
-    db: AsyncSession = Depends(get_session),
+    request: Request,
+    response: Response,
     id: int = Path(..., description="Id аудитории"),
-) -> WorkloadGet:
-    room = (await db.execute(select(tables.Room).where(tables.Room.id == id))).scalar()
-    return WorkloadGet(id=room.id, workload=await schedule_crud.get_room_workload(db, room.id))
+) -> Union[WorkloadGet, Response]:
+    # Загруженность зависит от сетки семестра (/max-week), а не только от расписания аудитории
+    grid = await semester_grid.get()
+    if not_modified := await get_not_modified_response(request, response, "room", id, grid.max_week):
+        return not_modified
+
+    workload = await room_occupancy.get_workload(id)
+    if not workload:
+        raise HTTPException(status_code=404, detail=f"Аудитория {id} не найдена")
+    return workload
 
 
 @router.get(
@@ -137,14 +135,15 @@ async def get_room(
     response_model=list[models.Room],
     response_description="Аудитория найдена и возвращена в ответе",
     status_code=status.HTTP_200_OK,
-    description="Поиск аудитории по названию аудитории (по подстроке)",
+    description="Поиск аудитории по названию аудитории (по подстроке и похожим названиям)",
     summary="Поиск аудитории",
 )
 async def search_rooms(
     db: AsyncSession = Depends(get_session),
     name: str = Path(..., description="Номер аудитории"),
+    limit: int = Query(30, description="Максимальное количество результатов", ge=1, le=100),
 ) -> list[models.Room]:
-    return [models.Room.from_orm(room) for room in await schedule_crud.search_room(db, name)]
+    return await RoomService.search_rooms(db=db, name=name, limit=limit)
 
 
 @router.get(
@@ -156,7 +155,14 @@ async def search_rooms(
     summary="Получение подробной информации об аудитории",
 )
 async def get_info(
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_session),
     id_: int = Path(..., description="Id аудитории", alias="id"),
-) -> models.RoomInfo:
+) -> Union[models.RoomInfo, Response]:
+    # В информации об аудитории есть загруженность, которая зависит от сетки семестра (/max-week)
+    grid = await semester_grid.get()
+    if not_modified := await get_not_modified_response(request, response, "room", id_, grid.max_week):
+        return not_modified
+
     return await schedule_crud.get_room_info(db, id_)
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from app import models
+from app.config import config
+from app.database.connection import get_session
+from app.services.search import search_index
+
+router = APIRouter(prefix=config.PREFIX)
+
+
+@router.get(
+    "/search",
+    response_model=list[models.SearchResult],
+    response_description="Результаты поиска успешно получены и возвращены в ответе",
+    status_code=status.HTTP_200_OK,
+    description="Поиск групп текущего периода, преподавателей, аудиторий и дисциплин по названию для подсказок при "
+    "вводе. Результаты отсортированы по релевантности: точное совпадение, совпадение начала, сходство",
+    summary="Общий поиск по названию",
+)
+async def search(
+    db: AsyncSession = Depends(get_session),
+    q: str = Query(..., description="Строка поиска", min_length=1, max_length=256),
+    limit: int = Query(10, description="Максимальное количество результатов", ge=1, le=50),
+) -> list[models.SearchResult]:
+    return [
+        models.SearchResult(type=type_, id=id_, name=name)
+        for type_, id_, name in await search_index.search(db, q, limit)
+    ]
@@ -1,13 +1,16 @@
-from typing import List, Optional
+from typing import List, Optional, Union
 
 from fastapi import APIRouter, Depends, Path, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
+from starlette.requests import Request
+from starlette.responses import Response
 
 from app import models
 from app.config import config
 from app.database.connection import get_session
 from app.services.api import TeacherService
+from app.services.schedule_versions import get_not_modified_response
 
 router = APIRouter(prefix=config.PREFIX)
 
@@ -38,9 +41,14 @@ async def get_teachers(
     summary="Получение преподавателя по id",
 )
 async def get_teacher(
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_session),
     id_: int = Path(..., description="Id преподавателя", alias="id"),
-) -> models.Teacher:
+) -> Union[models.Teacher, Response]:
+    if not_modified := await get_not_modified_response(request, response, "teacher", id_):
+        return not_modified
+
     return await TeacherService.get_teacher(db=db, id_=id_)
 
 
@@ -55,5 +63,6 @@ async def get_teacher(
 async def search_teacher_by_name(
     db: AsyncSession = Depends(get_session),
     name: str = Path(..., description="Имя преподавателя"),
+    limit: int = Query(30, description="Максимальное количество результатов", ge=1, le=100),
 ) -> list[models.Teacher]:
-    return await TeacherService.search_teachers(db=db, name=name)
+    return await TeacherService.search_teachers(db=db, name=name, limit=limit)
@@ -13,20 +13,25 @@ from app.config import config
 from app.database.connection import get_session
 from app.models import SettingsCreate
 from app.services.api.info import InfoService
+from app.services.cache_invalidation import publish_invalidation
 from app.services.utils import get_week
+from app.utils.cache import SEMESTER_GRID_SCOPE, invalidate_schedule_cache
 from worker import app
 
 router = APIRouter(prefix=config.PREFIX)
 
 
 @router.post("/parse-schedule/", status_code=204)
-async def parse_schedule(secret_key: str = Query(..., description="Ключ доступа")) -> Response:
+async def parse_schedule(
+    secret_key: str = Query(..., description="Ключ доступа"),
+    force: bool = Query(False, description="Парсить документы, даже если они не изменились с прошлого парсинга"),
+) -> Response:
     if not config.ENABLE_MANUAL_SCHEDULE_UPDATE:
         raise HTTPException(400, "Функция ручного обновления расписания отключена")
     if secret_key != config.SECRET_KEY:
         raise HTTPException(401, "Неверный ключ доступа")
 
-    app.send_task("worker.tasks.parse_schedule")
+    app.send_task("worker.tasks.parse_schedule", kwargs={"force": force})
     return Response(status_code=204)
 
 
@@ -61,8 +66,8 @@ async def clear_cache(secret_key: str = Query(..., description="Ключ дос
     if secret_key != config.SECRET_KEY:
         raise HTTPException(401, "Неверный ключ доступа")
 
-    await FastAPICache.clear(namespace="groups")
-    await FastAPICache.clear(namespace="rooms")
+    await invalidate_schedule_cache(FastAPICache.get_backend())
+    await publish_invalidation()
 
     logger.info("Кэш был очищен")
 
@@ -108,7 +113,14 @@ async def update_max_week_count(
 ) -> models.SettingsGet:
     if secret_key != config.SECRET_KEY:
         raise HTTPException(401, "Неверный ключ доступа")
-    return await InfoService.set_max_week(db=db, settings=settings)
+
+    max_week = await InfoService.set_max_week(db=db, settings=settings)
+
+    # Загруженность аудиторий считается по сетке семестра
+    await publish_invalidation(SEMESTER_GRID_SCOPE)
+    await invalidate_schedule_cache(FastAPICache.get_backend(), groups=[], teachers=[])
+
+    return max_week
 
 
 @router.get(
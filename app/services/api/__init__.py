@@ -1,4 +1,5 @@
 from app.services.api.campus import CampusService
+from app.services.api.change import ChangeService
 from app.services.api.degree import DegreeService
 from app.services.api.discipline import DisciplineService
 from app.services.api.group import GroupService
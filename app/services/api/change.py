@@ -0,0 +1,41 @@
+from typing import Optional
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+from app.services.db import LessonDBService, ScheduleChangeDBService
+
+
+class ChangeService:
+    """Сервис для работы с журналом изменений расписания."""
+
+    @classmethod
+    async def get_changes(
+        cls, db: AsyncSession, since: int, limit: int, entity: Optional[str] = None, entity_id: Optional[int] = None
+    ) -> models.ScheduleChanges:
+        """Получение изменений расписания после курсора since"""
+
+        logger.debug(f"Запрос на получение изменений расписания: {since = } {entity = } {entity_id = }")
+
+        changes = await ScheduleChangeDBService.get_changes(
+            db=db, since=since, limit=limit + 1, entity=entity, entity_id=entity_id
+        )
+        has_more = len(changes) > limit
+        changes = [models.ScheduleChange.from_orm(change) for change in changes[:limit]]
+
+        lessons_ids = list({change.lesson_id for change in changes if change.action != "removed"})
+        if lessons_ids:
+            lessons = await LessonDBService.get_lessons(
+                db=db, lessons_ids=lessons_ids, limit=len(lessons_ids), offset=0
+            )
+            lessons = {lesson.id: models.Lesson.from_orm(lesson) for lesson in lessons}
+            for change in changes:
+                if change.action != "removed":
+                    change.lesson = lessons.get(change.lesson_id)
+
+        return models.ScheduleChanges(
+            cursor=changes[-1].id if changes else since,
+            has_more=has_more,
+            changes=changes,
+        )
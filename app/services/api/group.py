@@ -1,12 +1,21 @@
 from typing import List, Optional
 
 from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi_cache.coder import PickleCoder
+from fastapi_cache.decorator import cache
 from loguru import logger
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.responses import JSONResponse
 
 from app import models
 from app.database import tables
-from app.services.db import GroupDBService
+from app.services.db import GroupDBService, GroupSnapshotDBService
+from app.services.group_directory import GroupEntry, group_directory
+from app.services.lks import build_lks_schedule
+from app.services.semester_grid import SemesterGrid
+from app.utils.cache import entity_key_builder
 
 
 class GroupService:
@@ -40,11 +49,55 @@ class GroupService:
 
         logger.debug(f"Запрос на получение группы с {name = }")
 
-        group = await cls._get_one_by_name(db=db, name=name, period_id=period_id)
+        if period_id:
+            group = await cls._get_one_by_name(db=db, name=name, period_id=period_id)
+        else:
+            group = await cls._get_one(db=db, id_=(await cls.get_current_group(name=name)).id)
         logger.debug(f"Группа получена: {group}")
 
         return models.Group.from_orm(group)
 
+    @classmethod
+    async def get_current_group(cls, name: str) -> GroupEntry:
+        """Получение группы текущего периода по имени из справочника групп (без запроса к БД)"""
+
+        group = await group_directory.get(name)
+        if not group:
+            logger.warning(f"Группа с {name = } не найдена")
+            raise HTTPException(status_code=404, detail=f"Группа {name} не найдена")
+        return group
+
+    @classmethod
+    @cache(namespace="group", expire=60 * 60 * 24, coder=PickleCoder, key_builder=entity_key_builder("group", "name"))
+    async def get_lks_schedule(cls, db: AsyncSession, name: str, grid: SemesterGrid) -> bytes:
+        """Получение готового JSON расписания группы в формате ЛКс"""
+
+        logger.debug(f"Запрос на получение расписания ЛКс группы с {name = }")
+
+        group = await cls.get_group_by_name(db=db, name=name)
+        return build_lks_schedule(group.lessons, grid)
+
+    @classmethod
+    async def get_group_snapshot(cls, db: AsyncSession, group_id: int) -> Optional[Row]:
+        """Получение готового JSON расписания группы"""
+
+        logger.debug(f"Запрос на получение JSON расписания группы с {group_id = }")
+
+        return await GroupSnapshotDBService.get_snapshot(db=db, group_id=group_id)
+
+    @classmethod
+    async def update_group_snapshot(cls, db: AsyncSession, group_id: int) -> None:
+        """Формирование и сохранение готового JSON расписания группы (как в ответе /groups/name/{name})"""
+
+        group = models.Group.from_orm(await GroupDBService.get_group(db=db, id_=group_id, populate_existing=True))
+
+        # Порядок занятий и преподавателей фиксирован, чтобы JSON (и ETag) не менялся без изменения расписания
+        group.lessons.sort(key=lambda lesson: (lesson.weekday, lesson.calls.num, lesson.id))
+        for lesson in group.lessons:
+            lesson.teachers.sort(key=lambda teacher: teacher.id)
+
+        await GroupSnapshotDBService.save(db=db, group_id=group_id, data=JSONResponse(jsonable_encoder(group)).body)
+
     @classmethod
     async def create_group(cls, db: AsyncSession, group: models.GroupCreate) -> models.Group:
         """Создание группы"""
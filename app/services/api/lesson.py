@@ -1,12 +1,15 @@
 from typing import List, Optional
 
 from fastapi import HTTPException
+from fastapi_cache.coder import PickleCoder
+from fastapi_cache.decorator import cache
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import models
 from app.database import tables
 from app.services.db import LessonDBService
+from app.utils.cache import entity_key_builder
 
 
 class LessonService:
@@ -47,6 +50,7 @@ class LessonService:
         return models.Lesson.from_orm(lesson)
 
     @classmethod
+    @cache(namespace="room", expire=60 * 60 * 24, coder=PickleCoder, key_builder=entity_key_builder("room", "room_id"))
     async def get_lessons_by_room_id(
         cls, db: AsyncSession, room_id: int, week: Optional[int], date: Optional[str]
     ) -> List[models.Lesson]:
@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app import models
 from app.database import tables
 from app.services.db import RoomDBService
+from app.services.search import search
 
 
 class RoomService:
@@ -48,6 +49,21 @@ class RoomService:
 
         return models.Room.from_orm(room)
 
+    @classmethod
+    async def search_rooms(cls, db: AsyncSession, name: str, limit: int) -> List[models.Room]:
+        """Поиск аудиторий по названию"""
+
+        logger.debug(f"Запрос на поиск аудиторий с {name = }")
+
+        ids = await search(db=db, entity="room", query=name, limit=limit)
+        if not ids:
+            return []
+
+        rooms = {room.id: room for room in await RoomDBService.get_rooms(db, ids, None, limit, 0)}
+        logger.debug(f"Аудитории найдены: {ids}")
+
+        return [models.Room.from_orm(rooms[id_]) for id_ in ids if id_ in rooms]
+
     @classmethod
     async def create_room(cls, db: AsyncSession, room: models.RoomCreate) -> models.Room:
         """Создание аудитории"""
@@ -1,12 +1,16 @@
 from typing import List, Optional
 
 from fastapi import HTTPException
+from fastapi_cache.coder import PickleCoder
+from fastapi_cache.decorator import cache
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import models
 from app.database import tables
 from app.services.db import TeacherDBService
+from app.services.search import search
+from app.utils.cache import entity_key_builder
 
 
 class TeacherService:
@@ -36,6 +40,9 @@ class TeacherService:
         return [models.Teacher.from_orm(teacher) for teacher in teachers]
 
     @classmethod
+    @cache(
+        namespace="teacher", expire=60 * 60 * 24, coder=PickleCoder, key_builder=entity_key_builder("teacher", "id_")
+    )
     async def get_teacher(cls, db: AsyncSession, id_: int) -> models.Teacher:
         """Получение преподавателя по идентификатору"""
 
@@ -58,7 +65,7 @@ class TeacherService:
         return models.Teacher.from_orm(teacher)
 
     @classmethod
-    async def search_teachers(cls, db: AsyncSession, name: str) -> List[models.Teacher]:
+    async def search_teachers(cls, db: AsyncSession, name: str, limit: int) -> List[models.Teacher]:
         """Поиск преподавателей по имени"""
 
         logger.debug(f"Запрос на поиск преподавателей с {name = }")
@@ -66,10 +73,14 @@ class TeacherService:
         if len(name) < 3:
             raise HTTPException(status_code=400, detail="Имя должно быть не менее 3 символов")
 
-        teachers = await TeacherDBService.search_teachers(db=db, name=name)
-        logger.debug(f"Преподаватели получен: {teachers}")
+        ids = await search(db=db, entity="teacher", query=name, limit=limit)
+        if not ids:
+            return []
 
-        return [models.Teacher.from_orm(teacher) for teacher in teachers]
+        teachers = {teacher.id: teacher for teacher in await TeacherDBService.get_teachers(db, ids, limit, 0)}
+        logger.debug(f"Преподаватели найдены: {ids}")
+
+        return [models.Teacher.from_orm(teachers[id_]) for id_ in ids if id_ in teachers]
 
     @classmethod
     async def create_teacher(cls, db: AsyncSession, teacher: models.TeacherCreate) -> models.Teacher:
@@ -81,7 +92,7 @@ class TeacherService:
 
         db_teacher = await TeacherDBService.create(db=db, teacher=teacher)
         await db.commit()
-        await db.refresh(db_teacher)
+        db_teacher = await TeacherDBService.get_teacher(db=db, id_=db_teacher.id)
 
         logger.info(f"Создан новый преподаватель: {teacher = }")
 
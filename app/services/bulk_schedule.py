@@ -0,0 +1,476 @@
+from dataclasses import dataclass, field
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import bindparam, delete, func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.tables import (
+    Lesson,
+    LessonCall,
+    LessonType,
+    Room,
+    ScheduleCampus,
+    ScheduleDiscipline,
+    SchedulePeriod,
+    Teacher,
+    lessons_to_teachers,
+)
+from app.parser.structures import Call, ParsedLesson, ParsedSchedule
+from app.services.dimension_cache import DimensionCache
+from app.services.period_cache import PeriodKey
+
+# asyncpg ограничивает количество параметров в одном запросе (32767)
+CHUNK_SIZE = 1000
+
+RoomKey = Tuple[str, Optional[int]]
+
+
+@dataclass
+class Dimensions:
+    """Идентификаторы справочников, использующихся в документе расписания"""
+
+    disciplines: dict[str, int] = field(default_factory=dict)
+    teachers: dict[str, int] = field(default_factory=dict)
+    lesson_types: dict[str, int] = field(default_factory=dict)
+    campuses: dict[str, int] = field(default_factory=dict)
+    rooms: dict[RoomKey, int] = field(default_factory=dict)
+    calls: dict[Call, int] = field(default_factory=dict)
+    periods: dict[PeriodKey, int] = field(default_factory=dict)
+
+
+def _chunks(rows: list, size: int = CHUNK_SIZE) -> Iterable[list]:
+    for i in range(0, len(rows), size):
+        yield rows[i : i + size]
+
+
+class LessonFingerprint(NamedTuple):
+    """Канонический отпечаток занятия группы. Одинаковые занятия из документа и из БД дают равные отпечатки"""
+
+    call_id: int
+    weekday: int
+    discipline_id: int
+    lesson_type_id: Optional[int]
+    room_id: Optional[int]
+    subgroup: Optional[int]
+    weeks: Tuple[int, ...]
+    teachers_id: Tuple[int, ...]
+
+    @property
+    def slot(self) -> tuple:
+        """Занятие, у которого поменялись только аудитория, недели или преподаватели, считается перенесённым
+        и обновляется на месте"""
+
+        return self.call_id, self.weekday, self.discipline_id, self.lesson_type_id, self.subgroup
+
+
+def lesson_key(row: dict, teachers_id: Iterable[int]) -> LessonFingerprint:
+    """Канонический ключ занятия группы"""
+
+    return LessonFingerprint(
+        row["call_id"],
+        row["weekday"],
+        row["discipline_id"],
+        row["lesson_type_id"],
+        row["room_id"],
+        row["subgroup"],
+        tuple(sorted(row["weeks"])),
+        tuple(sorted(teachers_id)),
+    )
+
+
+def _resolve_cached(cache: Optional[DimensionCache], dimension: str, keys: Iterable) -> Tuple[dict, list]:
+    if cache is None:
+        return {}, list(keys)
+    return cache.resolve(dimension, keys)
+
+
+async def _upsert_names(
+    db: AsyncSession, table, values: dict[str, dict], cache: Optional[DimensionCache], dimension: str
+) -> dict[str, int]:
+    """INSERT ... ON CONFLICT DO NOTHING для справочника с уникальным именем и получение id по именам"""
+
+    ids, names = _resolve_cached(cache, dimension, values)
+    if not names:
+        return ids
+
+    for chunk in _chunks(names):
+        await db.execute(pg_insert(table).values([values[name] for name in chunk]).on_conflict_do_nothing())
+
+    created = {}
+    for chunk in _chunks(names):
+        res = await db.execute(select(table.id, table.name).where(table.name.in_(chunk)))
+        created.update({name: id_ for id_, name in res})
+
+    return ids | created
+
+
+async def _get_or_create_rooms(
+    db: AsyncSession, keys: set[RoomKey], cache: Optional[DimensionCache]
+) -> dict[RoomKey, int]:
+    """Аудитории не имеют уникального ограничения по (name, campus_id), поэтому сначала ищем существующие"""
+
+    ids, keys = _resolve_cached(cache, "rooms", keys)
+    if not keys:
+        return ids
+
+    keys = set(keys)
+    names = list({name for name, _ in keys})
+    found = {}
+    for chunk in _chunks(names):
+        res = await db.execute(select(Room.id, Room.name, Room.campus_id).where(Room.name.in_(chunk)))
+        found.update({(name, campus_id): id_ for id_, name, campus_id in res if (name, campus_id) in keys})
+
+    missing = [{"name": name, "campus_id": campus_id} for name, campus_id in keys if (name, campus_id) not in found]
+    for chunk in _chunks(missing):
+        res = await db.execute(insert(Room).values(chunk).returning(Room.id, Room.name, Room.campus_id))
+        found.update({(name, campus_id): id_ for id_, name, campus_id in res})
+
+    return ids | found
+
+
+async def _get_or_create_calls(db: AsyncSession, keys: set[Call], cache: Optional[DimensionCache]) -> dict[Call, int]:
+    """Звонков немного, поэтому загружаем их все одним запросом"""
+
+    ids, keys = _resolve_cached(cache, "calls", keys)
+    if not keys:
+        return ids
+
+    res = await db.execute(select(LessonCall.id, LessonCall.num, LessonCall.time_start, LessonCall.time_end))
+    found = {(num, time_start, time_end): id_ for id_, num, time_start, time_end in res}
+
+    missing = [
+        {"num": num, "time_start": time_start, "time_end": time_end}
+        for num, time_start, time_end in keys
+        if (num, time_start, time_end) not in found
+    ]
+    if missing:
+        res = await db.execute(
+            insert(LessonCall)
+            .values(missing)
+            .returning(LessonCall.id, LessonCall.num, LessonCall.time_start, LessonCall.time_end)
+        )
+        found.update({(num, time_start, time_end): id_ for id_, num, time_start, time_end in res})
+
+    return ids | {key: found[key] for key in keys}
+
+
+async def _get_or_create_periods(
+    db: AsyncSession, keys: set[PeriodKey], cache: Optional[DimensionCache]
+) -> dict[PeriodKey, int]:
+    """Периодов в документе обычно один, поэтому ищем и создаём их по одному"""
+
+    ids, keys = _resolve_cached(cache, "periods", keys)
+    for year_start, year_end, semester in keys:
+        res = await db.execute(
+            select(SchedulePeriod.id)
+            .where(
+                SchedulePeriod.year_start == year_start,
+                SchedulePeriod.year_end == year_end,
+                SchedulePeriod.semester == semester,
+            )
+            .limit(1)
+        )
+        id_ = res.scalar()
+        if id_ is None:
+            res = await db.execute(
+                insert(SchedulePeriod)
+                .values(year_start=year_start, year_end=year_end, semester=semester)
+                .returning(SchedulePeriod.id)
+            )
+            id_ = res.scalar()
+        ids[year_start, year_end, semester] = id_
+    return ids
+
+
+async def upsert_dimensions(
+    db: AsyncSession, schedules: List[ParsedSchedule], cache: Optional[DimensionCache] = None
+) -> Dimensions:
+    """Сохранение всех справочных значений документа несколькими пакетными запросами.
+
+    Значения, уже известные кэшу справочников, в БД не запрашиваются. Новые id в кэш не добавляются:
+    после commit их добавляет вызывающий код (DimensionCache.update), чтобы после rollback в кэше
+    не остались id несуществующих записей.
+    """
+
+    disciplines, teachers, lesson_types, campuses = {}, {}, {}, {}
+    rooms: set[Tuple[str, Optional[str]]] = set()
+    calls: set[Call] = set()
+    periods: set[PeriodKey] = set()
+
+    for schedule in schedules:
+        calls.update(schedule.calls)
+        periods.add((schedule.period.year_start, schedule.period.year_end, schedule.period.semester))
+        for lesson in schedule.lessons:
+            disciplines[lesson.name] = {"name": lesson.name}
+            for teacher in lesson.teachers:
+                teachers[teacher] = {"name": teacher}
+            if lesson.type:
+                lesson_types[lesson.type] = {"name": lesson.type}
+            if lesson.room is not None:
+                campus = lesson.room.campus
+                if campus:
+                    campuses[campus.name] = {"name": campus.name, "short_name": campus.short_name}
+                rooms.add((lesson.room.name, campus.name if campus else None))
+
+    dimensions = Dimensions(
+        disciplines=await _upsert_names(db, ScheduleDiscipline, disciplines, cache, "disciplines"),
+        teachers=await _upsert_names(db, Teacher, teachers, cache, "teachers"),
+        lesson_types=await _upsert_names(db, LessonType, lesson_types, cache, "lesson_types"),
+        campuses=await _upsert_names(db, ScheduleCampus, campuses, cache, "campuses"),
+        calls=await _get_or_create_calls(db, calls, cache),
+        periods=await _get_or_create_periods(db, periods, cache),
+    )
+    dimensions.rooms = await _get_or_create_rooms(
+        db, {(name, dimensions.campuses.get(campus) if campus else None) for name, campus in rooms}, cache
+    )
+    return dimensions
+
+
+def build_lesson_rows(
+    group_id: int, lessons: Iterable[ParsedLesson], dimensions: Dimensions
+) -> list[Tuple[dict, list]]:
+    """Преобразование занятий документа в строки таблицы schedule_lesson и id преподавателей"""
+
+    rows = {}
+    for lesson in lessons:
+        room_id = None
+        if lesson.room is not None:
+            campus = lesson.room.campus
+            campus_id = dimensions.campuses.get(campus.name) if campus else None
+            room_id = dimensions.rooms[(lesson.room.name, campus_id)]
+
+        row = {
+            "group_id": group_id,
+            "call_id": dimensions.calls[lesson.call],
+            "discipline_id": dimensions.disciplines[lesson.name],
+            "weekday": lesson.weekday,
+            "room_id": room_id,
+            "lesson_type_id": dimensions.lesson_types[lesson.type] if lesson.type else None,
+            "subgroup": lesson.subgroup,
+            "weeks": list(lesson.weeks),
+        }
+        teachers_id = list(dict.fromkeys(dimensions.teachers[teacher] for teacher in lesson.teachers))
+
+        # Одинаковые занятия в документе сохраняем один раз
+        rows.setdefault(lesson_key(row, teachers_id), (row, teachers_id))
+
+    return list(rows.values())
+
+
+async def insert_lessons(db: AsyncSession, rows: list[Tuple[dict, list]]) -> list[int]:
+    """Пакетная вставка занятий и связей с преподавателями"""
+
+    if not rows:
+        return []
+
+    # id выделяем заранее, чтобы не зависеть от порядка строк в RETURNING
+    res = await db.execute(
+        select(func.nextval("schedule_lesson_id_seq")).select_from(func.generate_series(1, len(rows)))
+    )
+    ids = res.scalars().all()
+
+    lessons = [{"id": id_, **row} for id_, (row, _) in zip(ids, rows)]
+    links = [
+        {"lesson_id": id_, "teacher_id": teacher_id}
+        for id_, (_, teachers_id) in zip(ids, rows)
+        for teacher_id in teachers_id
+    ]
+
+    for chunk in _chunks(lessons):
+        await db.execute(insert(Lesson).values(chunk))
+    for chunk in _chunks(links):
+        await db.execute(insert(lessons_to_teachers).values(chunk))
+
+    return ids
+
+
+# Событие журнала изменений: (сущность, id сущности, id занятия, действие)
+ChangeEvent = Tuple[str, int, int, str]
+
+
+@dataclass
+class GroupScheduleDiff:
+    """Результат синхронизации расписания группы с БД: добавленные, удалённые и перенесённые занятия"""
+
+    group_id: int
+    added: list[Tuple[int, LessonFingerprint]] = field(default_factory=list)  # (id занятия, отпечаток)
+    removed: list[Tuple[int, LessonFingerprint]] = field(default_factory=list)
+    moved: list[Tuple[int, LessonFingerprint, LessonFingerprint]] = field(default_factory=list)  # (id, было, стало)
+    # Удалённые дубликаты занятий, оставшиеся от старых версий парсера
+    duplicates: list[Tuple[int, LessonFingerprint]] = field(default_factory=list)
+    kept: int = 0
+    # Аудитории и преподаватели, чьё расписание затронуто изменениями
+    rooms_id: set[int] = field(default_factory=set)
+    teachers_id: set[int] = field(default_factory=set)
+
+    def touch(self, row: dict, teachers_id: Iterable[int]) -> None:
+        if row["room_id"] is not None:
+            self.rooms_id.add(row["room_id"])
+        self.teachers_id.update(teachers_id)
+
+    @property
+    def changed(self) -> bool:
+        """Изменились ли занятия группы в БД"""
+
+        return bool(self.lessons_changed or self.duplicates)
+
+    @property
+    def lessons_changed(self) -> bool:
+        """Изменилось ли расписание группы для студентов"""
+
+        return bool(self.added or self.removed or self.moved)
+
+    def get_change_events(self) -> list[ChangeEvent]:
+        """События журнала изменений для группы, аудиторий и преподавателей занятий.
+
+        Перенесённое занятие сохраняет id: для группы и оставшихся аудитории и преподавателей это updated,
+        для прежних - removed, для новых - added.
+        """
+
+        events = []
+
+        def add(id_: int, key: LessonFingerprint, action: str) -> None:
+            events.append(("group", self.group_id, id_, action))
+            if key.room_id is not None:
+                events.append(("room", key.room_id, id_, action))
+            events.extend(("teacher", teacher_id, id_, action) for teacher_id in key.teachers_id)
+
+        for id_, key in self.added:
+            add(id_, key, "added")
+        for id_, key in self.removed + self.duplicates:
+            add(id_, key, "removed")
+        for id_, before, after in self.moved:
+            events.append(("group", self.group_id, id_, "updated"))
+            rooms_before = {before.room_id} - {None}
+            rooms_after = {after.room_id} - {None}
+            for entity, old, new in (
+                ("room", rooms_before, rooms_after),
+                ("teacher", set(before.teachers_id), set(after.teachers_id)),
+            ):
+                events.extend((entity, entity_id, id_, "removed") for entity_id in sorted(old - new))
+                events.extend((entity, entity_id, id_, "updated") for entity_id in sorted(old & new))
+                events.extend((entity, entity_id, id_, "added") for entity_id in sorted(new - old))
+        return events
+
+    def __str__(self) -> str:
+        return (
+            f"добавлено {len(self.added)}, удалено {len(self.removed)}, перенесено {len(self.moved)}, "
+            f"без изменений {self.kept}"
+        )
+
+
+async def _get_stored_rows(db: AsyncSession, group_id: int) -> dict[LessonFingerprint, list[Tuple[int, dict, list]]]:
+    res = await db.execute(
+        select(
+            Lesson.id,
+            Lesson.call_id,
+            Lesson.weekday,
+            Lesson.discipline_id,
+            Lesson.lesson_type_id,
+            Lesson.room_id,
+            Lesson.subgroup,
+            Lesson.weeks,
+            func.array_remove(func.array_agg(lessons_to_teachers.c.teacher_id), None),
+        )
+        .outerjoin(lessons_to_teachers, lessons_to_teachers.c.lesson_id == Lesson.id)
+        .where(Lesson.group_id == group_id)
+        .group_by(Lesson.id)
+    )
+
+    stored = {}
+    for id_, call_id, weekday, discipline_id, lesson_type_id, room_id, subgroup, weeks, teachers_id in res:
+        row = {
+            "group_id": group_id,
+            "call_id": call_id,
+            "discipline_id": discipline_id,
+            "weekday": weekday,
+            "room_id": room_id,
+            "lesson_type_id": lesson_type_id,
+            "subgroup": subgroup,
+            "weeks": weeks,
+        }
+        stored.setdefault(lesson_key(row, teachers_id), []).append((id_, row, teachers_id))
+    return stored
+
+
+async def _delete_lessons(db: AsyncSession, ids: list[int]) -> None:
+    for chunk in _chunks(ids):
+        await db.execute(delete(lessons_to_teachers).where(lessons_to_teachers.c.lesson_id.in_(chunk)))
+        await db.execute(delete(Lesson).where(Lesson.id.in_(chunk)))
+
+
+async def sync_group_lessons(
+    db: AsyncSession, group_id: int, lessons: Iterable[ParsedLesson], dimensions: Dimensions
+) -> GroupScheduleDiff:
+    """Синхронизация занятий группы с распарсенным расписанием.
+
+    Занятия сравниваются по каноническому ключу: совпадающие остаются нетронутыми (и сохраняют свои id),
+    изменившиеся обновляются, остальные добавляются или удаляются.
+    """
+
+    parsed = {
+        lesson_key(row, teachers_id): (row, teachers_id)
+        for row, teachers_id in build_lesson_rows(group_id, lessons, dimensions)
+    }
+    stored = await _get_stored_rows(db, group_id)
+
+    diff = GroupScheduleDiff(group_id)
+    removed_ids = []
+    removed_by_slot: dict[tuple, list[Tuple[LessonFingerprint, int, dict, list]]] = {}
+    for key, rows in stored.items():
+        if key in parsed:
+            diff.kept += 1
+            # Дубликаты занятия, оставшиеся от старых версий парсера
+            for id_, row, teachers_id in rows[1:]:
+                removed_ids.append(id_)
+                diff.duplicates.append((id_, key))
+                diff.touch(row, teachers_id)
+        else:
+            for id_, row, teachers_id in rows:
+                removed_by_slot.setdefault(key.slot, []).append((key, id_, row, teachers_id))
+
+    added, added_keys, updated = [], [], []
+    for key, (row, teachers_id) in parsed.items():
+        if key in stored:
+            continue
+        diff.touch(row, teachers_id)
+        if candidates := removed_by_slot.get(key.slot):
+            stored_key, id_, stored_row, stored_teachers_id = candidates.pop(0)
+            diff.touch(stored_row, stored_teachers_id)
+            diff.moved.append((id_, stored_key, key))
+            updated.append((id_, row, teachers_id, sorted(stored_teachers_id) != sorted(teachers_id)))
+        else:
+            added.append((row, teachers_id))
+            added_keys.append(key)
+
+    for rows in removed_by_slot.values():
+        for key, id_, row, teachers_id in rows:
+            removed_ids.append(id_)
+            diff.removed.append((id_, key))
+            diff.touch(row, teachers_id)
+    await _delete_lessons(db, removed_ids)
+
+    if updated:
+        await db.execute(
+            update(Lesson.__table__)
+            .where(Lesson.__table__.c.id == bindparam("_id"))
+            .values(room_id=bindparam("_room_id"), weeks=bindparam("_weeks", type_=Lesson.weeks.type)),
+            [{"_id": id_, "_room_id": row["room_id"], "_weeks": row["weeks"]} for id_, row, _, _ in updated],
+        )
+        teachers_changed = {id_: teachers_id for id_, _, teachers_id, changed in updated if changed}
+        if teachers_changed:
+            await db.execute(
+                delete(lessons_to_teachers).where(lessons_to_teachers.c.lesson_id.in_(list(teachers_changed)))
+            )
+            links = [
+                {"lesson_id": id_, "teacher_id": teacher_id}
+                for id_, teachers_id in teachers_changed.items()
+                for teacher_id in teachers_id
+            ]
+            for chunk in _chunks(links):
+                await db.execute(insert(lessons_to_teachers).values(chunk))
+
+    diff.added = list(zip(await insert_lessons(db, added), added_keys))
+
+    return diff
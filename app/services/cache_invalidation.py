@@ -0,0 +1,68 @@
+import asyncio
+
+from fastapi_cache import FastAPICache
+from loguru import logger
+
+from app import config
+from app.services.group_directory import group_directory
+from app.services.period_cache import period_cache
+from app.services.room_occupancy import room_occupancy
+from app.services.schedule_versions import schedule_versions
+from app.services.search import search_index
+from app.services.semester_grid import semester_grid
+from app.utils.cache import INVALIDATION_CHANNEL, SCHEDULE_SCOPE, SEMESTER_GRID_SCOPE
+
+# Кэши в памяти процесса API, которые сбрасываются после парсинга или изменения сетки семестра
+LOCAL_CACHES = {
+    SCHEDULE_SCOPE: (schedule_versions, semester_grid, room_occupancy, search_index, group_directory, period_cache),
+    SEMESTER_GRID_SCOPE: (semester_grid, room_occupancy),
+}
+RECONNECT_DELAY = 5
+
+
+def invalidate_local_caches(scope: str = SCHEDULE_SCOPE) -> None:
+    """Сброс кэшей в памяти текущего процесса API"""
+
+    for local_cache in LOCAL_CACHES.get(scope, LOCAL_CACHES[SCHEDULE_SCOPE]):
+        local_cache.invalidate()
+    logger.info(f"Кэши процесса API сброшены: {scope}")
+
+
+async def publish_invalidation(scope: str = SCHEDULE_SCOPE) -> None:
+    """Сброс кэшей в памяти всех процессов API.
+
+    С CACHE_BACKEND=redis сообщение получают все процессы API через канал Redis, иначе кэш в памяти
+    есть только у текущего процесса
+    """
+
+    if config.CACHE_BACKEND != "redis":
+        invalidate_local_caches(scope)
+        return
+
+    await FastAPICache.get_backend().redis.publish(INVALIDATION_CHANNEL, scope)
+
+
+async def listen_invalidation(redis) -> None:
+    """Сброс кэшей процесса API по сообщениям из канала Redis (CACHE_BACKEND=redis).
+
+    Пока соединение с Redis потеряно, сообщения могут быть пропущены, поэтому после переподключения
+    кэши сбрасываются целиком.
+    """
+
+    reconnected = False
+    while True:
+        try:
+            async with redis.pubsub() as pubsub:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                if reconnected:
+                    invalidate_local_caches()
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        data = message["data"]
+                        invalidate_local_caches(data.decode() if isinstance(data, bytes) else data)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Потеряно соединение с каналом сброса кэша. Ошибка: {str(e)}")
+            reconnected = True
+            await asyncio.sleep(RECONNECT_DELAY)
@@ -1,14 +1,15 @@
 import datetime
-from collections import Counter, defaultdict
-from typing import List, Optional
+from collections import Counter
+from typing import Optional
 
-from sqlalchemy import and_, delete, distinct, func, join, lateral, select
+from fastapi_cache.coder import PickleCoder
+from fastapi_cache.decorator import cache
+from sqlalchemy import and_, delete, join, lateral, select
 from sqlalchemy.dialects.postgresql import array
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import aliased, joinedload
 
 from app import models
-from app.database import tables
 from app.database.tables import (
     Group,
     Lesson,
@@ -20,8 +21,10 @@ from app.database.tables import (
     Teacher,
     lessons_to_teachers,
 )
-from app.models import RoomStatusGet
 from app.services import utils
+from app.services.db import RoomDBService
+from app.services.semester_grid import SemesterGrid, semester_grid
+from app.utils.cache import entity_key_builder
 
 
 async def get_or_create_lesson_type(db: AsyncSession, cmd: models.LessonTypeCreate):
@@ -211,15 +214,6 @@ async def get_lessons_by_room(db: AsyncSession, room_id: int):
     return res.scalars().all()
 
 
-async def search_room(db: AsyncSession, name: str) -> list[Room]:
-    # TODO: Refactor to better search
-    name = name.replace(".", "")
-    name = name.replace(" ", "")
-    name = name.replace("/", "")
-    res = await db.execute(select(Room).where(func.lower(Room.name).contains(name.lower())))
-    return res.scalars().all()
-
-
 async def get_room(db: AsyncSession, name: str, campus_short_name: Optional[str] = None):
     res = await db.execute(
         select(Room)
@@ -271,26 +265,18 @@ async def get_lessons_by_room_and_week(db: AsyncSession, room_id: int, week: int
     return res.scalars().all()
 
 
-from collections import defaultdict
+def get_workload_percentage(slots: int, grid: SemesterGrid) -> float:
+    """Загруженность аудитории в процентах по количеству занятых пар (неделя, день недели, звонок)"""
 
-from sqlalchemy import distinct, func
+    workload_percentage = (slots / grid.slots) * 100
+    return round(workload_percentage, 2)
 
 
+@cache(namespace="room", expire=60 * 60 * 24, key_builder=entity_key_builder("room", "room_id"))
 async def get_room_workload(db: AsyncSession, room_id: int):
-    res = await db.execute(select(Lesson).where(Lesson.room_id == room_id).order_by(Lesson.weekday, Lesson.call_id))
-    lessons = res.scalars().unique().all()
-
-    checked = defaultdict(set)
-    workload = 0
-    for lesson in lessons:
-        for week in lesson.weeks:
-            unique_key = (lesson.weekday, lesson.call_id)
-            if unique_key not in checked[week]:
-                workload += 1
-                checked[week].add(unique_key)
-
-    workload_percentage = (workload / (6 * 6 * 17)) * 100  # 6 дней * 6 пар * 17 недель
-    return round(workload_percentage, 2)
+    grid = await semester_grid.get()
+    rows = await RoomDBService.get_workloads(db, grid.max_week, grid.days, rooms_id=[room_id])
+    return get_workload_percentage(rows[0].slots if rows else 0, grid)
 
 
 async def get_call_by_time(db: AsyncSession, time: datetime.time) -> LessonCall:
@@ -307,66 +293,6 @@ async def get_call_by_time(db: AsyncSession, time: datetime.time) -> LessonCall:
     return res.scalar()
 
 
-async def get_rooms_statuses(
-    db: AsyncSession, time: datetime.datetime, campus_id: Optional[int] = None, room_id: Optional[int] = None
-) -> List[RoomStatusGet]:
-    if campus_id:
-        rooms = (await db.execute(select(tables.Room).where(tables.Room.campus_id == campus_id))).scalars()
-        ids = [room.id for room in rooms]
-
-    if room_id:
-        ids = [room_id]
-
-    res = await db.execute(
-        select(Lesson).where(
-            and_(
-                Lesson.room_id.in_(ids),
-                Lesson.weekday == time.weekday() + 1,
-                Lesson.weeks.contains([utils.get_week(date=time)]),
-                Lesson.call_id
-                == select(LessonCall.id)
-                .where(
-                    and_(
-                        LessonCall.time_start <= time.time(),
-                        LessonCall.time_end > time.time(),
-                    )
-                )
-                .limit(1),
-            )
-        )
-    )
-
-    lessons = res.scalars().unique().all()
-    return [
-        RoomStatusGet(id=_id, status="free" if _id not in [lesson.room_id for lesson in lessons] else "busy")
-        for _id in ids
-    ]
-
-
-async def get_rooms_status(db: AsyncSession, time: datetime.datetime, room_id: int) -> RoomStatusGet:
-    res = await db.execute(
-        select(Lesson).where(
-            and_(
-                Lesson.room_id == room_id,
-                Lesson.weekday == time.weekday() + 1,
-                Lesson.weeks.contains([utils.get_week(date=time)]),
-                Lesson.call_id
-                == select(LessonCall.id)
-                .where(
-                    and_(
-                        LessonCall.time_start <= time.time(),
-                        LessonCall.time_end > time.time(),
-                    )
-                )
-                .limit(1),
-            )
-        )
-    )
-
-    lessons = res.scalars().unique()
-    return RoomStatusGet(id=room_id, status="free" if room_id not in [lesson.room_id for lesson in lessons] else "busy")
-
-
 async def get_all_rooms(db: AsyncSession) -> list[Room]:
     # migrated to api v2
     res = await db.execute(select(Room))
@@ -377,6 +303,7 @@ def get_all_rooms_sync(session) -> list[Room]:
     return session.query(Room).all()
 
 
+@cache(namespace="room", expire=60 * 60 * 24, coder=PickleCoder, key_builder=entity_key_builder("room", "room_id"))
 async def get_room_info(db: AsyncSession, room_id: int) -> models.RoomInfo:
     res = await db.execute(select(Room).where(Room.id == room_id))
     room = res.scalar()
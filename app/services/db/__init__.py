@@ -1,11 +1,17 @@
 from app.services.db.campus import CampusDBService
+from app.services.db.change import ScheduleChangeDBService
 from app.services.db.degree import DegreeDBService
 from app.services.db.discipline import DisciplineDBService
+from app.services.db.document import DocumentDBService
 from app.services.db.group import GroupDBService
+from app.services.db.group_snapshot import GroupSnapshotDBService
 from app.services.db.institute import InstituteDBService
 from app.services.db.lesson import LessonDBService
 from app.services.db.lesson_call import LessonCallDBService
 from app.services.db.lesson_type import LessonTypeDBService
 from app.services.db.period import PeriodDBService
+from app.services.db.push_notification import PushNotificationDBService
 from app.services.db.room import RoomDBService
+from app.services.db.search import SearchDBService
 from app.services.db.teacher import TeacherDBService
+from app.services.db.version import ScheduleVersionDBService
@@ -0,0 +1,46 @@
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.database import tables
+
+# Ключ блокировки pg_advisory_xact_lock, под которой добавляются события журнала изменений
+CHANGELOG_LOCK_ID = 7261
+
+
+class ScheduleChangeDBService:
+    """Сервис для работы с журналом изменений расписания."""
+
+    @classmethod
+    async def append(cls, db: AsyncSession, events: Iterable[Tuple[str, int, int, str]]) -> None:
+        """Добавление событий (entity, entity_id, lesson_id, action).
+
+        Блокировка держится до конца транзакции: транзакции писателей, добавляющие события, завершаются
+        по очереди, и клиент не пропустит событие с меньшим id, которое закоммитили позже
+        """
+
+        values = [
+            {"entity": entity, "entity_id": entity_id, "lesson_id": lesson_id, "action": action}
+            for entity, entity_id, lesson_id, action in events
+        ]
+        if values:
+            await db.execute(select(func.pg_advisory_xact_lock(CHANGELOG_LOCK_ID)))
+            await db.execute(insert(tables.ScheduleChange), values)
+
+    @classmethod
+    async def get_changes(
+        cls, db: AsyncSession, since: int, limit: int, entity: Optional[str] = None, entity_id: Optional[int] = None
+    ) -> List[tables.ScheduleChange]:
+        """Получение событий с id больше since по возрастанию id, только сущности entity, если она указана"""
+
+        change = tables.ScheduleChange
+        query = select(change).where(change.id > since)
+
+        if entity:
+            query = query.where(change.entity == entity)
+        if entity_id:
+            query = query.where(change.entity_id == entity_id)
+
+        return (await db.execute(query.order_by(change.id).limit(limit))).scalars().all()
@@ -0,0 +1,30 @@
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.database import tables
+
+
+class DocumentDBService:
+    """Сервис для работы с документами расписания."""
+
+    @classmethod
+    async def get_document_by_source(cls, db: AsyncSession, source: str) -> Optional[tables.ScheduleDocument]:
+        """Получение документа по ссылке или пути к файлу"""
+
+        query = select(tables.ScheduleDocument).where(tables.ScheduleDocument.source == source)
+        return (await db.execute(query)).scalar()
+
+    @classmethod
+    async def save(cls, db: AsyncSession, source: str, sha256: str, mtime: float, size: int) -> None:
+        """Сохранение отпечатка документа"""
+
+        query = insert(tables.ScheduleDocument).values(source=source, sha256=sha256, mtime=mtime, size=size)
+        query = query.on_conflict_do_update(
+            index_elements=[tables.ScheduleDocument.source],
+            set_={"sha256": sha256, "mtime": mtime, "size": size, "parsed_at": func.now()},
+        )
+        await db.execute(query)
@@ -1,19 +1,37 @@
-from typing import List, Optional
+from typing import Iterable, List, Optional
 
-from rtu_schedule_parser.utils import academic_calendar
 from sqlalchemy import BigInteger, func
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import joinedload, raiseload, selectinload
 from sqlalchemy.sql.expression import cast
 
 from app import models
 from app.database import tables
-from app.database.tables import SchedulePeriod
+from app.services.db.period import PeriodDBService
 
 
 class GroupDBService:
     """Сервис для работы с группами."""
 
+    # Расписание группы: группа с периодом, институтом и степенью одним запросом, занятия со справочниками
+    # вторым, преподаватели занятий третьим. Занятия аудиторий и преподавателей не загружаются
+    SCHEDULE_OPTIONS = (
+        joinedload(tables.Group.period),
+        joinedload(tables.Group.institute),
+        joinedload(tables.Group.degree),
+        selectinload(tables.Group.lessons).options(
+            joinedload(tables.Lesson.calls),
+            joinedload(tables.Lesson.discipline),
+            joinedload(tables.Lesson.lesson_type),
+            joinedload(tables.Lesson.room).joinedload(tables.Room.campus),
+            selectinload(tables.Lesson.teachers),
+            # Группа занятия уже загружена, берётся из identity map без запроса
+            raiseload(tables.Lesson.group, sql_only=True),
+        ),
+    )
+
     @classmethod
     async def get_pagination_count(cls, db: AsyncSession, ids: Optional[List[int]]) -> int:
         """Получение количества групп"""
@@ -41,10 +59,14 @@ class GroupDBService:
         return groups
 
     @classmethod
-    async def get_group(cls, db: AsyncSession, id_: int) -> tables.Group:
-        """Получение группы по индентификатору"""
+    async def get_group(cls, db: AsyncSession, id_: int, populate_existing: bool = False) -> tables.Group:
+        """Получение группы по индентификатору.
+
+        populate_existing - перечитать группу и занятия, даже если они уже загружены в сессии
+        """
 
-        query = select(tables.Group).where(tables.Group.id == id_).limit(1)
+        query = select(tables.Group).where(tables.Group.id == id_).options(*cls.SCHEDULE_OPTIONS).limit(1)
+        query = query.execution_options(populate_existing=populate_existing)
         group = (await db.execute(query)).scalar()
         return group
 
@@ -52,15 +74,29 @@ class GroupDBService:
     async def get_group_by_name(cls, db: AsyncSession, name: str, period_id: Optional[int] = None) -> tables.Group:
         """Получение группы по имени"""
 
-        query = select(tables.Group).where(tables.Group.name == name)
+        query = select(tables.Group).where(tables.Group.name == name).options(*cls.SCHEDULE_OPTIONS)
 
         if not period_id:
-            period_id = await cls._get_current_period_id(db)
+            period_id = await PeriodDBService.get_current_period_id(db)
 
         query = query.where(tables.Group.period_id == period_id).limit(1)
         group = (await db.execute(query)).scalar()
         return group
 
+    @classmethod
+    async def get_current_groups(cls, db: AsyncSession, names: Optional[Iterable[str]] = None) -> List[Row]:
+        """Получение групп текущего периода (id, period_id, name), только с именами names, если они указаны"""
+
+        period_id = await PeriodDBService.get_current_period_id(db)
+        query = select(tables.Group.id, tables.Group.period_id, tables.Group.name).where(
+            tables.Group.period_id == period_id
+        )
+
+        if names is not None:
+            query = query.where(tables.Group.name.in_(list(names)))
+
+        return (await db.execute(query)).all()
+
     @classmethod
     async def create(cls, db: AsyncSession, group: models.GroupCreate) -> tables.Group:
         """Создание группы"""
@@ -69,21 +105,3 @@ class GroupDBService:
         db.add(group)
         await db.flush()
         return group
-
-    @classmethod
-    async def _get_current_period_id(cls, db: AsyncSession) -> int:
-        """Получение id текущего периода"""
-
-        current_period = academic_calendar.get_period(academic_calendar.now_date())
-
-        query = (
-            select(SchedulePeriod.id)
-            .where(
-                SchedulePeriod.year_start == current_period.year_start,
-                SchedulePeriod.year_end == current_period.year_end,
-                SchedulePeriod.semester == current_period.semester,
-            )
-            .limit(1)
-        )
-        period_id = (await db.execute(query)).scalar()
-        return period_id
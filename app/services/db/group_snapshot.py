@@ -0,0 +1,39 @@
+import hashlib
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.database import tables
+
+
+class GroupSnapshotDBService:
+    """Сервис для работы с готовыми JSON расписаниями групп."""
+
+    @classmethod
+    async def get_snapshot(cls, db: AsyncSession, group_id: int) -> Optional[Row]:
+        """Получение JSON расписания группы (data, etag, version, updated_at)"""
+
+        snapshot = tables.GroupSnapshot
+        query = select(snapshot.data, snapshot.etag, snapshot.version, snapshot.updated_at).where(
+            snapshot.group_id == group_id
+        )
+        return (await db.execute(query)).first()
+
+    @classmethod
+    async def save(cls, db: AsyncSession, group_id: int, data: bytes) -> None:
+        """Сохранение JSON расписания группы. Версия увеличивается только при изменении данных"""
+
+        snapshot = tables.GroupSnapshot
+        etag = hashlib.sha256(data).hexdigest()
+
+        query = insert(snapshot).values(group_id=group_id, data=data, etag=etag)
+        query = query.on_conflict_do_update(
+            index_elements=[snapshot.group_id],
+            set_={"data": data, "etag": etag, "version": snapshot.version + 1, "updated_at": func.now()},
+            where=snapshot.etag != etag,
+        )
+        await db.execute(query)
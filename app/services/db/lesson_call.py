@@ -67,3 +67,10 @@ class LessonCallDBService:
         db.add(call)
         await db.flush()
         return call
+
+    @classmethod
+    async def get_calls_count(cls, db: AsyncSession) -> int:
+        """Получение количества пар в день (различных номеров звонков)"""
+
+        query = select(func.count(func.distinct(tables.LessonCall.num)))
+        return (await db.execute(query)).scalar()
@@ -7,6 +7,7 @@ from sqlalchemy.sql.expression import cast
 
 from app import models
 from app.database import tables
+from app.services.period_cache import period_cache
 
 
 class PeriodDBService:
@@ -48,15 +49,36 @@ class PeriodDBService:
     @classmethod
     async def get_period_by_params(
         cls, db: AsyncSession, year_start: int, year_end: int, semester: int
-    ) -> tables.SchedulePeriod:
+    ) -> Optional[tables.SchedulePeriod]:
         """Получение периода по параметрам"""
 
-        query = select(tables.SchedulePeriod).where(
+        id_ = await cls.get_period_id(db, year_start=year_start, year_end=year_end, semester=semester)
+        return await db.get(tables.SchedulePeriod, id_) if id_ else None
+
+    @classmethod
+    async def get_period_id(cls, db: AsyncSession, year_start: int, year_end: int, semester: int) -> Optional[int]:
+        """Получение id периода по параметрам. Найденный id запоминается, повторно БД не запрашивается"""
+
+        key = (year_start, year_end, semester)
+        if id_ := period_cache.get(key):
+            return id_
+
+        query = select(tables.SchedulePeriod.id).where(
             tables.SchedulePeriod.year_start == year_start,
             tables.SchedulePeriod.year_end == year_end,
             tables.SchedulePeriod.semester == semester,
         )
-        return (await db.execute(query)).scalar()
+        id_ = (await db.execute(query.limit(1))).scalar()
+        if id_:
+            period_cache.put(key, id_)
+        return id_
+
+    @classmethod
+    async def get_current_period_id(cls, db: AsyncSession) -> Optional[int]:
+        """Получение id текущего периода"""
+
+        year_start, year_end, semester = period_cache.current()
+        return await cls.get_period_id(db, year_start=year_start, year_end=year_end, semester=semester)
 
     @classmethod
     async def create(cls, db: AsyncSession, period: models.PeriodCreate) -> tables.SchedulePeriod:
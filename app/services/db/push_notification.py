@@ -0,0 +1,76 @@
+import datetime
+from typing import Iterable, List, Mapping
+
+from sqlalchemy import Interval, bindparam, func, insert, update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app import models
+from app.database import tables
+
+
+class PushNotificationDBService:
+    """Сервис для работы с очередью push-уведомлений."""
+
+    @classmethod
+    async def enqueue(cls, db: AsyncSession, notifications: Iterable[models.PushNotificationCreate]) -> None:
+        """Добавление уведомлений в очередь"""
+
+        values = [notification.dict() for notification in notifications]
+        if values:
+            await db.execute(insert(tables.PushNotification), values)
+
+    @classmethod
+    async def get_due(cls, db: AsyncSession, limit: int, max_attempts: int) -> List[Row]:
+        """Получение и блокировка неотправленных уведомлений, время попытки которых наступило
+        (id, topic, title, body, attempts). Заблокированные другой транзакцией уведомления пропускаются"""
+
+        notification = tables.PushNotification
+        query = (
+            select(notification.id, notification.topic, notification.title, notification.body, notification.attempts)
+            .where(
+                notification.sent_at.is_(None),
+                notification.attempts < max_attempts,
+                notification.next_attempt_at <= func.now(),
+            )
+            .order_by(notification.next_attempt_at, notification.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return (await db.execute(query)).all()
+
+    @classmethod
+    async def has_pending(cls, db: AsyncSession, max_attempts: int) -> bool:
+        """Есть ли неотправленные уведомления с оставшимися попытками, в том числе ожидающие повтора"""
+
+        notification = tables.PushNotification
+        query = select(notification.id).where(notification.sent_at.is_(None), notification.attempts < max_attempts)
+        return (await db.execute(query.limit(1))).first() is not None
+
+    @classmethod
+    async def mark_sent(cls, db: AsyncSession, ids: Iterable[int]) -> None:
+        """Отметка уведомлений отправленными"""
+
+        ids = list(ids)
+        if ids:
+            notification = tables.PushNotification
+            query = update(notification).where(notification.id.in_(ids))
+            await db.execute(query.values(sent_at=func.now(), attempts=notification.attempts + 1, error=None))
+
+    @classmethod
+    async def mark_failed(cls, db: AsyncSession, failures: Mapping[int, tuple[str, datetime.timedelta]]) -> None:
+        """Отметка неудачной попытки отправки: {id: (ошибка, через сколько повторить)}"""
+
+        if failures:
+            notification = tables.PushNotification.__table__
+            await db.execute(
+                update(notification)
+                .where(notification.c.id == bindparam("_id"))
+                .values(
+                    attempts=notification.c.attempts + 1,
+                    error=bindparam("_error"),
+                    next_attempt_at=func.now() + bindparam("_delay", type_=Interval),
+                ),
+                [{"_id": id_, "_error": error, "_delay": delay} for id_, (error, delay) in failures.items()],
+            )
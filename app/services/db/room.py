@@ -1,6 +1,7 @@
-from typing import List, Optional
+from typing import Iterable, List, Optional
 
-from sqlalchemy import BigInteger, func
+from sqlalchemy import BigInteger, distinct, func
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.sql.expression import cast
@@ -61,3 +62,62 @@ class RoomDBService:
         db.add(room)
         await db.flush()
         return room
+
+    @classmethod
+    async def get_campus_rooms(cls, db: AsyncSession) -> List[Row]:
+        """Получение всех аудиторий (id, campus_id), упорядоченных по кампусу"""
+
+        query = select(tables.Room.id, tables.Room.campus_id).order_by(tables.Room.campus_id, tables.Room.id)
+        return (await db.execute(query)).all()
+
+    @classmethod
+    async def get_occupied_slots(cls, db: AsyncSession) -> List[Row]:
+        """Получение занятых аудиторий по парам всех периодов
+        (year_start, year_end, semester, week, weekday, time_start, time_end, rooms_id)"""
+
+        lessons = (
+            select(
+                tables.SchedulePeriod.year_start,
+                tables.SchedulePeriod.year_end,
+                tables.SchedulePeriod.semester,
+                func.unnest(tables.Lesson.weeks).label("week"),
+                tables.Lesson.weekday,
+                tables.LessonCall.time_start,
+                tables.LessonCall.time_end,
+                tables.Lesson.room_id,
+            )
+            .select_from(tables.Lesson)
+            .join(tables.Group, tables.Group.id == tables.Lesson.group_id)
+            .join(tables.SchedulePeriod, tables.SchedulePeriod.id == tables.Group.period_id)
+            .join(tables.LessonCall, tables.LessonCall.id == tables.Lesson.call_id)
+            .where(tables.Lesson.room_id.isnot(None))
+            .subquery()
+        )
+        slot = [column for column in lessons.c if column.name != "room_id"]
+        query = select(*slot, func.array_agg(distinct(lessons.c.room_id)).label("rooms_id")).group_by(*slot)
+        return (await db.execute(query)).all()
+
+    @classmethod
+    async def get_workloads(
+        cls, db: AsyncSession, max_week: int, days: Iterable[int], rooms_id: Optional[List[int]] = None
+    ) -> List[Row]:
+        """Получение количества занятых пар (неделя, день недели, звонок) аудиторий в пределах сетки семестра
+        (room_id, slots)"""
+
+        query = select(
+            tables.Lesson.room_id,
+            func.unnest(tables.Lesson.weeks).label("week"),
+            tables.Lesson.weekday,
+            tables.Lesson.call_id,
+        ).where(tables.Lesson.room_id.isnot(None), tables.Lesson.weekday.in_(list(days)))
+
+        if rooms_id is not None:
+            query = query.where(tables.Lesson.room_id.in_(rooms_id))
+
+        slots = query.distinct().subquery()
+        query = (
+            select(slots.c.room_id, func.count().label("slots"))
+            .where(slots.c.week.between(1, max_week))
+            .group_by(slots.c.room_id)
+        )
+        return (await db.execute(query)).all()
@@ -0,0 +1,59 @@
+from typing import List, Type, Union
+
+from rtu_schedule_parser.utils import academic_calendar
+from sqlalchemy import func, or_
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.database import tables
+
+SearchTable = Type[Union[tables.Room, tables.Teacher]]
+NamedTable = Type[Union[tables.Room, tables.Teacher, tables.ScheduleDiscipline]]
+
+
+class SearchDBService:
+    """Сервис для поиска аудиторий и преподавателей по ключу поиска и загрузки названий для индекса поиска."""
+
+    @classmethod
+    async def search(cls, db: AsyncSession, table: SearchTable, key: str, limit: int) -> List[int]:
+        """Поиск по подстроке (по началу для ключей короче 3 символов) и сходству триграмм (pg_trgm, GIN индекс
+        по search_key)"""
+
+        search_key = table.search_key
+        matched = search_key.startswith(key) if len(key) < 3 else search_key.contains(key)
+        query = (
+            select(table.id)
+            .where(or_(matched, search_key.op("%")(key)))
+            .order_by(
+                (search_key == key).desc(),
+                search_key.startswith(key).desc(),
+                func.similarity(search_key, key).desc(),
+                search_key,
+                table.id,
+            )
+            .limit(limit)
+        )
+        return (await db.execute(query)).scalars().all()
+
+    @classmethod
+    async def get_names(cls, db: AsyncSession, table: NamedTable) -> List[Row]:
+        """Получение названий (id, name)"""
+
+        return (await db.execute(select(table.id, table.name))).all()
+
+    @classmethod
+    async def get_current_group_names(cls, db: AsyncSession) -> List[Row]:
+        """Получение названий групп текущего периода (id, name)"""
+
+        current_period = academic_calendar.get_period(academic_calendar.now_date())
+        query = (
+            select(tables.Group.id, tables.Group.name)
+            .join(tables.SchedulePeriod, tables.SchedulePeriod.id == tables.Group.period_id)
+            .where(
+                tables.SchedulePeriod.year_start == current_period.year_start,
+                tables.SchedulePeriod.year_end == current_period.year_end,
+                tables.SchedulePeriod.semester == current_period.semester,
+            )
+        )
+        return (await db.execute(query)).all()
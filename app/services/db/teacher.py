@@ -3,6 +3,7 @@ from typing import List, Optional
 from sqlalchemy import BigInteger, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import joinedload, raiseload, selectinload
 from sqlalchemy.sql.expression import cast
 
 from app import models
@@ -12,6 +13,18 @@ from app.database import tables
 class TeacherDBService:
     """Сервис для работы с преподавателями."""
 
+    # Занятия преподавателя со справочниками, без остальных занятий их групп
+    LESSONS_OPTIONS = (
+        selectinload(tables.Teacher.lessons).options(
+            joinedload(tables.Lesson.calls),
+            joinedload(tables.Lesson.discipline),
+            joinedload(tables.Lesson.lesson_type),
+            joinedload(tables.Lesson.room).joinedload(tables.Room.campus),
+            joinedload(tables.Lesson.group).raiseload("*"),
+            raiseload(tables.Lesson.teachers),
+        ),
+    )
+
     @classmethod
     async def get_pagination_count(cls, db: AsyncSession, ids: Optional[List[int]]) -> int:
         """Получение количества преподавателей"""
@@ -29,7 +42,7 @@ class TeacherDBService:
     ) -> List[tables.Teacher]:
         """Получение списка всех преподавателей"""
 
-        query = select(tables.Teacher)
+        query = select(tables.Teacher).options(*cls.LESSONS_OPTIONS)
 
         if teachers_ids:
             query = query.where(tables.Teacher.id.in_(teachers_ids))
@@ -42,27 +55,16 @@ class TeacherDBService:
     async def get_teacher(cls, db: AsyncSession, id_: int) -> tables.Teacher:
         """Получение преподавателя по идентификатору"""
 
-        query = select(tables.Teacher).where(tables.Teacher.id == id_)
+        query = select(tables.Teacher).where(tables.Teacher.id == id_).options(*cls.LESSONS_OPTIONS)
         return (await db.execute(query)).scalar()
 
     @classmethod
     async def get_teacher_by_name(cls, db: AsyncSession, name: str) -> tables.Teacher:
         """Получение преподавателя по имени"""
 
-        query = select(tables.Teacher).where(tables.Teacher.name == name)
+        query = select(tables.Teacher).where(tables.Teacher.name == name).options(*cls.LESSONS_OPTIONS)
         return (await db.execute(query)).scalar()
 
-    @classmethod
-    async def search_teachers(cls, db: AsyncSession, name: str) -> List[tables.Teacher]:
-        """Поиск преподавателей по имени"""
-
-        name = name.replace('ё', 'е').replace('Ё', 'Е')
-
-        query = select(tables.Teacher).where(
-            func.lower(func.replace(tables.Teacher.name, 'ё', 'е')).contains(name.lower())
-        )
-        return (await db.execute(query)).scalars()
-
     @classmethod
     async def create(cls, db: AsyncSession, teacher: models.TeacherCreate) -> tables.Teacher:
         """Создание преподавателя"""
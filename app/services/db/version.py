@@ -0,0 +1,56 @@
+from typing import Iterable, List
+
+from rtu_schedule_parser.utils import academic_calendar
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.database import tables
+
+
+class ScheduleVersionDBService:
+    """Сервис для работы с версиями расписания групп, аудиторий и преподавателей."""
+
+    @classmethod
+    async def bump(cls, db: AsyncSession, entity: str, ids: Iterable[int]) -> None:
+        """Увеличение версий расписания аудиторий или преподавателей"""
+
+        values = [{"entity": entity, "entity_id": id_} for id_ in sorted(set(ids))]
+        if not values:
+            return
+
+        version = tables.ScheduleVersion
+        query = insert(version).values(values)
+        query = query.on_conflict_do_update(
+            index_elements=[version.entity, version.entity_id],
+            set_={"version": version.version + 1, "updated_at": func.now()},
+        )
+        await db.execute(query)
+
+    @classmethod
+    async def get_versions(cls, db: AsyncSession) -> List[Row]:
+        """Получение версий расписания аудиторий и преподавателей (entity, entity_id, version, updated_at)"""
+
+        version = tables.ScheduleVersion
+        query = select(version.entity, version.entity_id, version.version, version.updated_at)
+        return (await db.execute(query)).all()
+
+    @classmethod
+    async def get_group_versions(cls, db: AsyncSession) -> List[Row]:
+        """Получение версий расписания групп текущего периода (name, etag, updated_at) из готовых JSON"""
+
+        current_period = academic_calendar.get_period(academic_calendar.now_date())
+        snapshot = tables.GroupSnapshot
+        query = (
+            select(tables.Group.name, snapshot.etag, snapshot.updated_at)
+            .join(snapshot, snapshot.group_id == tables.Group.id)
+            .join(tables.SchedulePeriod, tables.SchedulePeriod.id == tables.Group.period_id)
+            .where(
+                tables.SchedulePeriod.year_start == current_period.year_start,
+                tables.SchedulePeriod.year_end == current_period.year_end,
+                tables.SchedulePeriod.semester == current_period.semester,
+            )
+        )
+        return (await db.execute(query)).all()
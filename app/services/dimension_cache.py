@@ -0,0 +1,91 @@
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Hashable, Iterable, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import tables
+
+if TYPE_CHECKING:
+    from app.services.bulk_schedule import Dimensions
+
+
+class DimensionCache:
+    """Кэш id справочников (название -> id) на время одного запуска парсера"""
+
+    QUERIES = {
+        "disciplines": select(tables.ScheduleDiscipline.id, tables.ScheduleDiscipline.name),
+        "teachers": select(tables.Teacher.id, tables.Teacher.name),
+        "lesson_types": select(tables.LessonType.id, tables.LessonType.name),
+        "campuses": select(tables.ScheduleCampus.id, tables.ScheduleCampus.name),
+        "rooms": select(tables.Room.id, tables.Room.name, tables.Room.campus_id),
+        "calls": select(
+            tables.LessonCall.id, tables.LessonCall.num, tables.LessonCall.time_start, tables.LessonCall.time_end
+        ),
+        "periods": select(
+            tables.SchedulePeriod.id,
+            tables.SchedulePeriod.year_start,
+            tables.SchedulePeriod.year_end,
+            tables.SchedulePeriod.semester,
+        ),
+    }
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._values: dict[str, OrderedDict] = {dimension: OrderedDict() for dimension in self.QUERIES}
+        self.hits: dict[str, int] = dict.fromkeys(self.QUERIES, 0)
+        self.misses: dict[str, int] = dict.fromkeys(self.QUERIES, 0)
+
+    async def warm(self, db: AsyncSession) -> None:
+        """Заполнение кэша: один SELECT на каждую таблицу справочника"""
+
+        for dimension, query in self.QUERIES.items():
+            res = await db.execute(query.limit(self.max_size))
+            for id_, *key in res:
+                self.put(dimension, key[0] if len(key) == 1 else tuple(key), id_)
+
+        logger.info(f"Кэш справочников заполнен: {', '.join(f'{d}={len(v)}' for d, v in self._values.items())}")
+
+    def get(self, dimension: str, key: Hashable) -> Optional[int]:
+        values = self._values[dimension]
+        id_ = values.get(key)
+        if id_ is None:
+            self.misses[dimension] += 1
+            return None
+
+        self.hits[dimension] += 1
+        values.move_to_end(key)
+        return id_
+
+    def put(self, dimension: str, key: Hashable, id_: int) -> None:
+        values = self._values[dimension]
+        values[key] = id_
+        values.move_to_end(key)
+        if len(values) > self.max_size:
+            values.popitem(last=False)
+
+    def update(self, dimensions: "Dimensions") -> None:
+        """Добавление id справочников документа. Вызывается только после commit транзакции, в которой
+        они получены"""
+
+        for dimension in self.QUERIES:
+            for key, id_ in getattr(dimensions, dimension).items():
+                self.put(dimension, key, id_)
+
+    def resolve(self, dimension: str, keys: Iterable[Hashable]) -> Tuple[dict, list]:
+        """Разделение ключей на найденные в кэше и те, за которыми нужно идти в БД"""
+
+        found, missing = {}, []
+        for key in keys:
+            id_ = self.get(dimension, key)
+            if id_ is None:
+                missing.append(key)
+            else:
+                found[key] = id_
+        return found, missing
+
+    def log_stats(self) -> None:
+        hits, misses = sum(self.hits.values()), sum(self.misses.values())
+        details = ", ".join(f"{d}: {self.hits[d]}/{self.misses[d]}" for d in self.QUERIES)
+        logger.info(f"Кэш справочников: попаданий {hits}, промахов {misses} (попадания/промахи — {details})")
@@ -0,0 +1,104 @@
+import asyncio
+import time
+from typing import Callable, NamedTuple, Optional
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import config
+from app.database.connection import async_session
+from app.services.db import GroupDBService
+from app.utils.group_name import normalize_group_name
+
+# Сколько ненайденных названий групп запоминается до сброса справочника
+MAX_MISSING_GROUPS = 10000
+
+
+class GroupEntry(NamedTuple):
+    id: int
+    period_id: int
+    name: str  # название группы в БД
+
+
+class GroupDirectory:
+    """Справочник групп текущего периода в памяти API: нормализованное название -> группа.
+
+    Строится при запуске API и перестраивается после парсинга (сброс кэшей процессов API) или по истечении ttl
+    (в том числе при смене периода), поэтому поиск группы по названию не обращается к БД. Группы, которых
+    нет в справочнике, ищутся в БД и добавляются в справочник: сброс после парсинга мог ещё не дойти.
+    Названия, которых нет и в БД, запоминаются до следующего сброса, чтобы опечатки не обращались к БД повторно.
+    """
+
+    def __init__(
+        self,
+        ttl: int,
+        session_factory: Callable[[], AsyncSession] = async_session,
+        max_missing: int = MAX_MISSING_GROUPS,
+    ):
+        self.ttl = ttl
+        self.session_factory = session_factory
+        self.max_missing = max_missing
+        self._groups: dict[str, GroupEntry] = {}
+        self._missing: set[str] = set()
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+        self._missing = set()
+
+    async def get(self, name: str) -> Optional[GroupEntry]:
+        """Группа текущего периода по названию (латиницей или кириллицей, в любом регистре, с пробелами или тире)"""
+
+        if self._is_expired():
+            async with self._lock:
+                if self._is_expired():
+                    await self.load()
+        key = normalize_group_name(name)
+        group = self._groups.get(key)
+        if group is None and key not in self._missing:
+            group = await self._find(key, name)
+        return group
+
+    async def warm_up(self) -> None:
+        """Загрузка при запуске API. Если БД недоступна, справочник загрузится при первом обращении"""
+
+        try:
+            await self.load()
+        except Exception as e:
+            logger.warning(f"Не удалось загрузить справочник групп. Ошибка: {str(e)}")
+
+    async def load(self) -> None:
+        async with self.session_factory() as db:
+            rows = await GroupDBService.get_current_groups(db)
+
+        self._groups = {normalize_group_name(name): GroupEntry(id_, period_id, name) for id_, period_id, name in rows}
+        self._missing = set()
+        self._loaded_at = time.monotonic()
+        logger.info(f"Справочник групп загружен: {len(self._groups)}")
+
+    async def _find(self, key: str, name: str) -> Optional[GroupEntry]:
+        """Поиск группы, добавленной после построения справочника"""
+
+        loaded_at = self._loaded_at
+        async with self.session_factory() as db:
+            rows = await GroupDBService.get_current_groups(db, names={key, name})
+
+        for id_, period_id, group_name in rows:
+            if normalize_group_name(group_name) == key:
+                self._groups[key] = GroupEntry(id_, period_id, group_name)
+                logger.info(f"Группа {group_name} добавлена в справочник групп")
+                return self._groups[key]
+
+        # Промах запоминается, только если справочник не сбросили во время запроса
+        if self._loaded_at == loaded_at:
+            if len(self._missing) >= self.max_missing:
+                self._missing.clear()
+            self._missing.add(key)
+        return None
+
+    def _is_expired(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+
+
+group_directory = GroupDirectory(ttl=config.GROUP_DIRECTORY_TTL)
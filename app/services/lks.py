@@ -0,0 +1,70 @@
+from typing import Sequence
+
+from fastapi.responses import JSONResponse
+
+from app import models
+from app.services.semester_grid import SemesterGrid
+
+# Военная подготовка занимает пару целиком, остальные занятия этой пары в ЛКс не выводятся
+MILITARY_TRAINING = "Военная подготовка"
+
+
+def get_lesson_type(lesson_type_name: str) -> str:
+    """Converts lesson type name to short form"""
+    if lesson_type_name == "пр":
+        return "П"
+    elif lesson_type_name == "лек":
+        return "Л"
+    elif lesson_type_name == "лаб":
+        return "ЛБ"
+    else:
+        return ""
+
+
+def get_subgroup_substr(lesson: models.Lesson) -> str:
+    """Returns subgroup substring for lesson"""
+    return f" ({lesson.subgroup} подгруппа)" if lesson.subgroup else ""
+
+
+def _lks_lesson(lesson: models.Lesson) -> dict:
+    return {
+        "PROPERTY_DISCIPLINE_NAME": lesson.discipline.name + get_subgroup_substr(lesson),
+        "PROPERTY_LESSON_TYPE": get_lesson_type(lesson.lesson_type.name if lesson.lesson_type else ""),
+        "PROPERTY_NUMBER": str(lesson.calls.num),
+        "PROPERTY_LECTOR": ", ".join([teacher.name for teacher in lesson.teachers or []]),
+        "PROPERTY_PLACE": lesson.room.name if lesson.room else "",
+    }
+
+
+def build_lks_schedule(lessons: Sequence[models.Lesson], grid: SemesterGrid) -> bytes:
+    """Расписание группы в формате ЛКс (JSON ответа /lks/{group_name}).
+
+    Занятия за один проход раскладываются по (неделя, день недели, номер пары). Пары дня идут в порядке первого
+    занятия с таким номером пары в lessons, занятия пары - в порядке lessons.
+    """
+
+    nums = list(dict.fromkeys(lesson.calls.num for lesson in lessons))
+
+    slots: dict[tuple[int, int, int], list[dict]] = {}
+    military: dict[tuple[int, int, int], list[dict]] = {}
+    for lesson in lessons:
+        lks_lesson = _lks_lesson(lesson)
+        for week in dict.fromkeys(lesson.weeks):
+            key = (week, lesson.weekday, lesson.calls.num)
+            slots.setdefault(key, []).append(lks_lesson)
+            if lesson.discipline.name == MILITARY_TRAINING:
+                military[key] = [lks_lesson]
+
+    weeks = {}
+    for week in grid.weeks:
+        days = {}
+        for day in grid.days:
+            day_lessons = {}
+            for num in nums:
+                key = (week, day, num)
+                if key in slots:
+                    day_lessons[str(num)] = military.get(key) or slots[key]
+            days[str(day)] = {"LESSONS": day_lessons}
+        weeks[str(week)] = {"DAYS": days}
+
+    return JSONResponse({"result": {"WEEKS": weeks}}).body
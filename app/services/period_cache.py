@@ -0,0 +1,45 @@
+import datetime
+import time
+from typing import Optional, Tuple
+
+from rtu_schedule_parser.utils import academic_calendar
+
+PeriodKey = Tuple[int, int, int]  # year_start, year_end, semester
+
+
+class PeriodCache:
+    """Id учебных периодов в памяти процесса: (year_start, year_end, semester) -> id.
+
+    Периоды не изменяются и не удаляются, поэтому найденные id хранятся без срока. Отсутствующие периоды
+    не запоминаются: их может создать парсер. Текущий период вычисляется по календарю один раз в сутки:
+    семестр сменяется только вместе с датой.
+    """
+
+    def __init__(self):
+        self._ids: dict[PeriodKey, int] = {}
+        self._current: Optional[PeriodKey] = None
+        self._current_expires_at = 0.0  # time.monotonic() следующей полуночи
+
+    def invalidate(self) -> None:
+        self._ids = {}
+        self._current_expires_at = 0.0
+
+    def current(self) -> PeriodKey:
+        """Текущий период"""
+
+        if time.monotonic() >= self._current_expires_at:
+            now = academic_calendar.now_date()
+            period = academic_calendar.get_period(now)
+            midnight = (now + datetime.timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+            self._current = (period.year_start, period.year_end, period.semester)
+            self._current_expires_at = time.monotonic() + (midnight - now).total_seconds()
+        return self._current
+
+    def get(self, key: PeriodKey) -> Optional[int]:
+        return self._ids.get(key)
+
+    def put(self, key: PeriodKey, id_: int) -> None:
+        self._ids[key] = id_
+
+
+period_cache = PeriodCache()
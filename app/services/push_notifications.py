@@ -1,15 +1,138 @@
-from firebase_admin.messaging import Message, Notification, send
+import asyncio
+import contextlib
+import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Protocol, Sequence
 
-from app.firebase_client import firebase_client
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app import config, models
+from app.database.connection import async_session
+from app.services.db import PushNotificationDBService
 
-async def send_push_notification(topic: str, title: str, body: str):
-    message = Message(
-        notification=Notification(
-            title=title,
-            body=body,
-        ),
-        topic=topic,
-    )
 
-    return send(message, app=firebase_client)
+class MessagingClient(Protocol):
+    def send_each(self, notifications: Sequence[models.PushNotificationCreate]) -> List[Optional[str]]:
+        """Блокирующая отправка пачки уведомлений. Возвращает ошибки по порядку уведомлений (None - отправлено)"""
+
+
+class FirebaseMessagingClient:
+    """Отправка уведомлений на топики Firebase Cloud Messaging одним запросом на пачку (до 500 сообщений)"""
+
+    def send_each(self, notifications: Sequence[models.PushNotificationCreate]) -> List[Optional[str]]:
+        from firebase_admin.messaging import Message, Notification, send_each
+
+        from app.firebase_client import firebase_client
+
+        messages = [
+            Message(
+                notification=Notification(title=notification.title, body=notification.body), topic=notification.topic
+            )
+            for notification in notifications
+        ]
+        response = send_each(messages, app=firebase_client)
+        return [None if result.success else str(result.exception) for result in response.responses]
+
+
+class RateLimiter:
+    """Ограничение количества отправляемых сообщений в секунду"""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._next_at = 0.0
+
+    async def acquire(self, count: int) -> None:
+        """Ожидание, пока можно отправить count сообщений"""
+
+        now = time.monotonic()
+        start_at = max(now, self._next_at)
+        self._next_at = start_at + count / self.rate
+        if start_at > now:
+            await asyncio.sleep(start_at - now)
+
+
+class PushNotificationDispatcher:
+    """Отправка уведомлений из очереди в БД (outbox) пачками.
+
+    Блокирующий клиент отправки вызывается в отдельном потоке, поэтому не останавливает цикл событий парсера.
+    Неудачные уведомления повторяются через retry_delay, 2 * retry_delay, ... секунд, но не больше
+    max_attempts попыток.
+    """
+
+    def __init__(
+        self,
+        client: MessagingClient,
+        batch_size: int = config.PUSH_BATCH_SIZE,
+        rate_limit: float = config.PUSH_RATE_LIMIT,
+        max_attempts: int = config.PUSH_MAX_ATTEMPTS,
+        retry_delay: float = config.PUSH_RETRY_DELAY,
+        poll_interval: float = 1.0,
+        session_factory: Callable[[], AsyncSession] = async_session,
+    ):
+        self.client = client
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.poll_interval = poll_interval
+        self.session_factory = session_factory
+        self._rate_limiter = RateLimiter(rate_limit)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="push")
+
+    async def dispatch(self, db: AsyncSession) -> int:
+        """Отправка одной пачки уведомлений, время попытки которых наступило. Возвращает размер пачки"""
+
+        rows = await PushNotificationDBService.get_due(db, self.batch_size, self.max_attempts)
+        if not rows:
+            await db.rollback()
+            return 0
+
+        notifications = [models.PushNotificationCreate(topic=row.topic, title=row.title, body=row.body) for row in rows]
+        await self._rate_limiter.acquire(len(notifications))
+        try:
+            errors = await asyncio.get_running_loop().run_in_executor(
+                self._executor, self.client.send_each, notifications
+            )
+        except Exception as e:
+            errors = [str(e)] * len(rows)
+
+        failures = {
+            row.id: (error, datetime.timedelta(seconds=self.retry_delay * 2**row.attempts))
+            for row, error in zip(rows, errors)
+            if error is not None
+        }
+        await PushNotificationDBService.mark_sent(db, [row.id for row in rows if row.id not in failures])
+        await PushNotificationDBService.mark_failed(db, failures)
+        await db.commit()
+
+        logger.info(f"Отправлено push-уведомлений: {len(rows) - len(failures)} из {len(rows)}")
+        for row in rows:
+            if row.id in failures and row.attempts + 1 >= self.max_attempts:
+                logger.warning(f"Push-уведомление {row.topic} не отправлено. Ошибка: {failures[row.id][0]}")
+        return len(rows)
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Отправка уведомлений по мере появления в очереди. После stop отправляет оставшиеся уведомления,
+        включая повторы, и завершается"""
+
+        try:
+            while True:
+                try:
+                    async with self.session_factory() as db:
+                        if await self.dispatch(db):
+                            continue
+                        if stop.is_set() and not await PushNotificationDBService.has_pending(db, self.max_attempts):
+                            return
+                except Exception as e:
+                    logger.error(f"Ошибка при отправке push-уведомлений. Ошибка: {str(e)}")
+                    if stop.is_set():
+                        return
+
+                if stop.is_set():
+                    await asyncio.sleep(self.poll_interval)  # ожидание времени повтора
+                else:
+                    with contextlib.suppress(asyncio.TimeoutError):
+                        await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+        finally:
+            self._executor.shutdown(wait=False)
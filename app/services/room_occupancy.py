@@ -0,0 +1,137 @@
+import asyncio
+import datetime
+import time
+from typing import Iterable, List, Optional, Tuple
+
+from loguru import logger
+from rtu_schedule_parser.utils import academic_calendar
+
+from app import config
+from app.database.connection import async_session
+from app.models import RoomStatusGet, WorkloadGet
+from app.services import utils
+from app.services.crud_schedule import get_workload_percentage
+from app.services.db import RoomDBService
+from app.services.semester_grid import SemesterGrid, semester_grid
+
+Period = Tuple[int, int, int]  # (year_start, year_end, semester)
+Slot = Tuple[datetime.time, datetime.time, int]  # (начало пары, конец пары, битовая маска занятых аудиторий)
+
+
+class RoomOccupancyIndex:
+    """Занятость аудиторий в памяти API.
+
+    Каждой аудитории присвоен номер бита, аудитории одного кампуса идут подряд. Для каждого периода, недели,
+    дня недели и пары хранится битовая маска занятых аудиторий, поэтому статусы аудиторий кампуса получаются
+    одним срезом маски без обращения к БД. Вместе с индексом одним запросом считается загруженность всех
+    аудиторий. Индекс строится целиком после парсинга (запрос /clear-cache) или по истечении ttl.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._bits: dict[int, int] = {}  # id аудитории -> номер бита
+        self._campuses: dict[Optional[int], Tuple[int, List[int]]] = {}  # id кампуса -> (первый бит, id аудиторий)
+        self._slots: dict[Tuple[Period, int, int], List[Slot]] = {}  # (период, неделя, день недели) -> пары
+        self._workloads: dict[int, float] = {}  # id аудитории -> загруженность, %
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+
+    def build(
+        self,
+        rooms: Iterable[tuple],
+        slots: Iterable[tuple],
+        workloads: Iterable[tuple] = (),
+        grid: Optional[SemesterGrid] = None,
+    ) -> None:
+        """Построение индекса из аудиторий (id, campus_id), упорядоченных по кампусу, занятых аудиторий по парам
+        (year_start, year_end, semester, week, weekday, time_start, time_end, rooms_id) и количества занятых пар
+        аудиторий (room_id, slots) в сетке семестра grid"""
+
+        bits, campuses = {}, {}
+        for bit, (room_id, campus_id) in enumerate(rooms):
+            bits[room_id] = bit
+            campuses.setdefault(campus_id, (bit, []))[1].append(room_id)
+
+        index = {}
+        for year_start, year_end, semester, week, weekday, time_start, time_end, rooms_id in slots:
+            mask = 0
+            for room_id in rooms_id:
+                if room_id in bits:
+                    mask |= 1 << bits[room_id]
+            index.setdefault(((year_start, year_end, semester), week, weekday), []).append((time_start, time_end, mask))
+
+        self._bits, self._campuses, self._slots = bits, campuses, index
+        self._workloads = {room_id: get_workload_percentage(count, grid) for room_id, count in workloads}
+        self._loaded_at = time.monotonic()
+
+    async def get_statuses(self, at: datetime.datetime, campus_id: int) -> List[RoomStatusGet]:
+        """Статусы всех аудиторий кампуса в указанное время"""
+
+        await self._ensure_loaded()
+
+        first_bit, rooms_id = self._campuses.get(campus_id, (0, []))
+        busy = (self._get_busy_mask(at) >> first_bit) & ((1 << len(rooms_id)) - 1)
+        return [
+            RoomStatusGet(id=room_id, status="busy" if busy >> i & 1 else "free") for i, room_id in enumerate(rooms_id)
+        ]
+
+    async def get_status(self, at: datetime.datetime, room_id: int) -> RoomStatusGet:
+        """Статус аудитории в указанное время"""
+
+        await self._ensure_loaded()
+
+        bit = self._bits.get(room_id)
+        busy = bit is not None and self._get_busy_mask(at) >> bit & 1
+        return RoomStatusGet(id=room_id, status="busy" if busy else "free")
+
+    async def get_workloads(self, campus_id: int) -> List[WorkloadGet]:
+        """Загруженность всех аудиторий кампуса"""
+
+        await self._ensure_loaded()
+
+        _, rooms_id = self._campuses.get(campus_id, (0, []))
+        return [WorkloadGet(id=room_id, workload=self._workloads.get(room_id, 0.0)) for room_id in rooms_id]
+
+    async def get_workload(self, room_id: int) -> Optional[WorkloadGet]:
+        """Загруженность аудитории. None, если аудитория неизвестна"""
+
+        await self._ensure_loaded()
+
+        if room_id not in self._bits:
+            return None
+        return WorkloadGet(id=room_id, workload=self._workloads.get(room_id, 0.0))
+
+    def _get_busy_mask(self, at: datetime.datetime) -> int:
+        period = academic_calendar.get_period(at)
+        key = ((period.year_start, period.year_end, period.semester), utils.get_week(date=at), at.weekday() + 1)
+
+        mask, at_time = 0, at.time()
+        for time_start, time_end, rooms in self._slots.get(key, ()):
+            if time_start <= at_time < time_end:
+                mask |= rooms
+        return mask
+
+    def _is_expired(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+
+    async def _ensure_loaded(self) -> None:
+        if self._is_expired():
+            async with self._lock:
+                if self._is_expired():
+                    await self._load()
+
+    async def _load(self) -> None:
+        grid = await semester_grid.get()
+        async with async_session() as db:
+            rooms = await RoomDBService.get_campus_rooms(db)
+            slots = await RoomDBService.get_occupied_slots(db)
+            workloads = await RoomDBService.get_workloads(db, grid.max_week, grid.days)
+
+        self.build(rooms, slots, workloads, grid)
+        logger.info(f"Индекс занятости аудиторий построен: аудиторий {len(self._bits)}, пар {len(slots)}")
+
+
+room_occupancy = RoomOccupancyIndex(ttl=config.ROOM_OCCUPANCY_TTL)
@@ -0,0 +1,97 @@
+import asyncio
+import datetime
+import time
+from typing import Hashable, NamedTuple, Optional
+
+from loguru import logger
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app import config
+from app.database.connection import async_session
+from app.services.db import ScheduleVersionDBService
+from app.utils.etag import http_date, is_not_modified, make_etag
+
+
+class Version(NamedTuple):
+    tag: str
+    updated_at: datetime.datetime
+
+    @property
+    def etag(self) -> str:
+        return make_etag(self.tag)
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {"ETag": self.etag, "Last-Modified": http_date(self.updated_at)}
+
+    def is_not_modified(self, request: Request) -> bool:
+        return is_not_modified(request, self.etag, self.updated_at)
+
+
+class ScheduleVersions:
+    """Версии расписания групп (по имени), аудиторий и преподавателей (по id) в памяти API.
+
+    Загружаются из БД целиком и перечитываются после парсинга (запрос /clear-cache) или по истечении ttl,
+    поэтому условные запросы обрабатываются без обращения к БД.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._versions: dict[str, dict[Hashable, Version]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+
+    async def get(self, entity: str, key: Hashable) -> Optional[Version]:
+        """Версия расписания группы, аудитории или преподавателя. None, если версия неизвестна"""
+
+        if self._is_expired():
+            async with self._lock:
+                if self._is_expired():
+                    await self._load()
+        return self._versions.get(entity, {}).get(key)
+
+    def _is_expired(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+
+    async def _load(self) -> None:
+        try:
+            async with async_session() as db:
+                groups = await ScheduleVersionDBService.get_group_versions(db)
+                rows = await ScheduleVersionDBService.get_versions(db)
+        except Exception as e:
+            logger.warning(f"Не удалось загрузить версии расписания. Ошибка: {str(e)}")
+            return
+
+        versions = {"group": {name: Version(etag, updated_at) for name, etag, updated_at in groups}}
+        for entity, id_, version, updated_at in rows:
+            versions.setdefault(entity, {})[id_] = Version(f"{entity}-{id_}-{version}", updated_at)
+
+        self._versions = versions
+        self._loaded_at = time.monotonic()
+        logger.info(f"Версии расписания загружены: {', '.join(f'{e}={len(v)}' for e, v in versions.items())}")
+
+
+schedule_versions = ScheduleVersions(ttl=config.SCHEDULE_VERSIONS_TTL)
+
+
+async def get_not_modified_response(
+    request: Request, response: Response, entity: str, key: Hashable, variant: Optional[Hashable] = None
+) -> Optional[Response]:
+    """Ответ 304, если у клиента актуальная версия расписания. Иначе в ответ добавляются ETag и Last-Modified.
+
+    variant - дополнительные параметры ответа, от которых зависит его содержимое (входят в ETag)
+    """
+
+    version = await schedule_versions.get(entity, key)
+    if not version:
+        return None
+    if variant is not None:
+        version = version._replace(tag=f"{version.tag}-{variant}")
+    if version.is_not_modified(request):
+        return Response(status_code=304, headers=version.headers)
+    response.headers.update(version.headers)
+    return None
@@ -0,0 +1,87 @@
+import asyncio
+import time
+from typing import List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import config
+from app.database import tables
+from app.services.db import SearchDBService
+from app.utils.search import TrigramIndex, normalize_search_key
+
+SEARCH_TABLES = {"room": tables.Room, "teacher": tables.Teacher}
+# Типы результатов общего поиска /search
+SEARCH_TYPES = ("group", "teacher", "room", "discipline")
+
+
+class SearchIndex:
+    """Общий индекс поиска групп текущего периода, преподавателей, аудиторий и дисциплин в памяти.
+
+    Ключи индекса - пары (тип, id). Отбор и порядок результатов совпадают с поиском через pg_trgm. Используется
+    общим поиском /search и поиском аудиторий и преподавателей при SEARCH_BACKEND=memory. Перестраивается
+    после парсинга (запрос /clear-cache) или по истечении ttl.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._index = TrigramIndex()
+        self._names: dict[tuple[str, int], str] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+
+    async def search(
+        self, db: AsyncSession, query: str, limit: int, entity: Optional[str] = None
+    ) -> List[Tuple[str, int, str]]:
+        """Найденные (тип, id, название) по релевантности, только типа entity, если он указан"""
+
+        key = normalize_search_key(query)
+        if not key:
+            return []
+
+        if self._is_expired():
+            async with self._lock:
+                if self._is_expired():
+                    await self._load(db)
+
+        where = None if entity is None else (lambda item: item[0] == entity)
+        return [(*item, self._names[item]) for item in self._index.search(key, limit, where)]
+
+    def _is_expired(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+
+    async def _load(self, db: AsyncSession) -> None:
+        rows = {
+            "group": await SearchDBService.get_current_group_names(db),
+            "teacher": await SearchDBService.get_names(db, tables.Teacher),
+            "room": await SearchDBService.get_names(db, tables.Room),
+            "discipline": await SearchDBService.get_names(db, tables.ScheduleDiscipline),
+        }
+
+        index, names = TrigramIndex(), {}
+        for entity, entity_rows in rows.items():
+            for id_, name in entity_rows:
+                names[entity, id_] = name
+                index.add((entity, id_), normalize_search_key(name))
+
+        self._index, self._names = index, names
+        self._loaded_at = time.monotonic()
+        logger.info(f"Индекс поиска построен: {', '.join(f'{e}={len(r)}' for e, r in rows.items())}")
+
+
+search_index = SearchIndex(ttl=config.SEARCH_INDEX_TTL)
+
+
+async def search(db: AsyncSession, entity: str, query: str, limit: int) -> List[int]:
+    """Идентификаторы найденных аудиторий (entity=room) или преподавателей (entity=teacher) по релевантности"""
+
+    if config.SEARCH_BACKEND == "memory":
+        return [id_ for _, id_, _ in await search_index.search(db, query, limit, entity)]
+
+    key = normalize_search_key(query)
+    if not key:
+        return []
+    return await SearchDBService.search(db, SEARCH_TABLES[entity], key, limit)
@@ -0,0 +1,69 @@
+import asyncio
+from typing import NamedTuple, Optional, Tuple
+
+from loguru import logger
+
+from app import config
+from app.database.connection import async_session
+from app.services.db import LessonCallDBService
+from app.services.db.info import InfoDBService
+
+DEFAULT_MAX_WEEK = 17
+DEFAULT_CALLS = 6
+
+
+class SemesterGrid(NamedTuple):
+    """Сетка семестра: недели, учебные дни и пары, на которых может стоять занятие"""
+
+    max_week: int
+    days: Tuple[int, ...]  # 1 - понедельник
+    calls: int
+
+    @property
+    def weeks(self) -> range:
+        return range(1, self.max_week + 1)
+
+    @property
+    def slots(self) -> int:
+        """Количество пар в семестре"""
+
+        return self.max_week * len(self.days) * self.calls
+
+
+class SemesterGridCache:
+    """Сетка семестра в памяти процесса.
+
+    Загружается из БД при первом обращении и перечитывается после изменения максимальной недели (/max-week)
+    или после парсинга (/clear-cache).
+    """
+
+    def __init__(self, working_days: int):
+        self.days = tuple(range(1, working_days + 1))
+        self._grid: Optional[SemesterGrid] = None
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        self._grid = None
+
+    async def get(self) -> SemesterGrid:
+        if self._grid is None:
+            async with self._lock:
+                if self._grid is None:
+                    self._grid = await self._load()
+        return self._grid
+
+    async def _load(self) -> SemesterGrid:
+        async with async_session() as db:
+            settings = await InfoDBService.get_max_week(db=db)
+            calls = await LessonCallDBService.get_calls_count(db=db)
+
+        grid = SemesterGrid(
+            max_week=settings.max_week if settings else DEFAULT_MAX_WEEK,
+            days=self.days,
+            calls=calls or DEFAULT_CALLS,
+        )
+        logger.info(f"Сетка семестра загружена: {grid}")
+        return grid
+
+
+semester_grid = SemesterGridCache(working_days=config.SCHEDULE_WORKING_DAYS)
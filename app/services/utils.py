@@ -1,26 +1,33 @@
 import datetime
+from functools import lru_cache
+from typing import Iterable, List, Union
 
 import pytz
 
+MOSCOW_TZ = pytz.timezone("Europe/Moscow")
 
-def get_week(date: datetime.datetime = None) -> int:
+
+def get_week(date: Union[datetime.datetime, datetime.date] = None) -> int:
     """Возвращает номер учебной недели по дате
 
     Args:
         date (datetime.datetime, optional): Дата, для которой необходимо получить учебную неделю.
     """
-    now = now_date() if date is None else date
-    start_date = get_semester_start(date)
+    date = now_date() if date is None else date
+    day = date.toordinal()
+    start = _get_semester_start_day(date.year, date.month >= 9)
 
-    if now.timestamp() < start_date.timestamp():
+    if day < start:
         return 1
 
-    week = now.isocalendar()[1] - start_date.isocalendar()[1]
+    # Недели считаются с понедельника недели начала семестра, поэтому переход через год не сбивает счёт
+    return (day - start + _get_weekday(start)) // 7 + 1
+
 
-    if now.isocalendar()[2] != 0:
-        week += 1
+def get_weeks(dates: Iterable[Union[datetime.datetime, datetime.date]]) -> List[int]:
+    """Возвращает номера учебных недель для списка дат"""
 
-    return week
+    return [get_week(date) for date in dates]
 
 
 def get_semester_start(date: datetime.datetime = None) -> datetime.datetime:
@@ -30,16 +37,29 @@ def get_semester_start(date: datetime.datetime = None) -> datetime.datetime:
         date (datetime.datetime, optional): Дата для расчёта начала семестра.
     """
     date = now_date() if date is None else date
-    return get_first_semester() if date.month >= 9 else get_second_semester()
+    return get_first_semester(date.year) if date.month >= 9 else get_second_semester(date.year)
 
 
 def now_date() -> datetime.datetime:
-    return datetime.datetime.now(pytz.timezone("Europe/Moscow"))
+    return datetime.datetime.now(MOSCOW_TZ)
+
+
+def get_first_semester(year: int = None) -> datetime.datetime:
+    return datetime.datetime(now_date().year if year is None else year, 9, 1)
+
+
+def get_second_semester(year: int = None) -> datetime.datetime:
+    return datetime.datetime(now_date().year if year is None else year, 2, 9)
+
+
+@lru_cache(maxsize=64)
+def _get_semester_start_day(year: int, first: bool) -> int:
+    """Порядковый номер дня начала семестра (date.toordinal)"""
 
+    return (get_first_semester(year) if first else get_second_semester(year)).toordinal()
 
-def get_first_semester() -> datetime.datetime:
-    return datetime.datetime(now_date().year, 9, 1)
 
+def _get_weekday(day: int) -> int:
+    """День недели порядкового номера дня: 0 - понедельник"""
 
-def get_second_semester() -> datetime.datetime:
-    return datetime.datetime(now_date().year, 2, 9)
+    return (day - 1) % 7
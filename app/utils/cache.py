@@ -1,12 +1,96 @@
 import hashlib
-from typing import Optional
+import inspect
+from typing import Callable, Hashable, Iterable, Optional
 
 import aiohttp
+from fastapi_cache.backends import Backend
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from fastapi_cache.backends.redis import RedisBackend
+from loguru import logger
 from starlette.requests import Request
 from starlette.responses import Response
 
 from app import config
 
+CACHE_PREFIX = "fastapi-cache"
+
+# Кэш списков, который зависит от любой группы или аудитории
+AGGREGATE_NAMESPACES = ("groups", "rooms")
+ENTITIES = ("group", "room", "teacher")
+
+# Канал Redis, через который парсер и API сообщают всем процессам API о сбросе кэшей в памяти процесса.
+# Сообщение - что изменилось: расписание (сбрасываются все кэши) или сетка семестра
+INVALIDATION_CHANNEL = f"{CACHE_PREFIX}:invalidate"
+SCHEDULE_SCOPE = "schedule"
+SEMESTER_GRID_SCOPE = "semester_grid"
+
+
+class LocalMemoryBackend(InMemoryBackend):
+    """Кэш в памяти процесса. Пространство имён очищается целиком по `{namespace}:`, как в Redis"""
+
+    async def clear(self, namespace: str = None, key: str = None) -> int:
+        if namespace:
+            namespace = f"{namespace}:"
+        return await super().clear(namespace, key)
+
+
+class SharedRedisBackend(RedisBackend):
+    """Общий для всех воркеров API и парсера кэш в Redis (или совместимом хранилище).
+
+    Ключи пространства имён перебираются через SCAN, чтобы не блокировать Redis командой KEYS.
+    """
+
+    async def clear(self, namespace: str = None, key: str = None) -> int:
+        if not namespace:
+            return await super().clear(namespace, key)
+
+        removed, keys = 0, []
+        async for cache_key in self.redis.scan_iter(match=f"{namespace}:*", count=1000):
+            keys.append(cache_key)
+            if len(keys) == 1000:
+                removed += await self.redis.unlink(*keys)
+                keys = []
+        if keys:
+            removed += await self.redis.unlink(*keys)
+        return removed
+
+
+def create_cache_backend() -> Backend:
+    """Бэкенд кэша из настроек (CACHE_BACKEND): memory - свой кэш в каждом процессе, redis - общий"""
+
+    if config.CACHE_BACKEND == "redis":
+        from redis.asyncio import from_url
+
+        return SharedRedisBackend(from_url(config.CACHE_REDIS_URL))
+    return LocalMemoryBackend()
+
+
+def entity_namespace(entity: str, key: Hashable) -> str:
+    return f"{entity}:{key}"
+
+
+def entity_key_builder(entity: str, argument: str) -> Callable:
+    """Ключ кэша `{prefix}:{entity}:{значение аргумента}:{hash}` для сброса кэша одной группы, аудитории
+    или преподавателя"""
+
+    def key_builder(
+        func,
+        namespace: Optional[str] = "",
+        request: Optional[Request] = None,
+        response: Optional[Response] = None,
+        args: Optional[tuple] = None,
+        kwargs: Optional[dict] = None,
+    ):
+        arguments = inspect.signature(func).bind_partial(*(args or ()), **(kwargs or {})).arguments
+        arguments = {name: value for name, value in arguments.items() if name not in ("cls", "db")}
+
+        prefix = f"{CACHE_PREFIX}:{entity_namespace(entity, arguments[argument])}:"
+        return (
+            prefix + hashlib.md5(f"{func.__module__}:{func.__qualname__}:{arguments}".encode()).hexdigest()
+        )  # nosec:B303
+
+    return key_builder
+
 
 def key_builder_exclude_db(
     func,
@@ -31,9 +115,49 @@ def key_builder_exclude_db(
     return prefix + hashlib.md5(f"{func.__module__}:{func.__name__}:{args}:{kwargs}".encode()).hexdigest()  # nosec:B303
 
 
-async def send_clear_cache_request():
-    # TODO: Make api_url configurable via config.py
-    api_url = f"https://timetable.mirea.ru/api"
+async def invalidate_schedule_cache(
+    backend: Backend,
+    groups: Optional[Iterable[str]] = None,
+    rooms: Optional[Iterable[int]] = None,
+    teachers: Optional[Iterable[int]] = None,
+) -> int:
+    """Сброс кэша указанных групп, аудиторий и преподавателей и кэша списков.
+
+    None вместо списка сбрасывает кэш всех сущностей этого типа.
+    """
+
+    namespaces = list(AGGREGATE_NAMESPACES)
+    for entity, keys in zip(ENTITIES, (groups, rooms, teachers)):
+        if keys is None:
+            namespaces.append(entity)
+        else:
+            namespaces.extend(entity_namespace(entity, key) for key in set(keys))
+
+    removed = 0
+    for namespace in namespaces:
+        removed += await backend.clear(namespace=f"{CACHE_PREFIX}:{namespace}") or 0
+    return removed
+
+
+async def send_clear_cache_request(
+    groups: Optional[Iterable[str]] = None,
+    rooms: Optional[Iterable[int]] = None,
+    teachers: Optional[Iterable[int]] = None,
+):
+    """Сброс кэша API после парсинга"""
+
+    if config.CACHE_BACKEND == "redis":
+        backend = create_cache_backend()
+        try:
+            removed = await invalidate_schedule_cache(backend, groups, rooms, teachers)
+            # Версии расписания, индексы и справочники в памяти процессов API сбрасывают все процессы API
+            receivers = await backend.redis.publish(INVALIDATION_CHANNEL, SCHEDULE_SCOPE)
+        finally:
+            await backend.redis.close()
+        logger.info(f"Кэш расписания сброшен, удалено ключей: {removed}, процессов API получили сброс: {receivers}")
+        return
+
+    # Кэш в памяти процессов API недоступен из воркера, поэтому очищаем его запросом к API
     async with aiohttp.ClientSession() as session:
-        async with session.post(f"{api_url}/clear-cache/?secret_key={config.SECRET_KEY}") as response:
+        async with session.post(f"{config.API_URL}/clear-cache/?secret_key={config.SECRET_KEY}") as response:
             pass
@@ -0,0 +1,34 @@
+import calendar
+import datetime
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional
+
+from starlette.requests import Request
+
+
+def make_etag(value: str) -> str:
+    return f'"{value}"'
+
+
+def http_date(value: datetime.datetime) -> str:
+    """Дата для заголовка Last-Modified. Даты в БД хранятся в UTC без часового пояса"""
+
+    return formatdate(calendar.timegm(value.timetuple()), usegmt=True)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime.datetime] = None) -> bool:
+    """Можно ли ответить 304: проверяется If-None-Match, а если его нет — If-Modified-Since"""
+
+    if if_none_match := request.headers.get("if-none-match"):
+        if if_none_match.strip() == "*":
+            return True
+        return etag in (value.strip().removeprefix("W/") for value in if_none_match.split(","))
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if not if_modified_since or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    return calendar.timegm(last_modified.timetuple()) <= calendar.timegm(since.utctimetuple())
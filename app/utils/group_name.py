@@ -0,0 +1,26 @@
+"""Нормализация названий групп: `ikbo 01–21` -> `ИКБО-01-21`"""
+import re
+from functools import lru_cache
+
+_LAT_TO_CYR = {
+    ord(lat): ord(cyr)
+    for lat, cyr in zip(
+        "abvgdeejzijklmnoprstufhzcss_y_euABVGDEEJZIJKLMNOPRSTUFHZCSS_Y_EU",
+        "абвгдеёжзийклмнопрстуфхцчшщъыьэюАБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮ",
+    )
+}
+# Пробелы и тире (дефис, минус, короткое и длинное тире) между частями названия
+_SEPARATORS = re.compile(r"[\s‐-―−-]+")
+
+
+def lat_to_cyr(string: str) -> str:
+    """Converts latin letters to cyrillic"""
+
+    return string.translate(_LAT_TO_CYR).upper()
+
+
+@lru_cache(maxsize=4096)
+def normalize_group_name(name: str) -> str:
+    """Название группы кириллицей в верхнем регистре с дефисами между частями"""
+
+    return _SEPARATORS.sub("-", lat_to_cyr(name)).strip("-")
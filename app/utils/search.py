@@ -0,0 +1,113 @@
+"""Нормализация и триграммы для поиска аудиторий и преподавателей.
+
+Ключ поиска хранится в БД в вычисляемом столбце search_key (выражение search_key_sql) и строится так же,
+как normalize_search_key: ё → е, латинские буквы, похожие на кириллические (A-101), заменяются кириллицей,
+всё приводится к нижнему регистру, остаются только буквы и цифры. Замена сделана через translate, а не lower(),
+чтобы результат не зависел от локали БД.
+"""
+import heapq
+import re
+from collections import Counter
+from typing import Callable, Hashable, List, Optional, Tuple
+
+_LATIN_TO_CYRILLIC = {**dict(zip("abcehkmoptxy", "авсенкмортху")), **dict(zip("ABCEHKMOPTXY", "авсенкмортху"))}
+
+_SEARCH_KEY_CHARS = {
+    **{upper: lower for upper, lower in zip("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")},
+    **{upper: lower for upper, lower in zip("АБВГДЕЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯ", "абвгдежзийклмнопрстуфхцчшщъыьэюя")},
+    "Ё": "е",
+    "ё": "е",
+    **_LATIN_TO_CYRILLIC,
+}
+SEARCH_KEY_FROM = "".join(_SEARCH_KEY_CHARS)
+SEARCH_KEY_TO = "".join(_SEARCH_KEY_CHARS.values())
+SEARCH_KEY_PATTERN = "[^0-9a-zа-я]"
+
+_translation = str.maketrans(_SEARCH_KEY_CHARS)
+_not_search_key_char = re.compile(SEARCH_KEY_PATTERN)
+
+# Минимальное сходство триграмм, как pg_trgm.similarity_threshold по умолчанию
+SIMILARITY_THRESHOLD = 0.3
+
+
+def normalize_search_key(value: str) -> str:
+    """Ключ поиска: `Ауд. А-101/2` -> `ауда1012`"""
+
+    return _not_search_key_char.sub("", value.translate(_translation))
+
+
+def search_key_sql(column: str) -> str:
+    """SQL выражение ключа поиска для вычисляемого столбца"""
+
+    translated = f"translate({column}, '{SEARCH_KEY_FROM}', '{SEARCH_KEY_TO}')"
+    return f"regexp_replace({translated}, '{SEARCH_KEY_PATTERN}', '', 'g')"
+
+
+def trigrams(key: str) -> set[str]:
+    """Триграммы ключа поиска, как в pg_trgm (слово дополняется двумя пробелами слева и одним справа)"""
+
+    padded = f"  {key} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(key: str, query: str) -> float:
+    """Сходство ключей по триграммам, как pg_trgm.similarity"""
+
+    key_trigrams, query_trigrams = trigrams(key), trigrams(query)
+    return len(key_trigrams & query_trigrams) / len(key_trigrams | query_trigrams)
+
+
+def is_match(key: str, query: str, key_similarity: float) -> bool:
+    """Ключ начинается с короткого (до 3 символов) запроса, содержит запрос или похож на него"""
+
+    matched = key.startswith(query) if len(query) < 3 else query in key
+    return matched or key_similarity >= SIMILARITY_THRESHOLD
+
+
+def rank(key: str, query: str, key_similarity: float) -> Tuple[bool, bool, float, str]:
+    """Порядок результатов: точное совпадение, совпадение начала, сходство по триграммам, ключ"""
+
+    return key != query, not key.startswith(query), -key_similarity, key
+
+
+class TrigramIndex:
+    """Поиск по ключам в памяти с тем же отбором и порядком результатов, что и поиск через pg_trgm.
+
+    Кандидаты берутся из списков идентификаторов по триграммам запроса, сходство считается по количеству
+    общих триграмм без построения множеств, поэтому поиск не перебирает все ключи.
+    """
+
+    def __init__(self):
+        self._keys: dict[Hashable, str] = {}
+        self._sizes: dict[Hashable, int] = {}  # количество триграмм ключа
+        self._trigrams: dict[str, List[Hashable]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, id_: Hashable, key: str) -> None:
+        key_trigrams = trigrams(key)
+        self._keys[id_] = key
+        self._sizes[id_] = len(key_trigrams)
+        for trigram in key_trigrams:
+            self._trigrams.setdefault(trigram, []).append(id_)
+
+    def search(self, query: str, limit: int, where: Optional[Callable[[Hashable], bool]] = None) -> List[Hashable]:
+        """Идентификаторы (с условием where), ключи которых подходят под query (is_match), в порядке rank"""
+
+        if not query:
+            return []
+
+        query_trigrams = trigrams(query)
+        shared = Counter()
+        for trigram in query_trigrams:
+            shared.update(self._trigrams.get(trigram, ()))
+
+        found = []
+        for id_, count in shared.items():
+            key = self._keys[id_]
+            key_similarity = count / (self._sizes[id_] + len(query_trigrams) - count)
+            if is_match(key, query, key_similarity) and (where is None or where(id_)):
+                found.append((*rank(key, query, key_similarity), id_))
+
+        return [item[-1] for item in heapq.nsmallest(limit, found)]
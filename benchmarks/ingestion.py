@@ -0,0 +1,180 @@
+"""Сравнение построчного и пакетного сохранения расписания в БД.
+
+Запуск (использует БД из DB_URL, расписание групп документа будет перезаписано):
+
+    python -m benchmarks.ingestion "docs/расписание колледж.xlsx" --institute КПК --degree 4
+"""
+import argparse
+import asyncio
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import delete, event, select
+
+import app.services.bulk_schedule as bulk_schedule
+import app.services.crud_schedule as schedule_crud
+from app import models
+from app.database import tables
+from app.database.connection import async_session, engine
+from app.parser.schedule import ScheduleParsingService, _parse_document
+from app.parser.structures import ParsedSchedule
+from app.services.db import DegreeDBService, GroupDBService, InstituteDBService, PeriodDBService
+
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+
+
+@contextmanager
+def count_statements():
+    counter = StatementCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", counter)
+
+
+async def _get_or_create_group(db, schedule: ParsedSchedule) -> int:
+    period = await PeriodDBService.get_period_by_params(
+        db, schedule.period.year_start, schedule.period.year_end, schedule.period.semester
+    )
+    if not period:
+        period = await PeriodDBService.create(
+            db,
+            models.PeriodCreate(
+                year_start=schedule.period.year_start,
+                year_end=schedule.period.year_end,
+                semester=schedule.period.semester,
+            ),
+        )
+    degree = await DegreeDBService.get_degree_by_name(db, schedule.degree)
+    if not degree:
+        degree = await DegreeDBService.create(db, models.DegreeCreate(name=schedule.degree))
+    institute = await InstituteDBService.get_institute_by_name(db, schedule.institute.name)
+    if not institute:
+        institute = await InstituteDBService.create(
+            db, models.InstituteCreate(name=schedule.institute.name, short_name=schedule.institute.short_name)
+        )
+    group = await GroupDBService.get_group_by_name(db, schedule.group, period.id)
+    if not group:
+        group = await GroupDBService.create(
+            db,
+            models.GroupCreate(
+                name=schedule.group, period_id=period.id, degree_id=degree.id, institute_id=institute.id
+            ),
+        )
+    await db.commit()
+    return group.id
+
+
+async def _clear_lessons(db, group_ids: list[int]) -> None:
+    lessons_ids = select(tables.Lesson.id).where(tables.Lesson.group_id.in_(group_ids))
+    await db.execute(delete(tables.lessons_to_teachers).where(tables.lessons_to_teachers.c.lesson_id.in_(lessons_ids)))
+    await db.execute(delete(tables.Lesson).where(tables.Lesson.group_id.in_(group_ids)))
+    await db.commit()
+
+
+async def _save_row_by_row(db, group_id: int, schedule: ParsedSchedule) -> None:
+    """Прежний способ сохранения: отдельные SELECT/INSERT/COMMIT для каждого значения"""
+
+    calls = {}
+    for num, time_start, time_end in schedule.calls:
+        calls[(num, time_start, time_end)] = await schedule_crud.get_or_create_lesson_call(
+            db, models.LessonCallCreate(num=num, time_start=time_start, time_end=time_end)
+        )
+
+    for lesson in schedule.lessons:
+        lesson_call = calls[lesson.call]
+        discipline = await schedule_crud.get_or_create_discipline(db, models.DisciplineCreate(name=lesson.name))
+        room = None
+        if lesson.room is not None:
+            campus_id = None
+            if lesson.room.campus:
+                campus = await schedule_crud.get_or_create_campus(
+                    db,
+                    models.CampusCreate(name=lesson.room.campus.name, short_name=lesson.room.campus.short_name),
+                )
+                campus_id = campus.id
+            room = await schedule_crud.get_or_create_room(
+                db, models.RoomCreate(name=lesson.room.name, campus_id=campus_id)
+            )
+        lesson_type = None
+        if lesson.type:
+            lesson_type = await schedule_crud.get_or_create_lesson_type(db, models.LessonTypeCreate(name=lesson.type))
+        teachers_id = [
+            (await schedule_crud.get_or_create_teacher(db, models.TeacherCreate(name=teacher))).id
+            for teacher in lesson.teachers
+        ]
+        await schedule_crud.get_or_create_lesson(
+            db,
+            models.LessonCreate(
+                lesson_type_id=lesson_type.id if lesson_type else None,
+                discipline_id=discipline.id,
+                teachers_id=teachers_id,
+                room_id=room.id if room else None,
+                group_id=group_id,
+                call_id=lesson_call.id,
+                weekday=lesson.weekday,
+                subgroup=lesson.subgroup,
+                weeks=lesson.weeks,
+            ),
+        )
+
+
+async def _save_all_row_by_row(db, groups: dict[int, ParsedSchedule]) -> None:
+    for group_id, schedule in groups.items():
+        await _save_row_by_row(db, group_id, schedule)
+    await db.commit()
+
+
+async def _save_bulk(db, groups: dict[int, ParsedSchedule]) -> None:
+    dimensions = await bulk_schedule.upsert_dimensions(db, list(groups.values()))
+    for group_id, schedule in groups.items():
+        await bulk_schedule.sync_group_lessons(db, group_id, schedule.lessons, dimensions)
+    await db.commit()
+
+
+async def run(file_path: str, institute: str, degree: int) -> None:
+    doc = ScheduleParsingService._get_document_from_file(file_path=file_path, institute=institute, degree=degree)[0]
+    schedules = _parse_document(doc) or []
+    lessons_count = sum(len(schedule.lessons) for schedule in schedules)
+    print(f"Документ: {file_path}. Групп: {len(schedules)}, занятий: {lessons_count}")
+
+    async with async_session() as db:
+        groups = {await _get_or_create_group(db, schedule): schedule for schedule in schedules}
+        # Прогрев: справочники уже заполнены, как при повторном парсинге семестра
+        await _clear_lessons(db, list(groups))
+        await _save_bulk(db, groups)
+
+    results = {}
+    for name, save in (
+        ("row-by-row", lambda db: _save_all_row_by_row(db, groups)),
+        ("bulk", lambda db: _save_bulk(db, groups)),
+    ):
+        async with async_session() as db:
+            await _clear_lessons(db, list(groups))
+        async with async_session() as db:
+            with count_statements() as counter:
+                started = time.perf_counter()
+                await save(db)
+                elapsed = time.perf_counter() - started
+        results[name] = (elapsed, counter.count)
+        print(f"{name:>12}: {elapsed:8.3f} с, {counter.count:7d} SQL запросов")
+
+    (slow_time, slow_count), (fast_time, fast_count) = results["row-by-row"], results["bulk"]
+    print(f"Ускорение: x{slow_time / fast_time:.1f}, запросов меньше в {slow_count / max(fast_count, 1):.1f} раз")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("file", help="Путь к документу с расписанием")
+    parser.add_argument("--institute", required=True, help="Короткое название института")
+    parser.add_argument("--degree", type=int, required=True, help="Степень обучения")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.file, args.institute, args.degree))
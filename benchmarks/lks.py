@@ -0,0 +1,41 @@
+"""Сравнение прежнего (недели × дни × занятия²) и однопроходного построения расписания в формате ЛКс.
+
+Не требует БД: расписание тяжёлой группы генерируется. Ответы обоих вариантов должны совпадать побайтово.
+
+    python -m benchmarks.lks --lessons 60 --repeat 20
+"""
+import argparse
+import time
+from typing import Callable, List
+
+from app import models
+from app.services.lks import build_lks_schedule
+from tests.data import DEFAULT_GRID, build_lks_schedule_legacy, make_heavy_group
+
+
+def _measure(build: Callable, lessons: List[models.Lesson], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        build(lessons, DEFAULT_GRID)
+    return (time.perf_counter() - start) / repeat
+
+
+def run(lessons: int, repeat: int) -> None:
+    group = make_heavy_group(lessons)
+
+    legacy, linear = build_lks_schedule_legacy(group, DEFAULT_GRID), build_lks_schedule(group, DEFAULT_GRID)
+    print(f"Ответы совпадают: {legacy == linear}, {len(linear)} байт")
+
+    legacy_time = _measure(build_lks_schedule_legacy, group, repeat)
+    linear_time = _measure(build_lks_schedule, group, repeat)
+    print(f"Прежний алгоритм: {legacy_time * 1000:.2f} мс")
+    print(f"За один проход:   {linear_time * 1000:.2f} мс (в {legacy_time / linear_time:.1f} раз быстрее)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lessons", type=int, default=60, help="Количество занятий группы")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    run(args.lessons, args.repeat)
@@ -0,0 +1,54 @@
+"""Сравнение парсинга XLSX документов в потоках и в процессах.
+
+Запуск (БД не используется):
+
+    python -m benchmarks.parse_executor docs --institute КПК --degree 4 --workers 4 --repeat 8
+
+--repeat повторяет каждый документ, чтобы нагрузить все воркеры, если документов в папке мало.
+"""
+import argparse
+import asyncio
+import pickle
+import time
+from pathlib import Path
+
+from app.parser.schedule import ScheduleParsingService
+
+
+def _get_documents(directory: str, institute: str, degree: int) -> list:
+    documents = []
+    for file_path in sorted(Path(directory).glob("*.xlsx")):
+        documents += ScheduleParsingService._get_document_from_file(
+            file_path=str(file_path), institute=institute, degree=degree
+        )
+    return documents
+
+
+async def _collect(documents: list, executor: str, workers: int) -> list:
+    return [result async for result in ScheduleParsingService._parse(documents, executor=executor, workers=workers)]
+
+
+def run(directory: str, institute: str, degree: int, workers: int, repeat: int) -> None:
+    documents = _get_documents(directory, institute, degree) * repeat
+    print(f"Документов: {len(documents)}, воркеров: {workers}")
+
+    for executor in ("thread", "process"):
+        started = time.perf_counter()
+        results = asyncio.run(_collect(documents, executor, workers))
+        elapsed = time.perf_counter() - started
+
+        groups = sum(len(schedules) for _, schedules in results)
+        size = sum(len(pickle.dumps(schedules)) for _, schedules in results)
+        print(f"{executor:>8}: {elapsed:8.3f} с, групп: {groups}, размер результатов: {size / 1024:.0f} КБ")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", help="Папка с документами расписания")
+    parser.add_argument("--institute", required=True, help="Короткое название института")
+    parser.add_argument("--degree", type=int, required=True, help="Степень обучения")
+    parser.add_argument("--workers", type=int, default=4, help="Количество потоков/процессов")
+    parser.add_argument("--repeat", type=int, default=1, help="Сколько раз повторить каждый документ")
+    args = parser.parse_args()
+
+    run(args.directory, args.institute, args.degree, args.workers, args.repeat)
@@ -0,0 +1,240 @@
+"""Задержки (p50/p99) запросов к БД горячих эндпоинтов аудиторий и групп до и после составных индексов.
+
+Создаёт отдельную БД, заполняет её синтетическим семестром (группы нескольких периодов с одинаковыми именами,
+аудитории, преподаватели, занятия с неделями), откатывает миграцию составных индексов и замеряет запросы,
+затем применяет миграцию и замеряет снова. БД из DB_URL не изменяется, кроме создания и удаления тестовой.
+
+    python -m benchmarks.queries --groups 600 --periods 4 --repeat 200
+"""
+import argparse
+import asyncio
+import datetime
+import importlib.util
+import random
+import statistics
+import time
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from rtu_schedule_parser.utils import academic_calendar
+from sqlalchemy import insert, select, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from app.config import config
+from app.database import tables
+from app.database.connection import Base
+from app.services.api import GroupService
+from app.services.db import GroupDBService, LessonDBService, RoomDBService
+from app.services.group_directory import group_directory
+from app.services.period_cache import period_cache
+from app.services.semester_grid import SemesterGrid
+from tests.db_setup import create_test_db, drop_test_db
+
+BENCHMARK_DB_NAME = "schedule_benchmark_queries"
+MIGRATION = (
+    Path(__file__).parent.parent / "alembic" / "versions" / "a6c2e8f4b1d9_add_room_and_group_composite_indexes.py"
+)
+
+CALLS = [(9, 0), (10, 40), (12, 40), (14, 20), (16, 20), (18, 0), (19, 40)]
+WEEKS = [list(range(1, 18, 2)), list(range(2, 18, 2)), list(range(1, 18)), list(range(1, 9)), list(range(9, 18))]
+LESSONS_PER_GROUP = 34
+ROOMS, TEACHERS, DISCIPLINES = 400, 1500, 800
+LKS_GRID = SemesterGrid(max_week=17, days=(1, 2, 3, 4, 5, 6), calls=6)
+
+Query = Callable[[AsyncSession, random.Random], Awaitable]
+
+
+def _load_migration():
+    spec = importlib.util.spec_from_file_location("composite_indexes", MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _run_migration(sync_conn, step: Callable[[], None]) -> None:
+    with Operations.context(MigrationContext.configure(sync_conn)):
+        step()
+
+
+async def _seed(db: AsyncSession, groups: int, periods: int, seed: int) -> None:
+    """Синтетический семестр: период с id 1 - текущий, остальные - прошлые годы"""
+
+    rnd = random.Random(seed)
+    current = academic_calendar.get_period(academic_calendar.now_date())
+
+    await db.execute(
+        insert(tables.SchedulePeriod),
+        [
+            {
+                "id": i,
+                "year_start": current.year_start - i + 1,
+                "year_end": current.year_end - i + 1,
+                "semester": current.semester,
+            }
+            for i in range(1, periods + 1)
+        ],
+    )
+    await db.execute(insert(tables.Institute), [{"id": 1, "name": "Институт", "short_name": "И"}])
+    await db.execute(insert(tables.ScheduleDegree), [{"id": 1, "name": "Бакалавриат"}])
+    await db.execute(
+        insert(tables.ScheduleCampus), [{"id": i, "name": f"Кампус {i}", "short_name": f"К-{i}"} for i in range(1, 6)]
+    )
+    await db.execute(
+        insert(tables.Room), [{"id": i, "name": f"А-{i}", "campus_id": i % 5 + 1} for i in range(1, ROOMS + 1)]
+    )
+    await db.execute(
+        insert(tables.LessonCall),
+        [
+            {
+                "id": num,
+                "num": num,
+                "time_start": datetime.time(hour, minute),
+                "time_end": (datetime.datetime(2000, 1, 1, hour, minute) + datetime.timedelta(minutes=90)).time(),
+            }
+            for num, (hour, minute) in enumerate(CALLS, 1)
+        ],
+    )
+    await db.execute(
+        insert(tables.LessonType), [{"id": i, "name": name} for i, name in enumerate(["лек", "пр", "лаб"], 1)]
+    )
+    await db.execute(
+        insert(tables.ScheduleDiscipline), [{"id": i, "name": f"Дисциплина {i}"} for i in range(1, DISCIPLINES + 1)]
+    )
+    await db.execute(insert(tables.Teacher), [{"id": i, "name": f"Преподаватель {i}"} for i in range(1, TEACHERS + 1)])
+
+    group_rows, lesson_rows, teacher_rows = [], [], []
+    for period_id in range(1, periods + 1):
+        for number in range(groups):
+            group_id = len(group_rows) + 1
+            group_rows.append(
+                {
+                    "id": group_id,
+                    "name": f"ИКБО-{number:02d}-21",
+                    "period_id": period_id,
+                    "institute_id": 1,
+                    "degree_id": 1,
+                }
+            )
+            for _ in range(LESSONS_PER_GROUP):
+                lesson_id = len(lesson_rows) + 1
+                lesson_rows.append(
+                    {
+                        "id": lesson_id,
+                        "group_id": group_id,
+                        "call_id": rnd.randint(1, 6),
+                        "discipline_id": rnd.randint(1, DISCIPLINES),
+                        "weekday": rnd.randint(1, 6),
+                        "room_id": rnd.randint(1, ROOMS) if rnd.random() > 0.05 else None,
+                        "lesson_type_id": rnd.randint(1, 3),
+                        "subgroup": None,
+                        "weeks": rnd.choice(WEEKS),
+                    }
+                )
+                teacher_rows.append({"lesson_id": lesson_id, "teacher_id": rnd.randint(1, TEACHERS)})
+
+    await db.execute(insert(tables.Group), group_rows)
+    for i in range(0, len(lesson_rows), 10000):
+        await db.execute(insert(tables.Lesson), lesson_rows[i : i + 10000])
+        await db.execute(insert(tables.lessons_to_teachers), teacher_rows[i : i + 10000])
+    await db.commit()
+
+    print(f"Периодов: {periods}, групп: {len(group_rows)}, занятий: {len(lesson_rows)}, аудиторий: {ROOMS}")
+
+
+def _queries(current_period_id: int, groups: int) -> dict[str, Query]:
+    def group_name(rnd: random.Random) -> str:
+        return f"ИКБО-{rnd.randrange(groups):02d}-21"
+
+    return {
+        "/lessons/rooms/{id}?week=": lambda db, rnd: LessonDBService.get_lessons_by_room_id(
+            db, rnd.randint(1, ROOMS), week=rnd.randint(1, 17), date=None
+        ),
+        # Запрос занятий из get_room_info (сама функция ещё считает загруженность через кэш FastAPI)
+        "/rooms/info/{id}": lambda db, rnd: db.execute(
+            select(tables.Lesson)
+            .where(tables.Lesson.room_id == rnd.randint(1, ROOMS))
+            .order_by(tables.Lesson.weekday, tables.Lesson.call_id)
+        ),
+        "/rooms/workload/{id}": lambda db, rnd: RoomDBService.get_workloads(
+            db, 17, range(1, 7), rooms_id=[rnd.randint(1, ROOMS)]
+        ),
+        "/groups/name/{name}": lambda db, rnd: GroupDBService.get_group_by_name(
+            db, group_name(rnd), period_id=current_period_id
+        ),
+        # Без кэша FastAPI (@cache): поиск группы в справочнике, загрузка расписания через ORM и сборка JSON
+        "/lks/{name}": lambda db, rnd: GroupService.get_lks_schedule.__wrapped__(
+            GroupService, db, group_name(rnd), LKS_GRID
+        ),
+    }
+
+
+async def _measure(session_factory, queries: dict[str, Query], repeat: int, seed: int) -> dict[str, tuple]:
+    results = {}
+    for name, query in queries.items():
+        rnd = random.Random(seed)
+        timings = []
+        for _ in range(repeat):
+            async with session_factory() as db:
+                started = time.perf_counter()
+                await query(db, rnd)
+                timings.append((time.perf_counter() - started) * 1000)
+        percentiles = statistics.quantiles(timings, n=100)
+        results[name] = (percentiles[49], percentiles[98])
+    return results
+
+
+async def run(groups: int, periods: int, repeat: int, seed: int) -> None:
+    url = make_url(config.DB_URL)
+    default_url = str(url.set(database="postgres"))
+    await drop_test_db(default_url, BENCHMARK_DB_NAME)
+    await create_test_db(default_url, BENCHMARK_DB_NAME)
+
+    engine = create_async_engine(url.set(database=BENCHMARK_DB_NAME), future=True)
+    session_factory = sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    migration = _load_migration()
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(_run_migration, migration.downgrade)
+
+        async with session_factory() as db:
+            await _seed(db, groups, periods, seed)
+        # Справочник групп и id текущего периода - из тестовой БД
+        group_directory.session_factory = session_factory
+        group_directory.invalidate()
+        period_cache.invalidate()
+        queries = _queries(current_period_id=1, groups=groups)
+
+        results = {}
+        for stage, step in (("до", None), ("после", migration.upgrade)):
+            if step:
+                async with engine.begin() as conn:
+                    await conn.run_sync(_run_migration, step)
+            # Карта видимости (index-only scan) и статистика, как после autovacuum на рабочей БД
+            async with engine.connect() as conn:
+                await conn.execution_options(isolation_level="AUTOCOMMIT")
+                await conn.execute(text("VACUUM ANALYZE"))
+            results[stage] = await _measure(session_factory, queries, repeat, seed)
+    finally:
+        await engine.dispose()
+        await drop_test_db(default_url, BENCHMARK_DB_NAME)
+
+    print(f"{'запрос':<28}{'p50 до':>10}{'p99 до':>10}{'p50 после':>12}{'p99 после':>12}  мс")
+    for name in queries:
+        (p50_before, p99_before), (p50_after, p99_after) = results["до"][name], results["после"][name]
+        print(f"{name:<28}{p50_before:>10.2f}{p99_before:>10.2f}{p50_after:>12.2f}{p99_after:>12.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--groups", type=int, default=600, help="Количество групп в каждом периоде")
+    parser.add_argument("--periods", type=int, default=4, help="Количество периодов")
+    parser.add_argument("--repeat", type=int, default=200, help="Количество запросов каждого вида")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.groups, args.periods, args.repeat, args.seed))
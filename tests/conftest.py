@@ -2,15 +2,20 @@ import warnings
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
 
 from app.config import config
-from app.database import get_db_facade
-from app.main import app
-from tests.mock.db import MockDBFacade
+from app.database.connection import Base
+from app.services.period_cache import period_cache
+from tests.db_setup import create_test_db, drop_test_db
 
 
 @pytest.fixture
 def db_facade():
+    from tests.mock.db import MockDBFacade
+
     return MockDBFacade()
 
 
@@ -22,7 +27,43 @@ def patch_settings():
 
 @pytest.fixture
 def client(db_facade, patch_settings):
+    from app.database import get_db_facade
+    from app.main import app
+
     test_client = TestClient(app)
     app.dependency_overrides[get_db_facade] = lambda: db_facade
 
     return test_client
+
+
+@pytest.fixture
+def test_db_name(request):
+    """Имя тестовой БД: по умолчанию по имени модуля, переопределяется через indirect-параметризацию"""
+
+    return getattr(request, "param", f"schedule_{request.module.__name__.rsplit('.', 1)[-1]}")
+
+
+@pytest.fixture
+async def engine(test_db_name):
+    """Движок чистой тестовой БД со схемой из моделей, после теста БД удаляется"""
+
+    url = make_url(config.DB_URL)
+    default_url = str(url.set(database="postgres"))
+    await drop_test_db(default_url, test_db_name)
+    await create_test_db(default_url, test_db_name)
+
+    engine = create_async_engine(url.set(database=test_db_name), future=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    period_cache.invalidate()  # id периодов другой тестовой БД
+    yield engine
+
+    period_cache.invalidate()
+    await engine.dispose()
+    await drop_test_db(default_url, test_db_name)
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
@@ -1,4 +1,15 @@
+import datetime
+import random
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app import models
 from app.models import Campus, Room
+from app.parser.structures import ParsedInstitute, ParsedLesson, ParsedPeriod, ParsedRoom, ParsedSchedule
+from app.services.lks import MILITARY_TRAINING, get_lesson_type, get_subgroup_substr
+from app.services.semester_grid import SemesterGrid
 
 CAMPUSES = [Campus(id=1, name="Кампус 1", short_name="К1"), Campus(id=2, name="Кампус 2", short_name="К2")]
 ROOMS = [
@@ -6,3 +17,121 @@ ROOMS = [
     Room(id=2, name="Аудитория 2", campus_id=1, campus=CAMPUSES[0]),
     Room(id=3, name="Аудитория 3", campus_id=1, campus=CAMPUSES[0]),
 ]
+
+CALL = (1, datetime.time(9, 0), datetime.time(10, 30))
+
+
+def make_lesson(
+    name: str, weekday: int = 1, room: str = "А-1", weeks=(1, 3), teachers=("Иванов И.И.",)
+) -> ParsedLesson:
+    """Занятие распарсенного документа в первую пару"""
+
+    return ParsedLesson(*CALL, weekday, name, tuple(weeks), tuple(teachers), "лек", None, ParsedRoom(room, None))
+
+
+def make_schedule(*lessons: ParsedLesson, group: str = "ИКБО-01-21") -> ParsedSchedule:
+    """Расписание группы распарсенного документа"""
+
+    return ParsedSchedule(
+        group, ParsedPeriod(2022, 2023, 1), ParsedInstitute("ИИТ", "ИИТ"), "Бакалавриат", "", (CALL,), lessons
+    )
+
+
+DEFAULT_GRID = SemesterGrid(max_week=17, days=(1, 2, 3, 4, 5, 6), calls=6)
+
+HEAVY_GROUP_CALLS = [
+    (datetime.time(9, 0), datetime.time(10, 30)),
+    (datetime.time(10, 40), datetime.time(12, 10)),
+    (datetime.time(12, 40), datetime.time(14, 10)),
+    (datetime.time(14, 20), datetime.time(15, 50)),
+    (datetime.time(16, 20), datetime.time(17, 50)),
+    (datetime.time(18, 0), datetime.time(19, 30)),
+]
+HEAVY_GROUP_WEEKS = [
+    list(range(1, 18, 2)),
+    list(range(2, 18, 2)),
+    list(range(1, 18)),
+    [1, 5, 9, 13],
+    [2, 6, 10, 14, 18],
+]
+
+
+def make_heavy_group(lessons: int = 60, seed: int = 1) -> List[models.Lesson]:
+    """Занятия тяжёлой группы: подгруппы, несколько занятий на одной паре, военная подготовка, занятия без
+    аудитории и типа, недели за пределами семестра"""
+
+    rnd = random.Random(seed)
+    result = []
+    for i in range(1, lessons + 1):
+        num = rnd.randint(1, len(HEAVY_GROUP_CALLS))
+        discipline = MILITARY_TRAINING if i % 15 == 0 else f"Дисциплина {rnd.randint(1, 20)}"
+        lesson_type = rnd.choice([None, "лек", "пр", "лаб"])
+        result.append(
+            models.Lesson(
+                id=i,
+                lesson_type={"id": 1, "name": lesson_type} if lesson_type else None,
+                discipline={"id": i, "name": discipline},
+                teachers=[{"id": t, "name": f"Преподаватель {t}"} for t in rnd.sample(range(1, 40), rnd.randint(0, 2))],
+                room={"id": i, "name": f"А-{rnd.randint(1, 500)}", "campus_id": 1} if rnd.random() > 0.1 else None,
+                calls={
+                    "id": num,
+                    "num": num,
+                    "time_start": HEAVY_GROUP_CALLS[num - 1][0],
+                    "time_end": HEAVY_GROUP_CALLS[num - 1][1],
+                },
+                weekday=rnd.randint(1, 7),
+                subgroup=rnd.choice([None, None, 1, 2]),
+                weeks=rnd.choice(HEAVY_GROUP_WEEKS),
+                group={"id": 1, "name": "ИКБО-01-21"},
+            )
+        )
+    return result
+
+
+def build_lks_schedule_legacy(lessons: List[models.Lesson], grid: SemesterGrid) -> bytes:
+    """Прежний алгоритм get_lks_schedule: для каждой недели, дня и занятия перебираются все занятия"""
+
+    lks_week_weeks = {}
+    for week in grid.weeks:
+        lks_week_days = {}
+        for day in grid.days:
+            lks_week_lessons = {}
+            for lesson in lessons:
+                if lesson.discipline.name == MILITARY_TRAINING and week in lesson.weeks and lesson.weekday == day:
+                    lks_week_lessons[str(lesson.calls.num)] = [
+                        models.LksLesson(
+                            PROPERTY_DISCIPLINE_NAME=lesson.discipline.name + get_subgroup_substr(lesson),
+                            PROPERTY_LESSON_TYPE=get_lesson_type(lesson.lesson_type.name if lesson.lesson_type else ""),
+                            PROPERTY_NUMBER=str(lesson.calls.num),
+                            PROPERTY_LECTOR=", ".join([teacher.name for teacher in lesson.teachers or []]),
+                            PROPERTY_PLACE=lesson.room.name if lesson.room else "",
+                        )
+                    ]
+                    continue
+
+                tmp_lessons = [
+                    tmp
+                    for tmp in lessons
+                    if tmp.calls.num == lesson.calls.num and week in tmp.weeks and tmp.weekday == day
+                ]
+
+                if not tmp_lessons:
+                    continue
+
+                if str(lesson.calls.num) not in lks_week_lessons:
+                    lks_week_lessons[str(lesson.calls.num)] = [
+                        models.LksLesson(
+                            PROPERTY_DISCIPLINE_NAME=tmp.discipline.name + get_subgroup_substr(tmp),
+                            PROPERTY_LESSON_TYPE=get_lesson_type(tmp.lesson_type.name if tmp.lesson_type else ""),
+                            PROPERTY_NUMBER=str(tmp.calls.num),
+                            PROPERTY_LECTOR=", ".join([teacher.name for teacher in tmp.teachers or []]),
+                            PROPERTY_PLACE=tmp.room.name if tmp.room else "",
+                        )
+                        for tmp in tmp_lessons
+                    ]
+
+            lks_week_days[str(day)] = models.LksLessons(LESSONS=lks_week_lessons)
+        lks_week_weeks[str(week)] = models.LksDay(DAYS=lks_week_days)
+
+    schedule = models.LksSchedule(result=models.LksWeeks(WEEKS=lks_week_weeks))
+    return JSONResponse(jsonable_encoder(schedule)).body
@@ -0,0 +1,122 @@
+import pytest
+from sqlalchemy import event, select
+
+import app.services.bulk_schedule as bulk_schedule
+from app.database import tables
+from app.services.dimension_cache import DimensionCache
+from tests.data import make_lesson, make_schedule
+
+
+async def _create_group(db) -> int:
+    degree = tables.ScheduleDegree(name="Бакалавриат")
+    group = tables.Group(
+        name="ИКБО-01-21",
+        period=tables.SchedulePeriod(year_start=2022, year_end=2023, semester=1),
+        institute=tables.Institute(name="ИИТ", short_name="ИИТ"),
+        degree=degree,
+    )
+    db.add_all([degree, group])
+    await db.commit()
+    return group.id
+
+
+@pytest.mark.asyncio
+async def test_insert_lessons_round_trip(session_factory, monkeypatch):
+    monkeypatch.setattr(bulk_schedule._chunks, "__defaults__", (2,))  # несколько пакетов на таблицу
+
+    schedule = make_schedule(
+        make_lesson("Физика", teachers=("Иванов И.И.", "Петров П.П.")),
+        make_lesson("Физика", teachers=("Иванов И.И.", "Петров П.П.")),  # дубликат в документе
+        make_lesson("Химия", weekday=2, room="Б-2", weeks=(2, 4)),
+        make_lesson("Математика", weekday=3, teachers=()),
+        make_lesson("История", weekday=4, teachers=("Петров П.П.", "Сидоров С.С.", "Петров П.П.")),
+    )
+
+    async with session_factory() as db:
+        group_id = await _create_group(db)
+        dimensions = await bulk_schedule.upsert_dimensions(db, [schedule])
+        rows = bulk_schedule.build_lesson_rows(group_id, schedule.lessons, dimensions)
+        ids = await bulk_schedule.insert_lessons(db, rows)
+        await db.commit()
+
+    assert len(rows) == len(ids) == 4
+    async with session_factory() as db:
+        # Повторное сохранение справочников возвращает id существующих записей
+        assert await bulk_schedule.upsert_dimensions(db, [schedule]) == dimensions
+
+        lessons = (await db.execute(select(tables.Lesson.__table__))).mappings().all()
+        links = await db.execute(
+            select(tables.lessons_to_teachers.c.lesson_id, tables.lessons_to_teachers.c.teacher_id)
+        )
+        links = links.all()
+
+    expected = {id_: bulk_schedule.lesson_key(row, teachers_id) for id_, (row, teachers_id) in zip(ids, rows)}
+    teachers = {}
+    for lesson_id, teacher_id in links:
+        teachers.setdefault(lesson_id, []).append(teacher_id)
+
+    stored = {}
+    for lesson in lessons:
+        assert lesson["group_id"] == group_id
+        stored[lesson["id"]] = bulk_schedule.lesson_key(lesson, teachers.get(lesson["id"], []))
+    assert stored == expected
+
+    # Повторяющийся преподаватель занятия связывается с ним один раз
+    assert len(teachers[ids[3]]) == 2
+    assert expected[ids[2]].teachers_id == ()
+
+
+@pytest.mark.asyncio
+async def test_cached_dimensions_skip_db(engine, session_factory):
+    schedule = make_schedule(make_lesson("Физика"), make_lesson("Химия", weekday=2, room="Б-2"))
+    async with session_factory() as db:
+        dimensions = await bulk_schedule.upsert_dimensions(db, [schedule])
+        await db.commit()
+
+    cache = DimensionCache(max_size=100)
+    async with session_factory() as db:
+        await cache.warm(db)
+
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    async with session_factory() as db:
+        assert await bulk_schedule.upsert_dimensions(db, [schedule], cache) == dimensions
+    assert statements == []
+
+    # Новые значения запрашиваются из БД, известные берутся из кэша
+    schedule = make_schedule(make_lesson("Физика", teachers=("Петров П.П.",)))
+    async with session_factory() as db:
+        dimensions = await bulk_schedule.upsert_dimensions(db, [schedule], cache)
+        await db.commit()
+    assert len(statements) == 2  # INSERT ... ON CONFLICT и SELECT преподавателей
+    assert cache.get("teachers", "Петров П.П.") is None
+    cache.update(dimensions)
+    assert cache.get("teachers", "Петров П.П.") == dimensions.teachers["Петров П.П."]
+
+
+@pytest.mark.asyncio
+async def test_sync_keeps_unchanged_lessons(engine, session_factory):
+    schedule = make_schedule(make_lesson("Физика"), make_lesson("Химия", weekday=2))
+    async with session_factory() as db:
+        group_id = await _create_group(db)
+        dimensions = await bulk_schedule.upsert_dimensions(db, [schedule])
+        rows = bulk_schedule.build_lesson_rows(group_id, schedule.lessons, dimensions)
+        # Прежняя версия парсера сохраняла занятия повторно
+        ids = await bulk_schedule.insert_lessons(db, rows + rows[:1])
+        await db.commit()
+
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    async with session_factory() as db:
+        diff = await bulk_schedule.sync_group_lessons(db, group_id, schedule.lessons, dimensions)
+        await db.commit()
+
+        stored = (await db.execute(select(tables.Lesson.id).order_by(tables.Lesson.id))).scalars().all()
+
+    assert (diff.kept, diff.added, diff.removed, diff.moved) == (2, [], [], [])
+    [(duplicate_id, _)] = diff.duplicates
+    assert duplicate_id in (ids[0], ids[2]) and sorted(stored + [duplicate_id]) == ids
+    assert not any(statement.startswith(("INSERT", "UPDATE")) for statement in statements)
+
+    async with session_factory() as db:
+        assert not (await bulk_schedule.sync_group_lessons(db, group_id, schedule.lessons, dimensions)).changed
@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+from fakeredis import FakeServer
+from fakeredis.aioredis import FakeRedis
+
+from app.services import cache_invalidation
+from app.utils.cache import (
+    CACHE_PREFIX,
+    INVALIDATION_CHANNEL,
+    SCHEDULE_SCOPE,
+    SEMESTER_GRID_SCOPE,
+    LocalMemoryBackend,
+    SharedRedisBackend,
+    entity_key_builder,
+    invalidate_schedule_cache,
+)
+
+
+async def get_room_workload(db, room_id: int):
+    pass
+
+
+async def get_teacher(db, id_: int):
+    pass
+
+
+room_key = entity_key_builder("room", "room_id")
+teacher_key = entity_key_builder("teacher", "id_")
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request):
+    if request.param == "redis":
+        return SharedRedisBackend(FakeRedis())
+    return LocalMemoryBackend()
+
+
+async def _fill(backend) -> dict[str, str]:
+    keys = {
+        "room_1": room_key(get_room_workload, args=(None, 1)),
+        "room_12": room_key(get_room_workload, kwargs={"db": None, "room_id": 12}),
+        "teacher_1": teacher_key(get_teacher, args=(None, 1)),
+        "groups": f"{CACHE_PREFIX}:groups:all",
+    }
+    for key in keys.values():
+        await backend.set(key, "1")
+    return keys
+
+
+class TestCacheInvalidation:
+    def test_entity_key_builder_ignores_db(self):
+        assert room_key(get_room_workload, args=("db", 1)) == room_key(get_room_workload, kwargs={"room_id": 1})
+        assert room_key(get_room_workload, args=(None, 1)).startswith(f"{CACHE_PREFIX}:room:1:")
+
+    @pytest.mark.asyncio
+    async def test_invalidate_only_changed_entities(self, backend):
+        keys = await _fill(backend)
+
+        await invalidate_schedule_cache(backend, groups=[], rooms=[1], teachers=[])
+
+        assert await backend.get(keys["room_1"]) is None
+        assert await backend.get(keys["groups"]) is None
+        assert await backend.get(keys["room_12"]) is not None
+        assert await backend.get(keys["teacher_1"]) is not None
+
+    @pytest.mark.asyncio
+    async def test_invalidate_all(self, backend):
+        keys = await _fill(backend)
+
+        await invalidate_schedule_cache(backend)
+
+        for key in keys.values():
+            assert await backend.get(key) is None
+
+
+class FakeLocalCache:
+    def __init__(self):
+        self.invalidated = 0
+
+    def invalidate(self) -> None:
+        self.invalidated += 1
+
+
+@pytest.mark.asyncio
+async def test_invalidation_reaches_every_api_process(monkeypatch):
+    grid, directory = FakeLocalCache(), FakeLocalCache()
+    monkeypatch.setattr(
+        cache_invalidation, "LOCAL_CACHES", {SCHEDULE_SCOPE: (grid, directory), SEMESTER_GRID_SCOPE: (grid,)}
+    )
+    server = FakeServer()
+    # Два процесса API со своими соединениями с Redis
+    listeners = [
+        asyncio.create_task(cache_invalidation.listen_invalidation(FakeRedis(server=server))) for _ in range(2)
+    ]
+    publisher = FakeRedis(server=server)
+    while await publisher.pubsub_numsub(INVALIDATION_CHANNEL) != [(INVALIDATION_CHANNEL.encode(), 2)]:
+        await asyncio.sleep(0.01)
+
+    await publisher.publish(INVALIDATION_CHANNEL, SCHEDULE_SCOPE)
+    await publisher.publish(INVALIDATION_CHANNEL, SEMESTER_GRID_SCOPE)
+    for _ in range(100):
+        if (grid.invalidated, directory.invalidated) == (4, 2):
+            break
+        await asyncio.sleep(0.01)
+
+    for listener in listeners:
+        listener.cancel()
+    await asyncio.gather(*listeners, return_exceptions=True)
+    assert (grid.invalidated, directory.invalidated) == (4, 2)
@@ -0,0 +1,61 @@
+import pytest
+from rtu_schedule_parser.utils import academic_calendar
+from sqlalchemy import event
+
+from app.database import tables
+from app.services.group_directory import GroupDirectory
+from app.utils.group_name import normalize_group_name
+
+
+@pytest.mark.parametrize(
+    "name", ["ИКБО-01-21", "икбо-01-21", "ikbo-01-21", "IKBO 01 21", "ИКБО–01—21", " ИКБО - 01 - 21 "]
+)
+def test_normalize_group_name(name):
+    assert normalize_group_name(name) == "ИКБО-01-21"
+
+
+@pytest.mark.asyncio
+async def test_group_directory(engine, session_factory):
+    current = academic_calendar.get_period(academic_calendar.now_date())
+
+    async with session_factory() as db:
+        degree = tables.ScheduleDegree(name="Бакалавриат")
+        institute = tables.Institute(name="ИИТ", short_name="ИИТ")
+        periods = [
+            tables.SchedulePeriod(year_start=current.year_start - 1, year_end=current.year_end - 1, semester=1),
+            tables.SchedulePeriod(year_start=current.year_start, year_end=current.year_end, semester=current.semester),
+        ]
+        groups = [
+            tables.Group(name="ИКБО-01-21", period=period, institute=institute, degree=degree) for period in periods
+        ]
+        db.add_all([degree, institute, *groups])
+        await db.commit()
+
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    directory = GroupDirectory(ttl=60, session_factory=session_factory)
+    group = await directory.get("ikbo 01-21")
+    assert (group.id, group.period_id, group.name) == (groups[1].id, periods[1].id, "ИКБО-01-21")
+    await directory.get("ИКБО-01-21")
+    assert len(statements) == 2  # id текущего периода и группы, дальше поиск без запросов
+
+    assert await directory.get("ИКБО-02-21") is None
+    assert len(statements) == 3  # группы нет в справочнике - поиск в БД
+    assert await directory.get("ikbo-02-21") is None
+    assert len(statements) == 3  # повторный промах без запроса
+
+    directory.invalidate()
+    await directory.get("ИКБО-01-21")
+    assert len(statements) == 4  # id текущего периода уже известен
+
+    # Группа добавлена парсером после построения справочника
+    async with session_factory() as db:
+        added = tables.Group(name="ИКБО-02-21", period_id=periods[1].id, institute_id=institute.id, degree_id=degree.id)
+        db.add(added)
+        await db.commit()
+    statements.clear()
+
+    assert (await directory.get("ikbo-02-21")).id == added.id
+    assert (await directory.get("ИКБО-02-21")).id == added.id
+    assert len(statements) == 1  # поиск в БД только при первом промахе
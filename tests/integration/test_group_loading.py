@@ -0,0 +1,89 @@
+import datetime
+
+import pytest
+from sqlalchemy import event
+
+from app.database import tables
+from app.services.db import GroupDBService
+
+GROUP_LESSONS = 10
+OTHER_GROUP_LESSONS = 20
+TEACHERS_PER_LESSON = 2
+
+
+class QueryCounter:
+    """Количество SQL запросов и полученных строк"""
+
+    def __init__(self):
+        self.statements = 0
+        self.rows = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements += 1
+        self.rows += max(cursor.rowcount, 0)
+
+
+def _lessons(group, rooms, teachers, calls, discipline, lesson_type, count):
+    return [
+        tables.Lesson(
+            group=group,
+            calls=calls[i % len(calls)],
+            discipline=discipline,
+            lesson_type=lesson_type,
+            room=rooms[i % len(rooms)],
+            teachers=[teachers[(i + j) % len(teachers)] for j in range(TEACHERS_PER_LESSON)],
+            weekday=i % 6 + 1,
+            weeks=[1, 3, 5],
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+async def period_id(session_factory):
+    async with session_factory() as db:
+        period = tables.SchedulePeriod(year_start=2022, year_end=2023, semester=1)
+        institute = tables.Institute(name="Институт информационных технологий", short_name="ИИТ")
+        degree = tables.ScheduleDegree(name="Бакалавриат")
+        campus = tables.ScheduleCampus(name="Проспект Вернадского, 78", short_name="В-78")
+        rooms = [tables.Room(name=f"А-{i}", campus=campus) for i in range(1, 4)]
+        teachers = [tables.Teacher(name=f"Преподаватель {i}") for i in range(1, 6)]
+        calls = [
+            tables.LessonCall(num=1, time_start=datetime.time(9), time_end=datetime.time(10, 30)),
+            tables.LessonCall(num=2, time_start=datetime.time(10, 40), time_end=datetime.time(12, 10)),
+        ]
+        discipline = tables.ScheduleDiscipline(name="Математический анализ")
+        lesson_type = tables.LessonType(name="лек")
+
+        group = tables.Group(name="ИКБО-01-21", period=period, institute=institute, degree=degree)
+        other_group = tables.Group(name="ИКБО-02-21", period=period, institute=institute, degree=degree)
+        db.add_all([period, institute, degree, campus, discipline, lesson_type, group, other_group])
+        db.add_all(rooms + teachers + calls)
+        db.add_all(
+            _lessons(group, rooms, teachers, calls, discipline, lesson_type, GROUP_LESSONS)
+            + _lessons(other_group, rooms, teachers, calls, discipline, lesson_type, OTHER_GROUP_LESSONS)
+        )
+        await db.commit()
+        return period.id
+
+
+@pytest.mark.asyncio
+async def test_get_group_by_name_statements_and_rows(engine, session_factory, period_id):
+    counter = QueryCounter()
+    event.listen(engine.sync_engine, "after_cursor_execute", counter)
+    try:
+        async with session_factory() as db:
+            group = await GroupDBService.get_group_by_name(db, "ИКБО-01-21", period_id)
+
+            assert len(group.lessons) == GROUP_LESSONS
+            assert all(len(lesson.teachers) == TEACHERS_PER_LESSON for lesson in group.lessons)
+            assert all(lesson.group is group for lesson in group.lessons)
+            # Занятия других групп через аудитории и преподавателей не загружаются
+            assert "lessons" not in group.lessons[0].room.__dict__
+            assert "lessons" not in group.lessons[0].teachers[0].__dict__
+    finally:
+        event.remove(engine.sync_engine, "after_cursor_execute", counter)
+
+    # Группа, занятия группы, преподаватели занятий
+    assert counter.statements == 3
+    assert counter.rows == 1 + GROUP_LESSONS + GROUP_LESSONS * TEACHERS_PER_LESSON
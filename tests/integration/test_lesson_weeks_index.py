@@ -0,0 +1,18 @@
+import pytest
+from sqlalchemy import select, text
+
+from app.database import tables
+
+
+@pytest.mark.asyncio
+async def test_week_filter_uses_gin_index(engine):
+    query = select(tables.Lesson.id).where(tables.Lesson.weeks.contains([5]))
+    compiled = query.compile(engine)
+
+    async with engine.begin() as conn:
+        # На пустой таблице планировщик выбрал бы seq scan, без него индекс выбирается, только если он
+        # вообще может обслужить @>. btree индекс ix_schedule_lesson_weeks не может
+        await conn.execute(text("SET LOCAL enable_seqscan = off"))
+        plan = (await conn.exec_driver_sql(f"EXPLAIN {compiled}", [tuple(compiled.params.values())])).scalars().all()
+
+    assert any("ix_schedule_lesson_weeks_gin" in line for line in plan), "\n".join(plan)
@@ -0,0 +1,20 @@
+import pytest
+
+from app.services.lks import build_lks_schedule
+from app.services.semester_grid import SemesterGrid
+from tests.data import DEFAULT_GRID, build_lks_schedule_legacy, make_heavy_group
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_lks_schedule_matches_legacy(seed):
+    lessons = make_heavy_group(60, seed=seed)
+
+    assert build_lks_schedule(lessons, DEFAULT_GRID) == build_lks_schedule_legacy(lessons, DEFAULT_GRID)
+
+
+def test_lks_schedule_uses_semester_grid():
+    lessons = make_heavy_group(60)
+    grid = SemesterGrid(max_week=16, days=(1, 2, 3, 4, 5), calls=6)
+
+    assert build_lks_schedule(lessons, grid) == build_lks_schedule_legacy(lessons, grid)
+    assert build_lks_schedule([], grid).startswith(b'{"result":{"WEEKS":{"1":{"DAYS":{"1":{"LESSONS":{}}')
@@ -0,0 +1,41 @@
+import pytest
+from rtu_schedule_parser.utils import academic_calendar
+
+import app.services.bulk_schedule as bulk_schedule
+from app.services.db import PeriodDBService
+from app.services.dimension_cache import DimensionCache
+from app.services.period_cache import PeriodCache, period_cache
+from tests.data import make_schedule
+
+
+def test_current_period_is_memoized(monkeypatch):
+    calls = []
+    now_date = academic_calendar.now_date
+    monkeypatch.setattr(academic_calendar, "now_date", lambda: calls.append(1) or now_date())
+
+    cache = PeriodCache()
+    period = academic_calendar.get_period(now_date())
+    assert [cache.current() for _ in range(3)] == [(period.year_start, period.year_end, period.semester)] * 3
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_period_created_in_rolled_back_transaction_is_not_cached(session_factory):
+    dimension_cache = DimensionCache(max_size=100)
+    schedule = make_schedule()
+
+    # Парсер создаёт периоды вместе с остальными справочниками документа
+    async with session_factory() as db:
+        assert (await bulk_schedule.upsert_dimensions(db, [schedule], dimension_cache)).periods[2022, 2023, 1]
+        await db.rollback()
+
+    assert period_cache.get((2022, 2023, 1)) is None
+    assert dimension_cache.get("periods", (2022, 2023, 1)) is None
+    async with session_factory() as db:
+        assert await PeriodDBService.get_period_id(db, 2022, 2023, 1) is None
+
+        dimensions = await bulk_schedule.upsert_dimensions(db, [schedule], dimension_cache)
+        await db.commit()
+
+        assert await PeriodDBService.get_period_id(db, 2022, 2023, 1) == dimensions.periods[2022, 2023, 1]
+    assert period_cache.get((2022, 2023, 1)) == dimensions.periods[2022, 2023, 1]
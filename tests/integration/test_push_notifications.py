@@ -0,0 +1,80 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from sqlalchemy import select
+
+from app import models
+from app.database import tables
+from app.services.db import PushNotificationDBService
+from app.services.push_notifications import PushNotificationDispatcher, RateLimiter
+
+
+class FakeMessagingClient:
+    """Запоминает отправленные пачки. Топики из fail_times не отправляются заданное количество раз"""
+
+    def __init__(self, fail_times: dict[str, int] = None):
+        self.fail_times = dict(fail_times or {})
+        self.batches: list[list[str]] = []
+        self.threads: set[str] = set()
+
+    def send_each(self, notifications):
+        self.threads.add(threading.current_thread().name)
+        self.batches.append([notification.topic for notification in notifications])
+
+        errors = []
+        for notification in notifications:
+            if self.fail_times.get(notification.topic, 0) > 0:
+                self.fail_times[notification.topic] -= 1
+                errors.append("unavailable")
+            else:
+                errors.append(None)
+        return errors
+
+
+async def _enqueue(session_factory, topics: list[str]) -> None:
+    async with session_factory() as db:
+        await PushNotificationDBService.enqueue(
+            db, [models.PushNotificationCreate(topic=topic, title="Заголовок", body="Текст") for topic in topics]
+        )
+        await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_sends_batches_with_retries(session_factory):
+    await _enqueue(session_factory, ["a", "b", "c", "d", "e"])
+    client = FakeMessagingClient(fail_times={"b": 1, "e": 10})
+    dispatcher = PushNotificationDispatcher(
+        client,
+        batch_size=2,
+        rate_limit=1000,
+        max_attempts=3,
+        retry_delay=0,
+        poll_interval=0.01,
+        session_factory=session_factory,
+    )
+
+    stop = asyncio.Event()
+    stop.set()  # очередь уже заполнена: отправить всё, включая повторы, и завершиться
+    await asyncio.wait_for(dispatcher.run(stop), timeout=5)
+
+    assert client.batches[:2] == [["a", "b"], ["c", "d"]]
+    assert all(len(batch) <= 2 for batch in client.batches)
+    assert sorted(topic for batch in client.batches[2:] for topic in batch) == ["b", "e", "e", "e"]
+    assert all(name.startswith("push") for name in client.threads)
+
+    async with session_factory() as db:
+        notification = tables.PushNotification
+        rows = (await db.execute(select(notification.topic, notification.attempts, notification.sent_at))).all()
+    state = {topic: (attempts, sent_at is not None) for topic, attempts, sent_at in rows}
+    assert state == {"a": (1, True), "b": (2, True), "c": (1, True), "d": (1, True), "e": (3, False)}
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter():
+    limiter = RateLimiter(rate=100)
+    started = time.monotonic()
+    for _ in range(3):
+        await limiter.acquire(5)  # первая пачка сразу, следующие через 5 / 100 секунд
+    assert 0.09 <= time.monotonic() - started < 0.5
@@ -0,0 +1,65 @@
+import datetime
+
+import pytest
+
+from app.services import utils
+from app.services.room_occupancy import RoomOccupancyIndex
+from app.services.semester_grid import SemesterGrid
+
+AT = datetime.datetime(2022, 9, 14, 11, 0)  # среда, вторая пара
+PERIOD = (2022, 2023, 1)
+WEEK = utils.get_week(date=AT)
+
+ROOMS = [(1, 1), (2, 1), (3, 1), (4, 2), (5, 2)]
+
+
+@pytest.fixture
+def index():
+    index = RoomOccupancyIndex(ttl=60)
+    index.build(
+        ROOMS,
+        [
+            (*PERIOD, WEEK, 3, datetime.time(10, 40), datetime.time(12, 10), [2, 4]),
+            (*PERIOD, WEEK, 3, datetime.time(9, 0), datetime.time(10, 30), [1]),
+            (*PERIOD, WEEK + 1, 3, datetime.time(10, 40), datetime.time(12, 10), [3, 5]),
+            (2021, 2022, 2, WEEK, 3, datetime.time(10, 40), datetime.time(12, 10), [1, 3, 5]),
+        ],
+        [(1, 61), (2, 6)],
+        SemesterGrid(max_week=17, days=(1, 2, 3, 4, 5, 6), calls=6),
+    )
+    return index
+
+
+class TestRoomOccupancyIndex:
+    @pytest.mark.asyncio
+    async def test_campus_statuses(self, index):
+        statuses = await index.get_statuses(AT, campus_id=1)
+        assert [(s.id, s.status) for s in statuses] == [(1, "free"), (2, "busy"), (3, "free")]
+
+        statuses = await index.get_statuses(AT, campus_id=2)
+        assert [(s.id, s.status) for s in statuses] == [(4, "busy"), (5, "free")]
+
+    @pytest.mark.asyncio
+    async def test_room_status(self, index):
+        assert (await index.get_status(AT, room_id=2)).status == "busy"
+        assert (await index.get_status(AT + datetime.timedelta(hours=2), room_id=2)).status == "free"
+        assert (await index.get_status(AT, room_id=100)).status == "free"
+
+    @pytest.mark.asyncio
+    async def test_unknown_campus(self, index):
+        assert await index.get_statuses(AT, campus_id=100) == []
+
+    @pytest.mark.asyncio
+    async def test_campus_workloads(self, index):
+        workloads = await index.get_workloads(campus_id=1)
+        assert [(w.id, w.workload) for w in workloads] == [(1, 9.97), (2, 0.98), (3, 0.0)]
+
+        assert (await index.get_workload(room_id=4)).workload == 0.0
+        assert await index.get_workload(room_id=100) is None
+
+
+def test_workload_uses_semester_grid():
+    index = RoomOccupancyIndex(ttl=60)
+    index.build(ROOMS, [], [(1, 60)], SemesterGrid(max_week=16, days=(1, 2, 3, 4, 5), calls=6))
+
+    assert index._workloads == {1: 12.5}
@@ -0,0 +1,103 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.services.bulk_schedule as bulk_schedule
+from app.database import tables
+from app.parser.schedule import _get_schedule_push_notification
+from app.parser.structures import ParsedSchedule
+from app.services.api import ChangeService
+from app.services.db import ScheduleChangeDBService
+from app.services.dimension_cache import DimensionCache
+from tests.data import make_lesson, make_schedule
+
+
+async def _sync(db: AsyncSession, group_id: int, schedule: ParsedSchedule) -> bulk_schedule.GroupScheduleDiff:
+    dimensions = await bulk_schedule.upsert_dimensions(db, [schedule])
+    diff = await bulk_schedule.sync_group_lessons(db, group_id, schedule.lessons, dimensions)
+    await ScheduleChangeDBService.append(db, diff.get_change_events())
+    await db.commit()
+    return diff
+
+
+@pytest.mark.asyncio
+async def test_sync_change_set(session_factory):
+    async with session_factory() as db:
+        degree = tables.ScheduleDegree(name="Бакалавриат")
+        group = tables.Group(
+            name="ИКБО-01-21",
+            period=tables.SchedulePeriod(year_start=2022, year_end=2023, semester=1),
+            institute=tables.Institute(name="ИИТ", short_name="ИИТ"),
+            degree=degree,
+        )
+        db.add_all([degree, group])
+        await db.commit()
+
+        first = await _sync(db, group.id, make_schedule(make_lesson("Физика"), make_lesson("Химия", weekday=2)))
+        assert (len(first.added), first.kept) == (2, 0)
+        assert _get_schedule_push_notification("ИКБО-01-21", first) is None  # расписания группы ещё не было
+
+        same = await _sync(db, group.id, make_schedule(make_lesson("Химия", weekday=2), make_lesson("Физика")))
+        assert not same.changed and same.kept == 2
+
+        diff = await _sync(
+            db,
+            group.id,
+            make_schedule(make_lesson("Физика", room="Б-2", weeks=(2, 4)), make_lesson("Математика", weekday=3)),
+        )
+        assert [key.weekday for _, key in diff.added] == [3]
+        assert [key.weekday for _, key in diff.removed] == [2]
+        [(_, before, after)] = diff.moved
+        assert before.slot == after.slot and before.weeks == (1, 3) and after.weeks == (2, 4)
+
+        notification = _get_schedule_push_notification("ИКБО-01-21", diff)
+        assert notification.topic == "ScheduleUpdates__IKBO-01-21"
+        assert "новых занятий: 1, отменённых занятий: 1, перенесённых занятий: 1" in notification.body
+
+        [(moved_id, _, _)] = diff.moved
+        [(removed_id, _)] = diff.removed
+        [(added_id, _)] = diff.added
+        [room_before, room_after] = (await db.execute(select(tables.Room.id).order_by(tables.Room.id))).scalars()
+
+        # Первая синхронизация: 2 занятия × (группа, аудитория, преподаватель)
+        page = await ChangeService.get_changes(db, since=0, limit=6)
+        assert page.has_more and len(page.changes) == 6
+        assert {change.action for change in page.changes} == {"added"}
+
+        page = await ChangeService.get_changes(db, since=page.cursor, limit=100)
+        assert not page.has_more
+        events = {(change.entity, change.entity_id, change.lesson_id, change.action) for change in page.changes}
+        assert ("group", group.id, moved_id, "updated") in events
+        assert ("room", room_before, moved_id, "removed") in events
+        assert ("room", room_after, moved_id, "added") in events
+        assert ("group", group.id, removed_id, "removed") in events
+        assert ("group", group.id, added_id, "added") in events
+
+        lessons = {change.lesson_id: change.lesson for change in page.changes}
+        assert lessons[removed_id] is None and lessons[moved_id].weeks == [2, 4]
+        assert lessons[added_id].discipline.name == "Математика"
+
+        page = await ChangeService.get_changes(db, since=page.cursor, limit=100)
+        assert (page.changes, page.has_more) == ([], False)
+
+        page = await ChangeService.get_changes(db, since=0, limit=100, entity="room", entity_id=room_after)
+        assert [change.lesson_id for change in page.changes] == [moved_id]
+
+
+@pytest.mark.asyncio
+async def test_dimension_cache_after_rollback(session_factory):
+    cache = DimensionCache(max_size=100)
+    schedule = make_schedule(make_lesson("Физика"))
+
+    async with session_factory() as db:
+        await bulk_schedule.upsert_dimensions(db, [schedule], cache)
+        await db.rollback()
+    assert cache.get("disciplines", "Физика") is None  # id отменённой вставки не попадает в кэш
+
+    async with session_factory() as db:
+        dimensions = await bulk_schedule.upsert_dimensions(db, [schedule], cache)
+        await db.commit()
+    cache.update(dimensions)
+    assert cache.get("disciplines", "Физика") == dimensions.disciplines["Физика"]
+    assert cache.get("rooms", ("А-1", None)) == dimensions.rooms["А-1", None]
+    assert cache.get("periods", (2022, 2023, 1)) == dimensions.periods[2022, 2023, 1]
@@ -0,0 +1,131 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+import app.parser.schedule as parser_schedule
+import app.services.bulk_schedule as bulk_schedule
+from app.parser.schedule import (
+    DocumentFingerprint,
+    DocumentProgress,
+    GroupScheduleTask,
+    ScheduleChanges,
+    ScheduleParsingService,
+)
+from app.services.db import DocumentDBService
+from tests.data import make_schedule
+
+
+@pytest.fixture
+def parser_session(session_factory, monkeypatch):
+    monkeypatch.setattr(parser_schedule, "async_session", session_factory)
+    return session_factory
+
+
+@pytest.mark.asyncio
+async def test_unchanged_documents_are_skipped(parser_session, tmp_path):
+    path = tmp_path / "schedule.xlsx"
+    path.write_bytes(b"schedule")
+    documents = [(str(path), None, None, None)]
+
+    [fingerprint] = (await ScheduleParsingService._get_changed_documents(documents, force=False)).values()
+    async with parser_session() as db:
+        await DocumentDBService.save(db, *fingerprint)
+        await db.commit()
+
+    assert await ScheduleParsingService._get_changed_documents(documents, force=False) == {}
+    assert list(await ScheduleParsingService._get_changed_documents(documents, force=True)) == [str(path)]
+
+    # Файл перезаписан без изменений: хэш совпадает, отпечаток обновляется
+    os.utime(path, (fingerprint.mtime + 60, fingerprint.mtime + 60))
+    assert await ScheduleParsingService._get_changed_documents(documents, force=False) == {}
+    async with parser_session() as db:
+        assert (await DocumentDBService.get_document_by_source(db, str(path))).mtime == fingerprint.mtime + 60
+
+    path.write_bytes(b"new schedule")
+    [changed] = (await ScheduleParsingService._get_changed_documents(documents, force=False)).values()
+    assert changed.sha256 != fingerprint.sha256
+
+
+def test_get_executor(monkeypatch):
+    with ScheduleParsingService._get_executor("thread", 2) as pool:
+        assert isinstance(pool, ThreadPoolExecutor)
+    with ScheduleParsingService._get_executor("process", 2) as pool:
+        assert isinstance(pool, ProcessPoolExecutor)
+
+    # Дочерний процесс Celery: процессы создавать нельзя, используются потоки
+    monkeypatch.setattr(multiprocessing, "current_process", lambda: SimpleNamespace(daemon=True))
+    with ScheduleParsingService._get_executor("process", 2) as pool:
+        assert isinstance(pool, ThreadPoolExecutor)
+
+
+@pytest.mark.asyncio
+async def test_parse_limits_documents_in_pool(monkeypatch):
+    lock = threading.Lock()
+    active, peak = [0], [0]
+
+    def parse_document(doc):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        return [make_schedule(group=doc)] if doc != "broken" else None
+
+    monkeypatch.setattr(parser_schedule, "_parse_document", parse_document)
+    documents = ["a", "b", "broken", "c", "d", "e"]
+
+    parsed = [doc async for doc, _ in ScheduleParsingService._parse(documents, executor="thread", workers=2)]
+
+    assert sorted(parsed) == ["a", "b", "c", "d", "e"]
+    assert peak[0] == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_document_keeps_fingerprint_unsaved(parser_session, monkeypatch):
+    active: dict[int, int] = {}
+    saved = []
+
+    async def save_group_schedule(db, schedule, group_id, dimensions):
+        # Расписание одной группы не сохраняется одновременно двумя писателями
+        assert not active.get(group_id)
+        active[group_id] = 1
+        await asyncio.sleep(0.01)
+        active[group_id] = 0
+        saved.append(schedule.group)
+        if schedule.group == "broken":
+            return None
+        return bulk_schedule.GroupScheduleDiff(group_id, added=[(group_id, None)])
+
+    monkeypatch.setattr(ScheduleParsingService, "_save_group_schedule", save_group_schedule)
+    tasks = [
+        GroupScheduleTask("failed.xlsx", make_schedule(group="broken"), 1, None),
+        GroupScheduleTask("failed.xlsx", make_schedule(group="ИКБО-01-21"), 2, None),
+        GroupScheduleTask("parsed.xlsx", make_schedule(group="ИКБО-02-21"), 3, None),
+        GroupScheduleTask("parsed.xlsx", make_schedule(group="ИКБО-02-21"), 3, None),
+    ]
+    progress = {"failed.xlsx": DocumentProgress(remaining=2), "parsed.xlsx": DocumentProgress(remaining=2)}
+    fingerprints = {source: DocumentFingerprint(source, "sha256", 0.0, 1) for source in progress}
+    changes = ScheduleChanges()
+
+    queue = asyncio.Queue()
+    for task in tasks + [None, None]:
+        queue.put_nowait(task)
+    group_locks = defaultdict(asyncio.Lock)
+    await asyncio.gather(
+        *(ScheduleParsingService._run_writer(queue, progress, fingerprints, group_locks, changes) for _ in range(2))
+    )
+
+    assert sorted(saved) == ["broken", "ИКБО-01-21", "ИКБО-02-21", "ИКБО-02-21"]
+    assert changes.groups == {"ИКБО-01-21", "ИКБО-02-21"}
+    assert progress["failed.xlsx"].failed and not progress["parsed.xlsx"].failed
+    async with parser_session() as db:
+        assert await DocumentDBService.get_document_by_source(db, "failed.xlsx") is None
+        assert await DocumentDBService.get_document_by_source(db, "parsed.xlsx") is not None
@@ -0,0 +1,79 @@
+import pytest
+from rtu_schedule_parser.utils import academic_calendar
+from sqlalchemy import select
+
+from app.database import tables
+from app.services.search import SearchIndex
+from app.utils.search import TrigramIndex, normalize_search_key
+
+NAMES = ["Ауд. А-101/2", "A-101", "Ёлкин Пётр Иванович", "ИВЦ-101 (В-78)", "Zoom", "№ 5"]
+
+
+@pytest.mark.parametrize(
+    "value, key",
+    [
+        ("Ауд. А-101/2", "ауда1012"),
+        ("A-101", "а101"),  # латинская A
+        ("Ёлкин Пётр", "елкинпетр"),
+        ("Zoom", "zоом"),
+    ],
+)
+def test_normalize_search_key(value, key):
+    assert normalize_search_key(value) == key
+
+
+def test_trigram_index_ranking():
+    index = TrigramIndex()
+    for id_, name in enumerate(["А-1010", "Б-101", "А-101", "А-10", "ИВЦ-101", "Иванов И.И.", "Иванова А.А."], 1):
+        index.add(id_, normalize_search_key(name))
+
+    assert index.search(normalize_search_key("a-101"), 10) == [3, 1, 4]  # точное, начало, похожее
+    assert index.search(normalize_search_key("101"), 2) == [3, 2]  # при равном сходстве - по ключу
+    assert index.search(normalize_search_key("иваноф"), 10) == [6, 7]
+    assert index.search("", 10) == []
+    assert index.search(normalize_search_key("ив"), 10) == [5, 6, 7]  # короткий запрос - только по началу
+    assert index.search(normalize_search_key("101"), 10, where=lambda id_: id_ > 3) == [5]
+
+
+@pytest.mark.asyncio
+async def test_stored_search_key_matches_python(session_factory):
+    async with session_factory() as db:
+        db.add_all([tables.Teacher(name=name) for name in NAMES] + [tables.Room(name=name) for name in NAMES])
+        await db.commit()
+
+        for table in (tables.Teacher, tables.Room):
+            rows = (await db.execute(select(table.name, table.search_key))).all()
+            assert {name: key for name, key in rows} == {name: normalize_search_key(name) for name in NAMES}
+
+
+@pytest.mark.asyncio
+async def test_search_index(session_factory):
+    current = academic_calendar.get_period(academic_calendar.now_date())
+    async with session_factory() as db:
+        period = tables.SchedulePeriod(
+            year_start=current.year_start, year_end=current.year_end, semester=current.semester
+        )
+        old_period = tables.SchedulePeriod(year_start=2000, year_end=2001, semester=1)
+        group = {
+            "institute": tables.Institute(name="ИИТ", short_name="ИИТ"),
+            "degree": tables.ScheduleDegree(name="Бакалавр"),
+        }
+        db.add_all(
+            [
+                *group.values(),
+                tables.Group(name="ИКБО-01-21", period=period, **group),
+                tables.Group(name="ИКБО-02-21", period=old_period, **group),
+                tables.Teacher(name="Икбаев И.И."),
+                tables.Room(name="ИК-1"),
+                tables.ScheduleDiscipline(name="Информатика"),
+            ]
+        )
+        await db.commit()
+
+        index = SearchIndex(ttl=60)
+        assert [type_ for type_, _, _ in await index.search(db, "ИК", 10)] == ["room", "teacher", "group"]
+        assert await index.search(db, "икбо 01", 10) == [
+            ("group", 1, "ИКБО-01-21")
+        ]  # группа прошлого периода не ищется
+        assert [type_ for type_, _, _ in await index.search(db, "ИК", 10, entity="teacher")] == ["teacher"]
+        assert await index.search(db, "инф", 1) == [("discipline", 1, "Информатика")]
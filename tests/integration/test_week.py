@@ -0,0 +1,26 @@
+import datetime
+
+import pytest
+
+from app.services import utils
+
+
+@pytest.mark.parametrize(
+    "date, week",
+    [
+        (datetime.date(2022, 9, 1), 1),
+        (datetime.datetime(2022, 9, 14, 11, 0), 3),
+        (datetime.date(2023, 1, 20), 1),  # до начала семестра
+        (datetime.date(2023, 2, 9), 1),
+        (datetime.date(2023, 2, 13), 2),
+        (datetime.date(2025, 12, 29), 18),  # неделя 1 ISO-календаря следующего года
+        (datetime.date(2026, 12, 31), 18),
+    ],
+)
+def test_get_week(date, week):
+    assert utils.get_week(date) == week
+
+
+def test_get_weeks():
+    dates = [datetime.date(2022, 9, 5) + datetime.timedelta(days=i) for i in range(0, 21, 3)]
+    assert utils.get_weeks(dates) == [utils.get_week(date) for date in dates] == [2, 2, 2, 3, 3, 4, 4]
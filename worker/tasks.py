@@ -8,12 +8,12 @@ from worker import app
 
 
 @app.task
-def parse_schedule() -> None:
+def parse_schedule(force: bool = False) -> None:
     """Обновление расписания"""
-    logger.debug("Запускаем задачу обновления расписания")
+    logger.debug(f"Запускаем задачу обновления расписания. Входные параметры: {force = }")
 
     event_loop = asyncio.get_event_loop()
-    event_loop.run_until_complete(_sync_schedule())
+    event_loop.run_until_complete(_sync_schedule(force=force))
 
     logger.debug("Завершена задача обновления расписания")
 
@@ -25,18 +25,19 @@ def parse_file(file_path: str, institute: str, degree: int) -> None:
         "Запускаем задачу парсинга расписания из файла. Входные параметры: " f"{file_path=} {institute = } {degree = } "
     )
 
+    # Загруженный вручную файл парсим всегда
     event_loop = asyncio.get_event_loop()
     event_loop.run_until_complete(
-        _sync_schedule(from_file=True, file_path=file_path, institute=institute, degree=degree)
+        _sync_schedule(from_file=True, file_path=file_path, institute=institute, degree=degree, force=True)
     )
 
     logger.debug("Завершена задача парсинга расписания из файла")
 
 
 async def _sync_schedule(
-    from_file: bool = False, file_path: str = None, institute: str = None, degree: int = None
+    from_file: bool = False, file_path: str = None, institute: str = None, degree: int = None, force: bool = False
 ) -> None:
     logger.debug("Получена сессия БД")
     await ScheduleParsingService.parse_schedule(
-        from_file=from_file, file_path=file_path, institute=institute, degree=degree
+        from_file=from_file, file_path=file_path, institute=institute, degree=degree, force=force
     )